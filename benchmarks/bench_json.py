@@ -0,0 +1,81 @@
+"""Compare JSON backends on large captured request bodies.
+
+    python benchmarks/bench_json.py [--sizes 100 1000 10000] [--repeat 5]
+
+Each size is the number of items in a synthetic JSON body. For every
+backend the script times decoding the body (`RawBody.decode`) and
+generating request-builder code (`convert -B`, which emits the body as a
+constant) from the parsed command, and checks that the generated code is
+identical across backends. The `orjson*` row forces orjson encoding,
+which the backend only does by default on Pythons before 3.13; pass
+`--pure-stdlib` to time the stdlib the way those Pythons encode indented
+output (pure Python).
+"""
+import argparse
+import json
+import json.encoder
+import time
+
+from curlpyconvert.lib import jsonbackend
+from curlpyconvert.lib.body import RawBody
+from curlpyconvert.lib.builder import RequestBuilder
+from curlpyconvert.lib.curl_parser import CurlParser
+
+
+def make_body(items: int) -> str:
+    return json.dumps({
+        'customerId': 'c-1029',
+        'paging': {'page': 1, 'size': items},
+        'items': [
+            {
+                'id': index,
+                'sku': f'SKU-{index:08d}',
+                'title': f'Item {index} – größe {index % 7}',
+                'price': round(index * 1.37, 2),
+                'tags': ['sale', 'new'] if index % 3 else [],
+                'available': index % 2 == 0,
+                'meta': {'warehouse': f'WH{index % 12}', 'weight': index / 8},
+            }
+            for index in range(items)
+        ],
+    })
+
+
+def best_of(repeat: int, func) -> float:
+    timings = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        func()
+        timings.append(time.perf_counter() - started)
+    return min(timings)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--sizes', type=int, nargs='+', default=[100, 1000, 10000])
+    parser.add_argument('--repeat', type=int, default=5)
+    parser.add_argument('--pure-stdlib', action='store_true', help='disable the stdlib C encoder')
+    args = parser.parse_args()
+    if args.pure_stdlib:
+        json.encoder.c_make_encoder = None
+
+    backends = ['stdlib'] + (['orjson', 'orjson*'] if jsonbackend.orjson else [])
+    print(f"{'items':>7} {'body':>9} {'backend':>8} {'decode ms':>10} {'codegen ms':>11}")
+    for size in args.sizes:
+        body = make_body(size)
+        parsed = CurlParser.parse_curl(f"curl 'https://api.example.com/search' --data-raw '{body}'")
+        outputs = {}
+        for name in backends:
+            backend = jsonbackend.set_backend(name.rstrip('*'))
+            backend.native_dumps = backend.name == 'orjson' and (name.endswith('*') or backend.native_dumps)
+            decode = best_of(args.repeat, lambda: RawBody(body).decode(CurlParser._eval_js_object))
+            parsed['data']  # decode once outside the timing
+            codegen = best_of(args.repeat, lambda: RequestBuilder(parsed, 'context', ['paging.page']).generate_code())
+            outputs[name] = RequestBuilder(parsed, 'context', ['paging.page']).generate_code()
+            print(f'{size:>7} {len(body) / 1024:>7.0f}KB {name:>8} {decode * 1000:>10.2f} {codegen * 1000:>11.2f}')
+        if len(set(outputs.values())) != 1:
+            raise SystemExit(f'Generated code differs between backends for {size} items')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,61 @@
+from typing import Any, Callable, List, Optional, Tuple, Union
+from urllib.parse import parse_qsl
+
+from . import jsonbackend
+
+_STRIP = b' \t\r\n\x0b\x0c'
+
+
+class RawBody:
+    """Request body kept as captured and decoded only on demand.
+
+    The body is encoded once and held as a `memoryview`; surrounding
+    whitespace and the `$'...'` marker are trimmed by slicing, without
+    copying. Text and structured data are decoded lazily and cached.
+    """
+
+    __slots__ = ('view', '_text', '_decoded')
+
+    def __init__(self, body: Union[str, bytes, bytearray, memoryview]):
+        view = memoryview(body.encode() if isinstance(body, str) else body)
+        start, end = 0, len(view)
+        while start < end and view[start] in _STRIP + b'$':
+            start += 1
+        while end > start and view[end - 1] in _STRIP:
+            end -= 1
+        self.view = view[start:end]
+        self._text: Optional[str] = None
+        self._decoded: Optional[Tuple[Any, Optional[List[Tuple[str, str]]]]] = None
+
+    @property
+    def text(self) -> str:
+        """The body as text, decoded on first access."""
+        if self._text is None:
+            self._text = str(self.view, 'utf-8', 'surrogateescape')
+        return self._text
+
+    @property
+    def is_json(self) -> bool:
+        """Whether the body is a JSON (or JavaScript) object or array."""
+        return len(self.view) > 0 and self.view[0] in b'{['
+
+    def decode(self, js_fallback: Callable[[str], Any]) -> Tuple[Any, Optional[List[Tuple[str, str]]]]:
+        """Decode into `(data, ordered_data)`, caching the result."""
+        if self._decoded is None:
+            if self.is_json:
+                try:
+                    data = jsonbackend.loads(self.view)
+                except jsonbackend.JSONDecodeError:
+                    data = js_fallback(self.text)
+                self._decoded = (data, None)
+            else:
+                ordered_data = parse_qsl(self.text)
+                self._decoded = (dict(ordered_data), ordered_data)
+        return self._decoded
+
+    def literal(self) -> str:
+        """Python string literal of the body exactly as captured."""
+        return repr(self.text)
+
+    def __len__(self) -> int:
+        return len(self.view)
@@ -0,0 +1,209 @@
+import builtins
+import keyword
+import re
+from typing import Dict, Any, List, Optional
+
+from . import jsonbackend
+from .headers import HeaderMap
+from .pagination import DATE_PATTERN, PAGINATION_FIELDS
+from .sidecar import Sidecars
+
+# How deep into a JSON body (objects and arrays) fields are inferred
+MAX_INFER_DEPTH = 6
+
+
+def _is_variable(name: str, value: Any) -> bool:
+    """Whether a captured field looks like a date, an ID or a paging field."""
+    if isinstance(value, (dict, list)) or isinstance(value, bool):
+        return False
+    lower = name.lower()
+    if lower in PAGINATION_FIELDS:
+        return True
+    if isinstance(value, str) and DATE_PATTERN.match(value):
+        return True
+    return lower == 'id' or lower.endswith('_id') or (name.endswith('Id') and len(name) > 2)
+
+
+def _path_key(path: str) -> tuple:
+    """Sort key ordering list indexes numerically (`items.2` before `items.10`)."""
+    return tuple((0, int(segment), '') if segment.isdigit() else (1, 0, segment) for segment in path.split('.'))
+
+
+def infer_params(data: Any) -> List[str]:
+    """Infer variable field paths (dotted for nested JSON) from captured data.
+
+    Only the first element of a list is looked into: the others share its
+    shape, and a listing of thousands of items would otherwise turn into
+    as many arguments.
+    """
+    paths = []
+    stack = [('', data, 0)]
+    while stack:
+        prefix, node, depth = stack.pop()
+        if depth >= MAX_INFER_DEPTH:
+            continue
+        if isinstance(node, list):
+            if node:
+                stack.append((f'{prefix}0.', node[0], depth + 1))
+            continue
+        if not isinstance(node, dict):
+            continue
+        for key, value in node.items():
+            path = f'{prefix}{key}'
+            if _is_variable(str(key), value):
+                paths.append(path)
+            elif isinstance(value, (dict, list)):
+                stack.append((f'{path}.', value, depth + 1))
+    return sorted(paths, key=_path_key)
+
+
+def _lookup(data: Any, path: str) -> Any:
+    node = data
+    for segment in path.split('.'):
+        node = node[int(segment)] if isinstance(node, list) else node[segment]
+    return node
+
+
+def _argument_name(path: str, taken: set) -> str:
+    """Python identifier for a field path, unique within the function."""
+    name = re.sub(r'\W', '_', path.split('.')[-1])
+    name = re.sub(r'(?<=[a-z0-9])([A-Z])', r'_\1', name).lower().strip('_') or 'value'
+    if name[0].isdigit() or keyword.iskeyword(name) or hasattr(builtins, name):
+        name = f'field_{name}'
+    candidate, counter = name, 2
+    while candidate in taken:
+        candidate = f'{name}_{counter}'
+        counter += 1
+    taken.add(candidate)
+    return candidate
+
+
+class RequestBuilder:
+    """Generates a reusable request builder for hot scraper loops.
+
+    Static request parts (URL, headers, cookies, constant params, body
+    skeleton) are hoisted into module-level constants. Only the variable
+    fields become function arguments, so building a request costs a
+    shallow copy and a few assignments. `MappingProxyType` (a tuple for a
+    JSON array body) guards the top level only: nested containers are
+    shared by every built request and the builder copies just the ones on
+    a changed path. Parts moved to `sidecars` files are referenced through
+    their lazy loads instead of constants.
+    """
+
+    def __init__(
+        self,
+        parsed_command: Dict[str, Any],
+        framework: str,
+        params: Optional[List[str]] = None,
+        sidecars: Optional[Sidecars] = None
+    ):
+        if parsed_command.get('form'):
+            # The builder only knows JSON bodies and params, file parts would be dropped
+            raise ValueError("The request builder does not support multipart (-F) uploads")
+        self.parsed = parsed_command
+        self.framework = framework
+        self.sidecars = sidecars or Sidecars()
+        # Constant name -> expression used wherever the constant is read
+        self.constants: Dict[str, str] = {}
+        self.data = parsed_command.get('data') or {}
+        self.kind = 'body' if parsed_command.get('data_as_json') else 'params'
+        self.params = list(params) if params else infer_params(self.data)
+        for path in self.params:
+            try:
+                _lookup(self.data, path)
+            except (KeyError, IndexError, ValueError, TypeError):
+                raise ValueError(f"Field {path} is not in the captured request")
+
+    def generate_code(self) -> str:
+        """Generate constants, the builder function and framework calls."""
+        constant = self.kind.upper()
+        imports = ['from types import MappingProxyType']
+        if self.framework == 'grab' and self.kind == 'params' and self.parsed['method'] == 'get':
+            imports.append('from urllib.parse import urlencode')
+        static = {
+            'HEADERS': (HeaderMap(self.parsed.get('headers')).to_dict(), jsonbackend.dumps),
+            'COOKIES': (dict(self.parsed.get('cookies') or {}), jsonbackend.dumps),
+            constant: (self.data, jsonbackend.dumps_python),
+        }
+        lines = [f'URL = "{self.parsed["url"]}"']
+        for name, (value, dumps) in static.items():
+            literal = dumps(value, indent=4)
+            self.constants[name] = self.sidecars.payload(name.lower(), value, literal)
+            if self.constants[name] == literal:
+                frozen = 'tuple' if isinstance(value, list) else 'MappingProxyType'
+                lines.append(f'{name} = {frozen}({literal})')
+                self.constants[name] = name
+        code_parts = [
+            '\n'.join(imports),
+            '\n'.join(lines),
+            self._generate_function(),
+            self._generate_calls(),
+        ]
+        return '\n\n'.join(code_parts)
+
+    def _generate_function(self) -> str:
+        """Generate the builder: copy the skeleton, then set the variable fields."""
+        taken: set = set()
+        arguments = [(path, _argument_name(path, taken)) for path in self.params]
+        signature = ', '.join(
+            f'{name}={jsonbackend.dumps_python(_lookup(self.data, path))}' for path, name in arguments
+        )
+        var = self.kind
+        lines = [
+            f'def build_{var}({signature}):',
+            f'    """Return the request {var} for one call; only the variable fields change."""',
+            f"    {var} = {'list' if isinstance(self.data, list) else 'dict'}({self.constants[var.upper()]})",
+        ]
+        copied = set()
+        for path, name in arguments:
+            node = self.data
+            target = var
+            segments = path.split('.')
+            # Copy each nested container on the way down so the constant stays untouched
+            for segment in segments[:-1]:
+                target = f'{target}[{self._key(node, segment)}]'
+                node = node[int(segment)] if isinstance(node, list) else node[segment]
+                if target not in copied:
+                    lines.append(f"    {target} = {'list' if isinstance(node, list) else 'dict'}({target})")
+                    copied.add(target)
+            lines.append(f'    {target}[{self._key(node, segments[-1])}] = {name}')
+        lines.append(f'    return {var}')
+        return '\n'.join(lines)
+
+    @staticmethod
+    def _key(container: Any, segment: str) -> str:
+        """Subscript literal for a path segment: an index into lists, a string key otherwise."""
+        return segment if isinstance(container, list) else jsonbackend.dumps(segment)
+
+    def _generate_calls(self) -> str:
+        """Generate the one-off session setup and a per-request call."""
+        method = self.parsed['method'].upper()
+        call_args = ', '.join(f'{name}={name}' for name in self._argument_names())
+        build = f'build_{self.kind}({call_args})'
+        headers, cookies = self.constants['HEADERS'], self.constants['COOKIES']
+        if self.framework == 'grab':
+            setup = f'self.g.setup(headers=dict({headers}), cookies=dict({cookies}))'
+            if self.kind == 'body':
+                request = f'self.g.go(URL, json={build})'
+            elif method == 'GET':
+                request = f'self.g.go(f"{{URL}}?{{urlencode({build})}}")'
+            else:
+                request = f'self.g.go(URL, post={build})'
+        else:
+            setup = f'self.context.headers.update({headers})\nself.context.cookies.update({cookies})'
+            if self.framework == 'dogman':
+                setup = (
+                    'self.context.setup(dogman_config={"setup": {}})\n'
+                    'self.context.dogman.get_cookies(URL, spoofing="akamai")\n' + setup
+                )
+            if self.kind == 'body':
+                keyword_arg = 'json'
+            else:
+                keyword_arg = 'params' if method == 'GET' else 'data'
+            request = f'response = self.context.{method}(URL, {keyword_arg}={build})'
+        return f'# Once per session\n{setup}\n\n# Per request\n{request}'
+
+    def _argument_names(self) -> List[str]:
+        taken: set = set()
+        return [_argument_name(path, taken) for path in self.params]
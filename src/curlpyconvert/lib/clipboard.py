@@ -0,0 +1,95 @@
+import os
+import sys
+from pathlib import Path
+from typing import Optional
+
+# Environment variable selecting the backend: system, memory, stdio or file:<path>
+ENV_VAR = 'CURLPYCONVERT_CLIPBOARD'
+
+
+class SystemClipboard:
+    """The desktop clipboard through pyperclip."""
+
+    # The user can copy a new command while the tool waits for confirmation
+    interactive = True
+    # Whether copied code goes to stdout, where status messages must not
+    uses_stdout = False
+
+    def paste(self) -> str:
+        import pyperclip
+        return pyperclip.paste()
+
+    def copy(self, text: str) -> None:
+        import pyperclip
+        pyperclip.copy(text)
+
+
+class MemoryClipboard:
+    """Process-local clipboard, used by the test suite."""
+
+    interactive = False
+    uses_stdout = False
+
+    def __init__(self):
+        self.content = ''
+
+    def paste(self) -> str:
+        return self.content
+
+    def copy(self, text: str) -> None:
+        self.content = text
+
+    def clear(self) -> None:
+        self.content = ''
+
+
+class FileClipboard:
+    """Clipboard backed by a text file."""
+
+    interactive = False
+    uses_stdout = False
+
+    def __init__(self, path: str):
+        self.path = Path(path)
+
+    def paste(self) -> str:
+        return self.path.read_text() if self.path.exists() else ''
+
+    def copy(self, text: str) -> None:
+        self.path.write_text(text)
+
+
+class StdioClipboard:
+    """Reads the curl command from stdin and writes generated code to stdout."""
+
+    # stdin is drained by the first paste, there is nothing to confirm
+    interactive = False
+    uses_stdout = True
+
+    def __init__(self):
+        self._content: Optional[str] = None
+
+    def paste(self) -> str:
+        if self._content is None:
+            self._content = sys.stdin.read()
+        return self._content
+
+    def copy(self, text: str) -> None:
+        sys.stdout.write(text + '\n')
+
+
+MEMORY_CLIPBOARD = MemoryClipboard()
+
+
+def get_clipboard(name: Optional[str] = None):
+    """Create the clipboard backend for a name, defaulting to the environment."""
+    name = name or os.environ.get(ENV_VAR) or 'system'
+    if name == 'system':
+        return SystemClipboard()
+    if name == 'memory':
+        return MEMORY_CLIPBOARD
+    if name == 'stdio':
+        return StdioClipboard()
+    if name.startswith('file:'):
+        return FileClipboard(name[len('file:'):])
+    raise ValueError(f"Unknown clipboard backend: {name}")
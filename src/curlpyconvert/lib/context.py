@@ -1,54 +1,116 @@
-from typing import Dict, Any
-import json
+from typing import Dict, Any, Optional
+
+from . import jsonbackend
+from .graphql import requests_graphql_code
+from .headers import HeaderMap
+from .multipart import REQUESTS_FORM_ARGUMENTS, requests_multipart_code, requests_multipart_imports
+from .pagination import requests_pagination_code
+from .sidecar import Sidecars
+from .streaming import detect_stream, requests_stream_code
+from .transfer import range_header, requests_transfer_code
 
 class ContextCodeWriter:
     """Generates Context framework code from parsed curl commands."""
     
-    COMMON_HEADERS = [
-        'accept-encoding',
-        'accept-language',
-        'accept',
-        'connection',
-        'user-agent'
-    ]
-    
-    def __init__(self, parsed_command: Dict[str, Any]):
+    def __init__(
+        self,
+        parsed_command: Dict[str, Any],
+        passthrough: bool = False,
+        paginate: bool = False,
+        prefetch: int = 0,
+        persisted_queries: bool = False,
+        stream: bool = False,
+        sidecars: Optional[Sidecars] = None
+    ):
         self.parsed = parsed_command
+        # Emit the captured body verbatim instead of a decoded literal
+        self.passthrough = passthrough
+        # Emit a lazy page generator for paginated requests
+        self.paginate = paginate
+        self.prefetch = prefetch
+        # Send GraphQL operations as Automatic Persisted Queries
+        self.persisted_queries = persisted_queries
+        # Consume large downloads and JSON listings without buffering the body
+        self.stream = stream
+        # Moves large literals to files next to the module when saving with --output
+        self.sidecars = sidecars or Sidecars()
+        self.headers = HeaderMap(parsed_command.get('headers'))
+        if parsed_command.get('form'):
+            # The multipart encoder sets its own boundary
+            self.headers.remove('content-type')
+        if range_header(parsed_command.get('transfer')) and 'range' not in self.headers:
+            self.headers.add('Range', range_header(parsed_command['transfer']))
         
     def generate_code(self) -> str:
         """Generate Context framework code from parsed curl command."""
         code_parts = []
         
+        # Multipart uploads need the streaming encoder
+        if self.parsed.get('form'):
+            code_parts.append(requests_multipart_imports(self.parsed['form']))
+        
         # Add headers setup if present
-        if self.parsed.get('headers'):
-            headers = self.parsed['headers'].copy()
-            code_parts.append(f'self.context.headers.update({json.dumps(headers, indent=4)})')
+        if self.headers:
+            code_parts.append(self._generate_headers())
         
         # Add cookies setup if present
         if self.parsed.get('cookies'):
-            code_parts.append(f'self.context.cookies.update({json.dumps(self.parsed["cookies"], indent=4)})')
+            code_parts.append(f'self.context.cookies.update({self._generate_cookies_literal()})')
+        
+        # Add transfer settings (compression, HTTP/2, keep-alive, rate limit)
+        code_parts.append(requests_transfer_code(self.parsed.get('transfer')))
         
-        # Generate just the request line without params
         url = self.parsed['url']
         method = self.parsed['method'].upper()
-        code_parts.append(f'response = self.context.{method}("{url}")')
+        if self.paginate and self.parsed.get('pagination'):
+            # Fetch the listing page by page through a generator
+            code_parts.append(requests_pagination_code(self.parsed, self.prefetch, self.sidecars))
+        elif self.persisted_queries and self.parsed.get('graphql'):
+            # Send hashes instead of multi-KB query documents
+            code_parts.append(requests_graphql_code(self.parsed))
+        elif self.parsed.get('form'):
+            # Stream multipart file parts from disk
+            code_parts.append(requests_multipart_code(
+                self.parsed['form'], f'response = self.context.{method}("{url}", {REQUESTS_FORM_ARGUMENTS})'
+            ))
+        elif self._passthrough_body():
+            code_parts.append(self._generate_request_line(f'"{url}", data={self._passthrough_body()}'))
+        else:
+            # Generate just the request line without params
+            code_parts.append(self._generate_request_line(f'"{url}"'))
         
         return '\n\n'.join([p for p in code_parts if p])
 
+    def _generate_request_line(self, arguments: str) -> str:
+        """Generate the request, streaming the body when it is large or a file."""
+        method = self.parsed['method'].upper()
+        mode = detect_stream(self.parsed, self.stream)
+        if not mode:
+            return f'response = self.context.{method}({arguments})'
+        return requests_stream_code(
+            mode, f'response = self.context.{method}({arguments}, stream=True)', self.parsed['url']
+        )
+
     def _generate_headers(self) -> str:
         """Generate code for headers setup."""
-        if not self.parsed.get('headers'):
+        if not self.headers:
             return ''
             
-        headers = json.dumps(self.parsed['headers'], indent=4)
-        return f'self.context.headers.update({headers})'
+        headers = self.headers.to_dict()
+        literal = self.sidecars.payload('headers', headers, jsonbackend.dumps(headers, indent=4))
+        return f'self.context.headers.update({literal})'
+
+    def _generate_cookies_literal(self) -> str:
+        """Cookies literal, or their sidecar file load when large."""
+        cookies = self.parsed['cookies']
+        return self.sidecars.payload('cookies', cookies, jsonbackend.dumps(cookies, indent=4))
 
     def _generate_cookies(self) -> str:
         """Generate code for cookies setup."""
         if not self.parsed.get('cookies'):
             return ''
             
-        cookies = json.dumps(self.parsed['cookies'], indent=4)
+        cookies = jsonbackend.dumps(self.parsed['cookies'], indent=4)
         return f'self.context.cookies.update({cookies})'
 
     def _generate_request(self) -> str:
@@ -56,10 +118,20 @@ class ContextCodeWriter:
         url = self.parsed['url']
         method = self.parsed['method'].upper()
         
+        if self._passthrough_body():
+            return f'response = self.context.{method}("{url}", data={self._passthrough_body()})'
+        
         if not self.parsed.get('data'):
             return f'response = self.context.{method}("{url}")'
             
-        data = json.dumps(self.parsed['data'], indent=4)
+        data = jsonbackend.dumps(self.parsed['data'], indent=4)
         data_type = 'json' if self.parsed['data_as_json'] else 'data'
         
         return f'response = self.context.{method}("{url}", {data_type}={data})'
+
+    def _passthrough_body(self) -> str:
+        """Literal of the raw captured body in passthrough mode, else ''."""
+        body = self.parsed.get('body')
+        if not self.passthrough or not body:
+            return ''
+        return self.sidecars.payload('body', body.view, body.literal())
@@ -0,0 +1,38 @@
+from pathlib import Path
+from typing import Dict, Union
+from urllib.parse import urlsplit
+
+NETSCAPE_HEADER = '# Netscape HTTP Cookie File'
+
+# Cache directory used by generated scrapers, one jar file per host
+COOKIE_CACHE_DIR = '.cookies'
+
+
+def default_jar_path(url: str) -> str:
+    """Cookie jar location for the host of a URL."""
+    host = urlsplit(url).hostname or 'default'
+    return f'{COOKIE_CACHE_DIR}/{host}.txt'
+
+
+def to_netscape(cookies: Dict[str, str], url: str) -> str:
+    """Serialize captured cookies into Netscape cookie-jar format.
+
+    Cookies are written as session cookies (empty expiry) scoped to the
+    request host, so `MozillaCookieJar.load(ignore_discard=True)` reads them
+    back and the cache TTL alone decides when they are refreshed.
+    """
+    parts = urlsplit(url)
+    host = parts.hostname or ''
+    secure = 'TRUE' if parts.scheme == 'https' else 'FALSE'
+    lines = [NETSCAPE_HEADER, '']
+    for name, value in cookies.items():
+        lines.append('\t'.join([host, 'FALSE', '/', secure, '', name, str(value)]))
+    return '\n'.join(lines) + '\n'
+
+
+def write_netscape(cookies: Dict[str, str], url: str, path: Union[str, Path]) -> Path:
+    """Write captured cookies to a Netscape cookie-jar file to seed the cache."""
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text(to_netscape(cookies, url))
+    return path
@@ -1,5 +1,4 @@
 import re
-import json
 import shlex
 from argparse import ArgumentParser
 from collections import OrderedDict
@@ -7,6 +6,80 @@ from typing import Dict, Any, List, Tuple, Optional
 from urllib.parse import unquote_plus, parse_qsl, urlsplit
 from http.cookies import SimpleCookie
 
+from . import jsonbackend
+from .body import RawBody
+from .graphql import detect_graphql
+from .headers import HeaderMap
+from .multipart import parse_form_field
+from .pagination import detect_pagination
+
+class ParsedCurl(dict):
+    """Parsed curl command whose request body is decoded lazily.
+
+    POST requests carry the captured body as a `RawBody` under `body`;
+    `data`, `ordered_data` and `data_as_json` are decoded from it on
+    first access, and `pagination` and `graphql` are detected from the
+    decoded data. Lookups, `in`, `get()` and `copy()` know the lazy keys;
+    `dict()`, iteration and `json.dumps` only see the keys decoded so
+    far, so hand them `materialize()` instead.
+    """
+
+    LAZY_KEYS = ('data', 'ordered_data', 'data_as_json', 'pagination', 'graphql')
+
+    def __missing__(self, key):
+        if key not in self.LAZY_KEYS or not dict.__contains__(self, 'body'):
+            raise KeyError(key)
+        if key == 'pagination':
+            self['pagination'] = detect_pagination(self['data'])
+        elif key == 'graphql':
+            self['graphql'] = detect_graphql(self['data']) if self['data_as_json'] else None
+        else:
+            body = dict.__getitem__(self, 'body')
+            try:
+                data, ordered_data = body.decode(CurlParser._eval_js_object)
+            except ValueError:
+                # Neither JSON nor a JavaScript object: read it as a query string
+                ordered_data = parse_qsl(body.text)
+                data = dict(ordered_data)
+            self['data'] = data
+            self['ordered_data'] = ordered_data
+            self['data_as_json'] = ordered_data is None
+        return dict.__getitem__(self, key)
+
+    def __contains__(self, key) -> bool:
+        return dict.__contains__(self, key) or (key in self.LAZY_KEYS and dict.__contains__(self, 'body'))
+
+    def get(self, key, default=None):
+        try:
+            return self[key]
+        except KeyError:
+            return default
+
+    def copy(self) -> 'ParsedCurl':
+        return ParsedCurl(self)
+
+    def materialize(self) -> Dict[str, Any]:
+        """Plain dict with every lazy key decoded."""
+        for key in self.LAZY_KEYS:
+            if key in self:
+                self[key]
+        return dict(self)
+
+class CurlArgumentParser(ArgumentParser):
+    """ArgumentParser raising ValueError instead of printing usage and exiting."""
+
+    # Unknown arguments can be whole cookie headers
+    MAX_MESSAGE = 200
+
+    def __init__(self, *args, **kwargs):
+        # `-h` would print usage to stdout and exit, even from the live editor
+        super().__init__(*args, add_help=False, **kwargs)
+
+    def error(self, message: str):
+        if len(message) > self.MAX_MESSAGE:
+            message = message[:self.MAX_MESSAGE] + '...'
+        raise ValueError(f"Invalid curl command format: {message}")
+
 class CurlParser:
     """Parser for curl commands with modern Python features."""
     
@@ -23,20 +96,31 @@ class CurlParser:
         if not curl_command.startswith('curl'):
             raise ValueError("Invalid curl command")
         
-        # Parse arguments
-        parser = ArgumentParser()
+        return CurlParser.parse_args(shlex.split(curl_command, posix=True))
+    
+    @staticmethod
+    def parse_args(args: List[str]) -> Dict[str, Any]:
+        """Parse an already tokenized curl command (`curl` included)."""
+        parser = CurlArgumentParser()
         parser.add_argument('command')
         parser.add_argument('url', nargs='?')
         parser.add_argument('-d', '--data')
-        parser.add_argument('-b', '--data-binary', default=None)
+        parser.add_argument('--data-binary', default=None)
         parser.add_argument('--data-raw', default=None)
+        # One list tagged with `literal` keeps -F and --form-string parts in order
+        parser.add_argument('-F', '--form', action='append', default=[], type=lambda field: (field, False))
+        parser.add_argument('--form-string', dest='form', action='append', type=lambda field: (field, True))
+        parser.add_argument('-b', '--cookie', action='append', default=[])
         parser.add_argument('-X', default='')
         parser.add_argument('-H', '--header', action='append', default=[])
         parser.add_argument('--compressed', action='store_true')
+        parser.add_argument('--http2', action='store_true')
+        parser.add_argument('--keepalive-time', type=int, default=None)
+        parser.add_argument('--limit-rate', default=None)
+        parser.add_argument('-r', '--range', default=None)
         parser.add_argument('-k', '--insecure', action='store_true')
         
         try:
-            args = shlex.split(curl_command, posix=True)
             parsed_args = parser.parse_args(args)
             
             if not parsed_args.url:
@@ -46,37 +130,12 @@ class CurlParser:
             post_data = (parsed_args.data or parsed_args.data_binary or 
                         parsed_args.data_raw)
             
-            if post_data:
-                method = 'post'
-                post_data = post_data.lstrip('$')  # Remove leading $ if present
-                
-                try:
-                    ordered_data = parse_qsl(post_data)
-                    data_dict = dict(ordered_data)
-                    data_as_json = False
-                except Exception:
-                    data_as_json = True
-                    try:
-                        data_dict = json.loads(post_data)
-                    except ValueError:
-                        data_dict = CurlParser._eval_js_object(post_data)
-                    ordered_data = None
-            else:
-                method = 'get'
-                data_as_json = False
-                parsed_url = urlsplit(parsed_args.url)
-                ordered_data = parse_qsl(parsed_url.query)
-                data_dict = dict(ordered_data)
-                parsed_args.url = f'{parsed_url.scheme}://{parsed_url.netloc}{parsed_url.path}'
-
+            if parsed_args.form:
+                return CurlParser._handle_form_request(parsed_args)
+            
             return CurlParser._process_parsed_args(parsed_args, post_data)
             
         except Exception as e:
-            if isinstance(e, SystemExit):
-                # This means ArgumentParser showed help or had an error
-                if not curl_command.strip().endswith('curl'):
-                    raise ValueError("Invalid curl command format")
-                raise ValueError("URL is required")
             raise ValueError(str(e))
     
     @staticmethod
@@ -89,34 +148,35 @@ class CurlParser:
 
     @staticmethod
     def _handle_post_request(post_data: str, parsed_args) -> Dict[str, Any]:
-        """Handle POST request parsing."""
-        post_data = post_data.strip().lstrip('$')
-        
-        try:
-            # First try to parse as JSON
-            try:
-                post_data_dict = json.loads(post_data)
-                data_as_json = True
-                ordered_post_data = None
-            except json.JSONDecodeError:
-                # If not JSON, try query string
-                ordered_post_data = parse_qsl(post_data)
-                post_data_dict = dict(ordered_post_data)
-                data_as_json = False
-        except Exception:
-            # If both fail, try JavaScript object notation
-            data_as_json = True
-            post_data_dict = CurlParser._eval_js_object(post_data)
-            ordered_post_data = None
+        """Handle POST request parsing, leaving the body undecoded until used."""
+        body = RawBody(post_data)
 
-        return {
+        return ParsedCurl({
             'method': 'post',
             'url': parsed_args.url,
-            'data': post_data_dict,
-            'ordered_data': ordered_post_data,
-            'data_as_json': data_as_json,
-            **CurlParser._parse_headers_and_cookies(parsed_args.header)
-        }
+            'body': body,
+            'transfer': CurlParser._parse_transfer_options(parsed_args),
+            **CurlParser._parse_headers_and_cookies(parsed_args.header, parsed_args.cookie)
+        })
+
+    @staticmethod
+    def _handle_form_request(parsed_args) -> Dict[str, Any]:
+        """Handle multipart form (-F/--form) request parsing."""
+        form = [parse_form_field(field, literal) for field, literal in parsed_args.form]
+        ordered_form_data = [
+            (part['name'], part['value']) for part in form if part['value'] is not None
+        ]
+        
+        return ParsedCurl({
+            'method': 'post',
+            'url': parsed_args.url,
+            'data': dict(ordered_form_data),
+            'ordered_data': ordered_form_data,
+            'data_as_json': False,
+            'form': form,
+            'transfer': CurlParser._parse_transfer_options(parsed_args),
+            **CurlParser._parse_headers_and_cookies(parsed_args.header, parsed_args.cookie)
+        })
 
     @staticmethod
     def _handle_get_request(parsed_args) -> Dict[str, Any]:
@@ -124,36 +184,55 @@ class CurlParser:
         parsed_url = urlsplit(parsed_args.url)
         ordered_data_dict = parse_qsl(parsed_url.query)
         
-        return {
+        return ParsedCurl({
             'method': 'get',
             'url': f'{parsed_url.scheme}://{parsed_url.netloc}{parsed_url.path}',
             'data': dict(ordered_data_dict),
             'ordered_data': ordered_data_dict,
             'data_as_json': False,
-            **CurlParser._parse_headers_and_cookies(parsed_args.header)
+            'pagination': detect_pagination(dict(ordered_data_dict)),
+            'transfer': CurlParser._parse_transfer_options(parsed_args),
+            **CurlParser._parse_headers_and_cookies(parsed_args.header, parsed_args.cookie)
+        })
+
+    @staticmethod
+    def _parse_transfer_options(parsed_args) -> Dict[str, Any]:
+        """Collect transfer settings (compression, HTTP/2, keep-alive, rate, range)."""
+        return {
+            'compressed': parsed_args.compressed,
+            'http2': parsed_args.http2,
+            'keepalive_time': parsed_args.keepalive_time,
+            'limit_rate': parsed_args.limit_rate,
+            'range': parsed_args.range,
         }
 
     @staticmethod
-    def _parse_headers_and_cookies(headers: List[str]) -> Dict[str, Dict[str, str]]:
+    def _parse_headers_and_cookies(headers: List[str], cookies: Optional[List[str]] = None) -> Dict[str, Any]:
         """Parse headers and cookies from curl command."""
         cookie_dict = OrderedDict()
-        headers_dict = OrderedDict()
+        header_map = HeaderMap()
+        cookie_strings = []
 
         for header in headers:
             key, value = header.split(":", 1)
             
             if key.lower() == 'cookie':
-                cookie = SimpleCookie(value)
-                for k in cookie:
-                    try:
-                        cookie_dict[k] = unquote_plus(cookie[k].value)
-                    except Exception:
-                        cookie_dict[k] = cookie[k].value
+                cookie_strings.append(value)
             else:
-                headers_dict[key] = value.strip()
+                header_map.add(key.strip(), value.strip())
+
+        # -b/--cookie also takes a cookie jar filename, only `name=value` strings are cookies
+        cookie_strings.extend(c for c in cookies or [] if '=' in c)
+        for value in cookie_strings:
+            cookie = SimpleCookie(value)
+            for k in cookie:
+                try:
+                    cookie_dict[k] = unquote_plus(cookie[k].value)
+                except Exception:
+                    cookie_dict[k] = cookie[k].value
 
         return {
-            'headers': headers_dict,
+            'headers': header_map,
             'cookies': cookie_dict
         }
 
@@ -174,4 +253,4 @@ class CurlParser:
         for apos in re.findall('[a-zA-Z]\"[a-zA-Z]', data):
             data = data.replace(apos, apos.replace('"', "'"))
 
-        return json.loads(data)
+        return jsonbackend.loads(data)
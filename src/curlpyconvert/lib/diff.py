@@ -0,0 +1,148 @@
+from typing import Dict, Any, List, Tuple
+
+from .headers import HeaderMap
+
+# Longest value shown in a report line before it is elided
+MAX_VALUE_WIDTH = 80
+
+
+def diff_mappings(a: Dict[str, Any], b: Dict[str, Any]) -> Dict[str, Any]:
+    """Set-based diff of two mappings: added, removed and changed keys."""
+    keys_a = a.keys()
+    keys_b = b.keys()
+    return {
+        'added': {key: b[key] for key in keys_b - keys_a},
+        'removed': {key: a[key] for key in keys_a - keys_b},
+        'changed': {key: (a[key], b[key]) for key in keys_a & keys_b if a[key] != b[key]},
+    }
+
+
+def diff_json(a: Any, b: Any) -> List[Tuple[str, str, Any, Any]]:
+    """Deep diff of two decoded JSON documents.
+
+    Returns `(op, path, old, new)` tuples where op is '+', '-' or '~',
+    ordered by path segment with list indexes compared as numbers.
+    Walks both trees with an explicit stack, so deeply nested bodies never
+    hit the recursion limit, and object keys are compared as sets.
+    """
+    changes = []
+    # Segments are linked to their parent, `(parent, segment)`, so descending
+    # copies nothing; a sort key is only built for the changes found
+    stack = [('$', None, a, b)]
+    while stack:
+        path, segments, left, right = stack.pop()
+        if isinstance(left, dict) and isinstance(right, dict):
+            keys_left = left.keys()
+            keys_right = right.keys()
+            for key in keys_right - keys_left:
+                changes.append(((segments, (1, 0, key)), ('+', f'{path}.{key}', None, right[key])))
+            for key in keys_left - keys_right:
+                changes.append(((segments, (1, 0, key)), ('-', f'{path}.{key}', left[key], None)))
+            for key in keys_left & keys_right:
+                stack.append((f'{path}.{key}', (segments, (1, 0, key)), left[key], right[key]))
+        elif isinstance(left, list) and isinstance(right, list):
+            common = min(len(left), len(right))
+            for index in range(common):
+                stack.append((f'{path}[{index}]', (segments, (0, index, '')), left[index], right[index]))
+            for index in range(common, len(right)):
+                changes.append(((segments, (0, index, '')), ('+', f'{path}[{index}]', None, right[index])))
+            for index in range(common, len(left)):
+                changes.append(((segments, (0, index, '')), ('-', f'{path}[{index}]', left[index], None)))
+        elif type(left) is not type(right) or left != right:
+            changes.append((segments, ('~', path, left, right)))
+    changes.sort(key=lambda change: _path_key(change[0]))
+    return [change for _, change in changes]
+
+
+def _path_key(segments) -> List[Tuple[int, int, str]]:
+    """Sort key of linked path segments: (0, index, '') per list index, (1, 0, key) per object key."""
+    key = []
+    while segments is not None:
+        segments, segment = segments
+        key.append(segment)
+    key.reverse()
+    return key
+
+
+def _query_dict(parsed: Dict[str, Any]) -> Dict[str, Any]:
+    """Group ordered query/form params by name, keeping repeated values."""
+    grouped: Dict[str, Any] = {}
+    for key, value in parsed.get('ordered_data') or []:
+        grouped.setdefault(key, []).append(value)
+    return {key: values[0] if len(values) == 1 else tuple(values) for key, values in grouped.items()}
+
+
+def _header_dict(parsed: Dict[str, Any]) -> Dict[str, str]:
+    """Headers keyed by lowercase name so casing differences are ignored."""
+    return {key.lower(): value for key, value in HeaderMap(parsed.get('headers')).to_dict().items()}
+
+
+def diff_requests(a: Dict[str, Any], b: Dict[str, Any]) -> Dict[str, Any]:
+    """Diff two parsed curl commands section by section."""
+    result: Dict[str, Any] = {}
+    for field in ('method', 'url'):
+        if a.get(field) != b.get(field):
+            result[field] = (a.get(field), b.get(field))
+
+    json_a = a.get('method') == 'post' and a.get('data_as_json')
+    json_b = b.get('method') == 'post' and b.get('data_as_json')
+    if not json_a and not json_b:
+        result['params'] = diff_mappings(_query_dict(a), _query_dict(b))
+    else:
+        result['params'] = diff_mappings({}, {})
+
+    result['headers'] = diff_mappings(_header_dict(a), _header_dict(b))
+    result['cookies'] = diff_mappings(dict(a.get('cookies') or {}), dict(b.get('cookies') or {}))
+
+    if json_a and json_b:
+        result['body'] = diff_json(a.get('data'), b.get('data'))
+    elif json_a or json_b:
+        result['body'] = [('~', '$', a.get('data'), b.get('data'))]
+    else:
+        result['body'] = []
+    return result
+
+
+def _short(value: Any) -> str:
+    text = value if isinstance(value, str) else repr(value)
+    if len(text) > MAX_VALUE_WIDTH:
+        return f'{text[:MAX_VALUE_WIDTH - 3]}...'
+    return text
+
+
+def format_diff(diff: Dict[str, Any], label_a: str = 'a', label_b: str = 'b') -> str:
+    """Render a request diff as a compact text report."""
+    lines = [f'--- {label_a}', f'+++ {label_b}']
+    for field in ('method', 'url'):
+        if field in diff:
+            old, new = diff[field]
+            lines.append(f'{field}: {_short(old)} -> {_short(new)}')
+
+    for section in ('params', 'headers', 'cookies'):
+        changes = diff[section]
+        if not any(changes.values()):
+            continue
+        lines.append(
+            f"{section}: +{len(changes['added'])} -{len(changes['removed'])} ~{len(changes['changed'])}"
+        )
+        for key in sorted(changes['added']):
+            lines.append(f'  + {key}: {_short(changes["added"][key])}')
+        for key in sorted(changes['removed']):
+            lines.append(f'  - {key}: {_short(changes["removed"][key])}')
+        for key in sorted(changes['changed']):
+            old, new = changes['changed'][key]
+            lines.append(f'  ~ {key}: {_short(old)} -> {_short(new)}')
+
+    if diff['body']:
+        lines.append(f"body: {len(diff['body'])} change(s)")
+        for op, path, old, new in diff['body']:
+            if op == '+':
+                lines.append(f'  + {path}: {_short(new)}')
+            elif op == '-':
+                lines.append(f'  - {path}: {_short(old)}')
+            else:
+                lines.append(f'  ~ {path}: {_short(old)} -> {_short(new)}')
+
+    if len(lines) == 2:
+        lines.append('requests are identical')
+    return '\n'.join(lines)
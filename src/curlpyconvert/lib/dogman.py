@@ -1,43 +1,180 @@
-from typing import Dict, Any
-import json
+from typing import Dict, Any, Optional
+
+from . import jsonbackend
+from .cookiejar import default_jar_path
+from .graphql import requests_graphql_code
+from .headers import COMMON_HEADER_MARKER, HeaderMap
+from .multipart import (
+    REQUESTS_FORM_ARGUMENTS, requests_multipart_code, requests_multipart_imports, requests_multipart_rewind
+)
+from .pagination import requests_pagination_code
+from .sidecar import Sidecars
+from .streaming import detect_stream, requests_stream_code
+from .transfer import range_header, requests_transfer_code
 
 class DogmanCodeWriter:
     """Generates Dogman framework code from parsed curl commands."""
     
-    COMMON_HEADERS = [
-        'accept-encoding',
-        'accept-language',
-        'accept',
-        'connection',
-        'user-agent'
-    ]
+    COOKIE_CACHE_HELPERS = '''from http.cookiejar import MozillaCookieJar
+from pathlib import Path
+import time
+
+COOKIE_JAR = Path("{jar_path}")
+COOKIE_TTL = {ttl}  # seconds before dogman cookies are fetched again
+
+def load_cookie_jar(path=COOKIE_JAR, ttl=COOKIE_TTL):
+    """Return the cached cookie jar, or None when it is missing or expired."""
+    if not path.exists() or time.time() - path.stat().st_mtime > ttl:
+        return None
+    jar = MozillaCookieJar(str(path))
+    jar.load(ignore_discard=True, ignore_expires=True)
+    return jar
+
+def save_cookie_jar(cookies, path=COOKIE_JAR):
+    """Persist session cookies so later runs can skip the warm-up."""
+    path.parent.mkdir(parents=True, exist_ok=True)
+    jar = MozillaCookieJar(str(path))
+    for cookie in cookies:
+        jar.set_cookie(cookie)
+    jar.save(ignore_discard=True, ignore_expires=True)'''
     
-    def __init__(self, parsed_command: Dict[str, Any]):
+    def __init__(
+        self,
+        parsed_command: Dict[str, Any],
+        passthrough: bool = False,
+        cookie_cache: bool = False,
+        cookie_jar: Optional[str] = None,
+        cookie_ttl: int = 3600,
+        paginate: bool = False,
+        prefetch: int = 0,
+        persisted_queries: bool = False,
+        stream: bool = False,
+        sidecars: Optional[Sidecars] = None
+    ):
         self.parsed = parsed_command
+        # Emit the captured body verbatim instead of a decoded literal
+        self.passthrough = passthrough
+        # Emit a lazy page generator for paginated requests
+        self.paginate = paginate
+        self.prefetch = prefetch
+        # Send GraphQL operations as Automatic Persisted Queries
+        self.persisted_queries = persisted_queries
+        # Consume large downloads and JSON listings without buffering the body
+        self.stream = stream
+        # Moves large literals to files next to the module when saving with --output
+        self.sidecars = sidecars or Sidecars()
+        # Reuse dogman cookies across runs through a file-backed jar
+        self.cookie_cache = cookie_cache
+        self.cookie_jar = cookie_jar or default_jar_path(parsed_command['url'])
+        self.cookie_ttl = cookie_ttl
+        self.headers = HeaderMap(parsed_command.get('headers'))
+        if parsed_command.get('form'):
+            # The multipart encoder sets its own boundary
+            self.headers.remove('content-type')
+        if range_header(parsed_command.get('transfer')) and 'range' not in self.headers:
+            self.headers.add('Range', range_header(parsed_command['transfer']))
         
     def generate_code(self) -> str:
         """Generate Dogman framework code from parsed curl command."""
         code_parts = []
         
+        # Multipart uploads need the streaming encoder
+        if self.parsed.get('form'):
+            code_parts.append(requests_multipart_imports(self.parsed['form']))
+        
+        # Add cookie cache helpers
+        if self.cookie_cache:
+            code_parts.append(self.COOKIE_CACHE_HELPERS.format(jar_path=self.cookie_jar, ttl=self.cookie_ttl))
+        
         # Add dogman config setup
         code_parts.append('dogman_config = {\n    "setup": {}\n}')
         code_parts.append('self.context.setup(dogman_config=dogman_config)')
         
         # Get cookies using dogman
         url = self.parsed['url']
-        code_parts.append(f'self.context.dogman.get_cookies("{url}", spoofing="akamai")')
+        if self.cookie_cache:
+            code_parts.append(self._generate_cached_cookies())
+        else:
+            code_parts.append(f'self.context.dogman.get_cookies("{url}", spoofing="akamai")')
         
         # Add headers setup if present
-        if self.parsed.get('headers'):
-            headers = self.parsed['headers'].copy()
+        if self.headers:
+            headers = self.headers.to_dict()
             # Mark common headers
-            for header in ['accept', 'accept-language', 'user-agent']:
-                if header in headers:
-                    headers[header] = f"{headers[header]} # should not be necessary"
-            code_parts.append(f'self.context.headers.update({json.dumps(headers, indent=4)})')
+            for header in headers:
+                if HeaderMap.is_common(header):
+                    headers[header] = f"{headers[header]}{COMMON_HEADER_MARKER}"
+            # The sidecar file keeps the values as captured, without the markers
+            literal = self.sidecars.payload('headers', self.headers.to_dict(), jsonbackend.dumps(headers, indent=4))
+            code_parts.append(f'self.context.headers.update({literal})')
+        
+        # Add transfer settings (compression, HTTP/2, keep-alive, rate limit)
+        code_parts.append(requests_transfer_code(self.parsed.get('transfer')))
         
-        # Generate just the request line without params
         method = self.parsed['method'].upper()
-        code_parts.append(f'response = self.context.{method}("{url}")')
+        if self.paginate and self.parsed.get('pagination'):
+            # Fetch the listing page by page through a generator
+            code_parts.append(requests_pagination_code(self.parsed, self.prefetch, self.sidecars))
+        elif self.persisted_queries and self.parsed.get('graphql'):
+            # Send hashes instead of multi-KB query documents
+            code_parts.append(requests_graphql_code(self.parsed))
+        elif self.parsed.get('form'):
+            # Stream multipart file parts from disk
+            form = self.parsed['form']
+            request_line = f'response = self.context.{method}("{url}", {REQUESTS_FORM_ARGUMENTS})'
+            refresh = ''
+            if self.cookie_cache:
+                # The encoder has drained the files, rewind them before sending again
+                refresh = self._generate_cookie_refresh(f'{requests_multipart_rewind(form)}\n{request_line}')
+            code_parts.append(requests_multipart_code(form, request_line, refresh))
+        else:
+            if self._passthrough_body():
+                arguments = f'"{url}", data={self._passthrough_body()}'
+            else:
+                # Generate just the request line without params
+                arguments = f'"{url}"'
+            mode = detect_stream(self.parsed, self.stream)
+            if mode:
+                # Read the body as it arrives instead of buffering it
+                arguments += ', stream=True'
+            request_line = f'response = self.context.{method}({arguments})'
+            refresh = self._generate_cookie_refresh(request_line) if self.cookie_cache else ''
+            if mode:
+                code_parts.append(requests_stream_code(mode, request_line, url, refresh))
+            else:
+                code_parts.append(request_line)
+                code_parts.append(refresh)
         
         return '\n\n'.join([p for p in code_parts if p])
+
+    def _passthrough_body(self) -> str:
+        """Literal of the raw captured body in passthrough mode, else ''."""
+        body = self.parsed.get('body')
+        if not self.passthrough or not body:
+            return ''
+        return self.sidecars.payload('body', body.view, body.literal())
+
+    def _generate_cached_cookies(self) -> str:
+        """Generate cookie loading from the cache, warming up only on a miss."""
+        url = self.parsed['url']
+        return '\n'.join([
+            'jar = load_cookie_jar()',
+            'if jar is None:',
+            f'    self.context.dogman.get_cookies("{url}", spoofing="akamai")',
+            '    save_cookie_jar(self.context.cookies)',
+            'else:',
+            '    self.context.cookies.update(jar)'
+        ])
+
+    def _generate_cookie_refresh(self, request_line: str) -> str:
+        """Generate a single cookie refresh and retry when cached cookies are rejected.
+
+        `request_line` may span several lines, e.g. rebuilding a request body.
+        """
+        url = self.parsed['url']
+        return '\n'.join([
+            'if response.status_code == 403:',
+            f'    self.context.dogman.get_cookies("{url}", spoofing="akamai")',
+            '    save_cookie_jar(self.context.cookies)',
+            *(f'    {line}' for line in request_line.split('\n'))
+        ])
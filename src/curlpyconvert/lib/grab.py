@@ -1,47 +1,101 @@
-from typing import Dict, Any
-import json
+from typing import Dict, Any, Optional
 from collections import OrderedDict
 
+from . import jsonbackend
+from .graphql import graphql_code
+from .headers import COMMON_HEADER_MARKER, HeaderMap
+from .multipart import is_file_part
+from .pagination import pagination_code
+from .sidecar import Sidecars
+from .streaming import detect_stream, grab_stream_code
+from .transfer import ACCEPT_ENCODING, range_header
+
 class GrabCodeWriter:
     """Generates Grab framework code from parsed curl commands."""
     
-    COMMON_HEADERS = [
-        'accept-encoding',
-        'accept-language',
-        'accept',
-        'connection',
-        'user-agent'
-    ]
-
-    def __init__(self, parsed_command: Dict[str, Any]):
+    def __init__(
+        self,
+        parsed_command: Dict[str, Any],
+        passthrough: bool = False,
+        paginate: bool = False,
+        prefetch: int = 0,
+        persisted_queries: bool = False,
+        stream: bool = False,
+        sidecars: Optional[Sidecars] = None
+    ):
         self.parsed = parsed_command
+        # Emit the captured body verbatim instead of a decoded literal
+        self.passthrough = passthrough
+        # Emit a lazy page generator for paginated requests
+        self.paginate = paginate
+        self.prefetch = prefetch
+        # Send GraphQL operations as Automatic Persisted Queries
+        self.persisted_queries = persisted_queries
+        # Consume large downloads and JSON listings without buffering the body
+        self.stream = stream
+        # Moves large literals to files next to the module when saving with --output
+        self.sidecars = sidecars or Sidecars()
+        self.headers = HeaderMap(parsed_command.get('headers'))
+        if parsed_command.get('form'):
+            # Grab builds its own multipart boundary
+            self.headers.remove('content-type')
+        if range_header(parsed_command.get('transfer')) and 'range' not in self.headers:
+            self.headers.add('Range', range_header(parsed_command['transfer']))
         
     def generate_code(self) -> str:
         """Generate the grab code."""
         code_parts = []
         
+        # Multipart uploads need grab's file helpers
+        if self.parsed.get('form'):
+            code_parts.append(self._generate_multipart_imports())
+        
         # Reset headers if needed
         code_parts.append('self.g.setup(common_headers={})  # remove this line if possible')
         
+        # Add transfer settings (compression, HTTP/2, keep-alive, rate limit)
+        transfer = self._generate_transfer()
+        if transfer:
+            code_parts.append(transfer)
+        
         # Add cookies setup if present
         if self.parsed.get('cookies'):
-            code_parts.append(f"self.g.setup(cookies={json.dumps(self.parsed['cookies'], indent=4)})")
+            cookies = self.parsed['cookies']
+            literal = self.sidecars.payload('cookies', cookies, jsonbackend.dumps(cookies, indent=4))
+            code_parts.append(f"self.g.setup(cookies={literal})")
             
         # Add headers setup if present
-        if self.parsed.get('headers'):
-            headers = self.parsed['headers'].copy()
-            # Mark common headers
-            for header in ['accept', 'accept-language', 'user-agent']:
-                if header in headers:
-                    headers[header] = f"{headers[header]} # should not be necessary"
-            code_parts.append(f"self.g.setup(headers={json.dumps(headers, indent=4)})")
+        if self.headers:
+            code_parts.append(self._generate_headers())
+        
+        # Stream multipart file parts from disk
+        if self.parsed.get('form'):
+            code_parts.append(self._generate_multipart())
         
         # Generate just the request line without params
         url = self.parsed['url']
-        code_parts.append(f"self.g.go('{url}')")
+        if self.paginate and self.parsed.get('pagination'):
+            # Fetch the listing page by page through a generator
+            code_parts.append(self._generate_pagination())
+        elif self.persisted_queries and self.parsed.get('graphql'):
+            # Send hashes instead of multi-KB query documents
+            code_parts.append(graphql_code(
+                self.parsed['graphql'], url, 'self.g.go(GRAPHQL_URL, json={})', '{}.json'
+            ))
+        elif self._passthrough_body():
+            code_parts.append(self._generate_request_line(f"self.g.go('{url}', post={self._passthrough_body()})"))
+        else:
+            code_parts.append(self._generate_request_line(f"self.g.go('{url}')"))
         
         return '\n\n'.join(code_parts)
 
+    def _generate_request_line(self, request_line: str) -> str:
+        """Stream the body to disk instead of memory when it is large or a file."""
+        mode = detect_stream(self.parsed, self.stream)
+        if not mode:
+            return request_line
+        return grab_stream_code(mode, request_line, self.parsed['url'])
+
     def _generate_ordered_params(self) -> str:
         """Generate code for ordered parameters."""
         if not self.parsed.get('ordered_data'):
@@ -61,16 +115,65 @@ class GrabCodeWriter:
 
     def _generate_headers(self) -> str:
         """Generate code for headers setup."""
-        if not self.parsed.get('headers'):
+        if not self.headers:
             return ''
             
         headers_dict = OrderedDict()
-        for key, value in self.parsed['headers'].items():
+        for key, value in self.headers.to_dict().items():
             headers_dict[key] = value
-            if key.lower() in self.COMMON_HEADERS:
-                headers_dict[key] = f"{value} # should not be necessary"
+            if HeaderMap.is_common(key):
+                headers_dict[key] = f"{value}{COMMON_HEADER_MARKER}"
+
+        # The sidecar file keeps the values as captured, without the markers
+        literal = self.sidecars.payload('headers', self.headers.to_dict(), jsonbackend.dumps(headers_dict, indent=4))
+        return f'self.g.setup(headers={literal})'
 
-        return f'self.g.setup(headers={json.dumps(headers_dict, indent=4)})'
+    def _generate_transfer(self) -> str:
+        """Generate code for curl transfer options."""
+        transfer = self.parsed.get('transfer')
+        if not transfer:
+            return ''
+            
+        lines = []
+        if transfer.get('compressed'):
+            # libcurl negotiates and decodes the body itself
+            lines.append(f"self.g.setup(encoding='{ACCEPT_ENCODING.replace(' ', '')}')")
+        if transfer.get('http2'):
+            lines.append('# --http2: Grab has no HTTP/2 option, pycurl.HTTP_VERSION on the transport would be needed')
+        if transfer.get('keepalive_time') is not None:
+            lines.append(
+                f"# --keepalive-time {transfer['keepalive_time']}: Grab reuses connections, "
+                'TCP keepalive probes are not configurable'
+            )
+        if transfer.get('limit_rate'):
+            lines.append(f"# --limit-rate {transfer['limit_rate']}: Grab has no rate limit option")
+        return '\n'.join(lines)
+
+    def _generate_multipart_imports(self) -> str:
+        """Generate imports needed by the multipart setup."""
+        imports = ['from grab import UploadFile']
+        if any(part['from_file'] for part in self.parsed['form']):
+            imports.append('from pathlib import Path')
+        return '\n'.join(imports)
+
+    def _generate_multipart(self) -> str:
+        """Generate multipart_post setup, uploading files straight from disk."""
+        lines = ['self.g.setup(multipart_post=[']
+        for part in self.parsed['form']:
+            name = jsonbackend.dumps(part['name'])
+            if is_file_part(part):
+                value = (
+                    f'UploadFile({jsonbackend.dumps(part["path"])}, '
+                    f'filename={jsonbackend.dumps(part["filename"])}, '
+                    f'content_type={jsonbackend.dumps(part["content_type"])})'
+                )
+            elif part['from_file']:
+                value = f'Path({jsonbackend.dumps(part["path"])}).read_text()'
+            else:
+                value = jsonbackend.dumps(part['value'])
+            lines.append(f'    ({name}, {value}),')
+        lines.append('])')
+        return '\n'.join(lines)
 
     def _generate_cookies(self) -> str:
         """Generate code for cookies setup."""
@@ -99,6 +202,9 @@ class GrabCodeWriter:
         url = self.parsed['url']
         method = self.parsed['method']
         
+        if self._passthrough_body():
+            return f"self.g.go('{url}', post={self._passthrough_body()})"
+        
         if not self.parsed.get('data'):
             return f"self.g.go('{url}')"
         
@@ -111,16 +217,35 @@ class GrabCodeWriter:
             
         return f"self.g.go('{url}', {params_type}={params_name})"
 
+    def _generate_pagination(self) -> str:
+        """Generate a lazy page generator over grab requests."""
+        url = self.parsed['url']
+        if self.parsed['method'] == 'get':
+            return pagination_code(
+                self.parsed['pagination'], self.parsed['data'], 'params',
+                f'self.g.go(f"{url}?{{urlencode(params)}}").json', self.prefetch,
+                imports=['from urllib.parse import urlencode'], sidecars=self.sidecars
+            )
+        keyword = 'json' if self.parsed['data_as_json'] else 'post'
+        return pagination_code(
+            self.parsed['pagination'], self.parsed['data'], 'body',
+            f"self.g.go('{url}', {keyword}=body).json", self.prefetch, sidecars=self.sidecars
+        )
+
+    def _passthrough_body(self) -> str:
+        """Literal of the raw captured body in passthrough mode, else ''."""
+        body = self.parsed.get('body')
+        if not self.passthrough or not body:
+            return ''
+        return self.sidecars.payload('body', body.view, body.literal())
+
     def _dict_to_python(self, data: Dict, var_name: str, mark_common: bool = False) -> str:
         """Convert dictionary to Python code string."""
-        dict_str = json.dumps(data, indent=4)
-        
         if mark_common:
-            lines = []
-            for line in dict_str.split('\n'):
-                if any(h in line.lower() for h in self.COMMON_HEADERS):
-                    line += ' # should not be necessary'
-                lines.append(line)
-            dict_str = '\n'.join(lines)
+            data = OrderedDict(
+                (key, f"{value}{COMMON_HEADER_MARKER}" if HeaderMap.is_common(key) else value)
+                for key, value in data.items()
+            )
             
+        dict_str = jsonbackend.dumps(data, indent=4)
         return f"{var_name}={dict_str}"
\ No newline at end of file
@@ -0,0 +1,180 @@
+import hashlib
+import json
+import re
+from typing import Dict, Any, List, Optional
+
+from . import jsonbackend
+
+OPERATION_NAME = re.compile(r'\b(?:query|mutation|subscription)\s+([A-Za-z_]\w*)')
+
+
+def _is_operation(node: Any) -> bool:
+    if not isinstance(node, dict):
+        return False
+    if isinstance(node.get('query'), str):
+        return True
+    extensions = node.get('extensions')
+    persisted = extensions.get('persistedQuery') if isinstance(extensions, dict) else None
+    return isinstance(persisted, dict) and bool(persisted.get('sha256Hash'))
+
+
+def _operation(node: Dict[str, Any]) -> Dict[str, Any]:
+    query = node.get('query') if isinstance(node.get('query'), str) else None
+    persisted = (node.get('extensions') or {}).get('persistedQuery') or {}
+    name = node.get('operationName')
+    if not name and query:
+        match = OPERATION_NAME.search(query)
+        name = match.group(1) if match else None
+    return {
+        'query': query,
+        'sha256': persisted.get('sha256Hash') or hashlib.sha256(query.encode()).hexdigest(),
+        'variables': node.get('variables') or {},
+        'operation_name': name,
+        'persisted': bool(persisted),
+    }
+
+
+def detect_graphql(data: Any) -> Optional[Dict[str, Any]]:
+    """Recognize a GraphQL request body, single or batched.
+
+    Each operation carries its query document (None when the capture only
+    holds a persisted-query hash), the document's SHA-256, its variables
+    and operation name.
+    """
+    if _is_operation(data):
+        return {'batched': False, 'operations': [_operation(data)]}
+    if isinstance(data, list) and data and all(_is_operation(node) for node in data):
+        return {'batched': True, 'operations': [_operation(node) for node in data]}
+    return None
+
+
+def persisted_body(operation: Dict[str, Any]) -> Dict[str, Any]:
+    """Automatic Persisted Query body: the hash and variables, no document."""
+    body = {'variables': operation['variables']}
+    if operation['operation_name']:
+        body['operationName'] = operation['operation_name']
+    body['extensions'] = {'persistedQuery': {'version': 1, 'sha256Hash': operation['sha256']}}
+    return body
+
+
+def payload_sizes(graphql: Dict[str, Any], data: Any) -> Dict[str, int]:
+    """Bytes of the captured body and of the hash-only APQ body."""
+    bodies = [persisted_body(operation) for operation in graphql['operations']]
+    persisted = bodies if graphql['batched'] else bodies[0]
+    return {
+        'captured': len(json.dumps(data, separators=(',', ':')).encode()),
+        'persisted': len(json.dumps(persisted, separators=(',', ':')).encode()),
+    }
+
+
+def _constant_names(operations: List[Dict[str, Any]]) -> List[str]:
+    names = []
+    for operation in operations:
+        base = re.sub(r'(?<=[a-z0-9])([A-Z])', r'_\1', operation['operation_name'] or '')
+        base = re.sub(r'\W', '_', base).upper().strip('_')
+        base = f'{base}_QUERY' if base else 'QUERY'
+        name, counter = base, 2
+        while name in names:
+            name = f'{base}_{counter}'
+            counter += 1
+        names.append(name)
+    return names
+
+
+def _string_literal(text: str) -> str:
+    """Triple-quoted literal keeping the document readable, repr when unsafe."""
+    if '"""' in text or '\\' in text or text.endswith('"'):
+        return repr(text)
+    return f'"""{text}"""'
+
+
+def graphql_code(graphql: Dict[str, Any], url: str, post: str, decode: str) -> str:
+    """Generate APQ requests for a GraphQL capture.
+
+    Query documents become module-level constants next to their
+    precomputed SHA-256, and requests send only the hash and variables.
+    When the server answers PersistedQueryNotFound the request is repeated
+    once with the document, which registers it for later requests. `post`
+    formats a request sending `{}` as JSON to GRAPHQL_URL, `decode` turns
+    a response `{}` into the decoded JSON.
+    """
+    operations = graphql['operations']
+    names = _constant_names(operations)
+    lines = [f'GRAPHQL_URL = "{url}"', '']
+    for name, operation in zip(names, operations):
+        if operation['query'] is None:
+            lines.append(f'{name} = None  # the capture only has the persisted hash')
+        else:
+            lines.append(f'{name} = {_string_literal(operation["query"])}')
+        lines.append(f'{name}_SHA256 = "{operation["sha256"]}"')
+        lines.append('')
+
+    lines += [
+        'def persisted_query(query, sha256, variables, operation_name=None):',
+        '    """APQ body: the hash and variables, without the query document."""',
+        '    body = {"variables": variables}',
+        '    if operation_name:',
+        '        body["operationName"] = operation_name',
+        '    body["extensions"] = {"persistedQuery": {"version": 1, "sha256Hash": sha256}}',
+        '    return body',
+        '',
+        'def query_not_found(result):',
+        '    """Whether the server does not know the hash yet."""',
+        '    return isinstance(result, dict) and any(',
+        '        error.get("message") == "PersistedQueryNotFound"',
+        '        or (error.get("extensions") or {}).get("code") == "PERSISTED_QUERY_NOT_FOUND"',
+        '        for error in result.get("errors") or []',
+        '    )',
+        '',
+    ]
+
+    arguments = [
+        f'({name}, {name}_SHA256, {jsonbackend.dumps_python(operation["variables"])}, '
+        f'{jsonbackend.dumps_python(operation["operation_name"])})'
+        for name, operation in zip(names, operations)
+    ]
+    if not graphql['batched']:
+        lines += [
+            'def send_graphql(query, sha256, variables, operation_name=None):',
+            '    """Send a persisted query, with the full document only if the server asks."""',
+            '    body = persisted_query(query, sha256, variables, operation_name)',
+            f'    response = {post.format("body")}',
+            f'    if query is not None and query_not_found({decode.format("response")}):',
+            '        body["query"] = query',
+            f'        response = {post.format("body")}',
+            '    return response',
+            '',
+            f'response = send_graphql{arguments[0]}',
+        ]
+        return '\n'.join(lines)
+
+    lines += [
+        'def send_graphql_batch(operations):',
+        '    """Send a batch of persisted queries, adding documents only for unknown hashes."""',
+        '    bodies = [persisted_query(*operation) for operation in operations]',
+        f'    response = {post.format("bodies")}',
+        f'    results = {decode.format("response")}',
+        '    if not isinstance(results, list):',
+        '        results = [results] * len(bodies)',
+        '    # Hash-only operations without a document stay unknown and keep their error',
+        '    missing = [',
+        '        index for index, result in enumerate(results)',
+        '        if query_not_found(result) and operations[index][0] is not None',
+        '    ]',
+        '    if missing:',
+        '        for index in missing:',
+        '            bodies[index]["query"] = operations[index][0]',
+        f'        response = {post.format("bodies")}',
+        '    return response',
+        '',
+        'response = send_graphql_batch([',
+        *(f'    {argument},' for argument in arguments),
+        '])',
+    ]
+    return '\n'.join(lines)
+
+
+def requests_graphql_code(parsed: Dict[str, Any]) -> str:
+    """APQ requests for requests-style `self.context` frameworks."""
+    post = f'self.context.{parsed["method"].upper()}(GRAPHQL_URL, json={{}})'
+    return graphql_code(parsed['graphql'], parsed['url'], post, '{}.json()')
@@ -0,0 +1,113 @@
+from typing import Dict, Iterable, Iterator, List, Mapping, Optional, Tuple, Union
+
+# Headers every framework sends on its own - writers flag them as optional
+# with a "# should not be necessary" marker
+COMMON_HEADERS = frozenset({
+    'accept-language',
+    'accept',
+    'user-agent'
+})
+# Appended to common header values in generated code (inside the string)
+COMMON_HEADER_MARKER = ' # should not be necessary'
+
+
+class HeaderMap:
+    """Ordered header multi-map with a case-insensitive lookup index.
+
+    Headers are kept in capture order with their original casing, duplicates
+    included. A lowercase name -> positions index makes lookups O(1).
+    """
+
+    def __init__(self, headers: Union[Mapping[str, str], Iterable[Tuple[str, str]], None] = None):
+        self._items: List[Tuple[str, str]] = []
+        self._index: Dict[str, List[int]] = {}
+        if headers is None:
+            return
+        if isinstance(headers, HeaderMap):
+            headers = headers.items()
+        elif isinstance(headers, Mapping):
+            headers = headers.items()
+        for name, value in headers:
+            self.add(name, value)
+
+    def add(self, name: str, value: str) -> None:
+        """Append a header, keeping any existing values of the same name."""
+        self._index.setdefault(name.lower(), []).append(len(self._items))
+        self._items.append((name, value))
+
+    def get(self, name: str, default: Optional[str] = None) -> Optional[str]:
+        """Return the first value of a header, case-insensitively."""
+        positions = self._index.get(name.lower())
+        if not positions:
+            return default
+        return self._items[positions[0]][1]
+
+    def get_all(self, name: str) -> List[str]:
+        """Return every value of a header in capture order."""
+        return [self._items[i][1] for i in self._index.get(name.lower(), ())]
+
+    def remove(self, name: str) -> None:
+        """Drop all values of a header."""
+        if name.lower() not in self._index:
+            return
+        items = [(k, v) for k, v in self._items if k.lower() != name.lower()]
+        self._items = []
+        self._index = {}
+        for k, v in items:
+            self.add(k, v)
+
+    def items(self) -> List[Tuple[str, str]]:
+        """Return all (name, value) pairs, duplicates included."""
+        return list(self._items)
+
+    def keys(self) -> List[str]:
+        return [name for name, _ in self._items]
+
+    def copy(self) -> 'HeaderMap':
+        return HeaderMap(self._items)
+
+    def to_dict(self) -> Dict[str, str]:
+        """Fold duplicates into one comma-joined value per header (RFC 9110)."""
+        folded: Dict[str, str] = {}
+        names: Dict[str, str] = {}
+        for name, value in self._items:
+            lower = name.lower()
+            if lower in names:
+                folded[names[lower]] = f"{folded[names[lower]]}, {value}"
+            else:
+                names[lower] = name
+                folded[name] = value
+        return folded
+
+    @staticmethod
+    def is_common(name: str) -> bool:
+        """Whether a header is one the frameworks already send by default."""
+        return name.lower() in COMMON_HEADERS
+
+    def __contains__(self, name: object) -> bool:
+        return isinstance(name, str) and name.lower() in self._index
+
+    def __getitem__(self, name: str) -> str:
+        value = self.get(name)
+        if value is None:
+            raise KeyError(name)
+        return value
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self.keys())
+
+    def __len__(self) -> int:
+        return len(self._items)
+
+    def __bool__(self) -> bool:
+        return bool(self._items)
+
+    def __eq__(self, other: object) -> bool:
+        if isinstance(other, HeaderMap):
+            return self._items == other._items
+        if isinstance(other, Mapping):
+            return self.to_dict() == dict(other)
+        return NotImplemented
+
+    def __repr__(self) -> str:
+        return f"HeaderMap({self._items!r})"
@@ -0,0 +1,168 @@
+import re
+from typing import Callable, Dict, Any, List, NamedTuple, Optional
+
+from .curl_parser import CurlParser
+
+# One shell word of a cleaned command (no backslashes left): unquoted runs
+# and quoted strings glued together, like `shlex.split(posix=True)` reads it
+TOKEN = re.compile(r'''(?:[^ \t\r\n'"]+|'[^']*'|"[^"]*")+|['"]''')
+QUOTED = re.compile(r'''([^'"]+)|'([^']*)'|"([^"]*)"''')
+
+# Compared per chunk before narrowing down to the character
+PREFIX_CHUNK = 4096
+
+
+class Token(NamedTuple):
+    start: int
+    end: int
+    value: str
+
+
+def clean_command(text: str) -> str:
+    """The cleanup `CurlParser.parse_curl` does before splitting."""
+    return text.replace('\\\n', ' ').replace('\\', '').strip()
+
+
+def _unquote(word: str) -> str:
+    if "'" not in word and '"' not in word:
+        return word
+    return ''.join(a or b or c for a, b, c in QUOTED.findall(word))
+
+
+def _is_open_quote(text: str, token: Token) -> bool:
+    return token.end - token.start == 1 and text[token.start] in '\'"'
+
+
+def _common_prefix(a: str, b: str) -> int:
+    """Length of the common prefix, compared in C-speed slices."""
+    size = min(len(a), len(b))
+    position = 0
+    while position < size and a[position:position + PREFIX_CHUNK] == b[position:position + PREFIX_CHUNK]:
+        position += PREFIX_CHUNK
+    position = min(position, size)
+    while position < size and a[position] == b[position]:
+        position += 1
+    return position
+
+
+def _common_suffix(a: str, b: str, limit: int) -> int:
+    """Length of the common suffix, at most `limit` characters."""
+    size = min(len(a), len(b), limit)
+    length = 0
+    while length < size:
+        chunk = min(PREFIX_CHUNK, size - length)
+        if a[len(a) - length - chunk:len(a) - length] != b[len(b) - length - chunk:len(b) - length]:
+            break
+        length += chunk
+    while length < size and a[len(a) - length - 1] == b[len(b) - length - 1]:
+        length += 1
+    return length
+
+
+def split_sections(code: str) -> List[str]:
+    """Split generated code at blank lines, keeping triple-quoted strings whole."""
+    sections = []
+    for chunk in code.split('\n\n'):
+        if sections and (sections[-1].count('"""') % 2 or sections[-1].count("'''") % 2):
+            sections[-1] += '\n\n' + chunk
+        else:
+            sections.append(chunk)
+    return sections
+
+
+class IncrementalConverter:
+    """Re-converts a curl command as it is edited, redoing only what changed.
+
+    The command is kept as a list of word spans. After an edit, only the
+    words from the first changed character up to where the scan lines up
+    with the old words again are tokenized anew; the rest are shifted.
+    Parsing and code generation are skipped when the words are unchanged,
+    and `changed` lists the output sections that are new since the last
+    update, so a view only re-renders those.
+    """
+
+    def __init__(self, generate: Callable[[Dict[str, Any]], str]):
+        self.generate = generate
+        self.text = ''
+        self.tokens: List[Token] = []
+        self.parsed: Optional[Dict[str, Any]] = None
+        self.sections: List[str] = []
+        self.changed: List[str] = []
+        self.error: Optional[str] = None
+        # Words tokenized by the last update, for the status line
+        self.retokenized = 0
+
+    @property
+    def code(self) -> str:
+        return '\n\n'.join(self.sections)
+
+    def update(self, text: str) -> List[str]:
+        """Take the editor's current text and return the output sections."""
+        text = clean_command(text)
+        if text == self.text and self.parsed is not None:
+            self.changed = []
+            return self.sections
+        old_args = [token.value for token in self.tokens]
+        self._retokenize(text)
+        self.text = text
+        args = [token.value for token in self.tokens]
+        if args == old_args and self.parsed is not None:
+            # Only whitespace or quoting changed
+            self.changed = []
+            return self.sections
+        try:
+            if not args or args[0] != 'curl':
+                raise ValueError("Invalid curl command")
+            if any(_is_open_quote(text, token) for token in self.tokens):
+                raise ValueError("No closing quotation")
+            self.parsed = CurlParser.parse_args(args)
+        except ValueError as e:
+            # Keep showing the last good code while the command is half-typed
+            self.error = str(e)
+            self.changed = []
+            return self.sections
+        self.error = None
+        return self._render()
+
+    def set_generate(self, generate: Callable[[Dict[str, Any]], str]) -> List[str]:
+        """Switch the code writer, regenerating from the cached parse."""
+        self.generate = generate
+        return self._render() if self.parsed is not None else self.sections
+
+    def _render(self) -> List[str]:
+        previous = set(self.sections)
+        self.sections = split_sections(self.generate(self.parsed))
+        self.changed = [section for section in self.sections if section not in previous]
+        return self.sections
+
+    def _retokenize(self, text: str) -> None:
+        old, tokens = self.text, self.tokens
+        prefix = _common_prefix(old, text)
+        suffix = _common_suffix(old, text, min(len(old), len(text)) - prefix)
+        delta = len(text) - len(old)
+        old_suffix_start = len(old) - suffix
+
+        # Words ending before the edit are untouched: whitespace follows them.
+        # An unclosed quote is not, a quote typed later swallows what follows it
+        first = 0
+        while first < len(tokens) and tokens[first].end < prefix and not _is_open_quote(old, tokens[first]):
+            first += 1
+        start = min(tokens[first].start, prefix) if first < len(tokens) else prefix
+
+        # Old words starting in the unchanged suffix, keyed by their new start
+        resync = {
+            token.start + delta: index
+            for index, token in enumerate(tokens[first:], first)
+            if token.start >= old_suffix_start
+        }
+        scanned = []
+        rest: List[Token] = []
+        for match in TOKEN.finditer(text, start):
+            index = resync.get(match.start())
+            if index is not None:
+                # From here on the text and so the words are the old ones
+                rest = [Token(token.start + delta, token.end + delta, token.value) for token in tokens[index:]]
+                break
+            scanned.append(Token(match.start(), match.end(), _unquote(match.group())))
+        self.tokens = tokens[:first] + scanned + rest
+        self.retokenized = len(scanned)
@@ -0,0 +1,173 @@
+import json
+import math
+import os
+import re
+import sys
+from typing import Any, Optional, Union
+
+try:
+    import orjson
+except ImportError:  # optional speedup
+    orjson = None
+
+# Raised by both backends for invalid documents
+JSONDecodeError = json.JSONDecodeError
+
+# Environment variable forcing a backend: orjson or stdlib
+ENV_VAR = 'CURLPYCONVERT_JSON'
+
+# JSON strings and the literals that are spelled differently in Python
+JSON_TOKENS = re.compile(r'"(?:\\.|[^"\\])*"|\b(null|true|false)\b')
+PYTHON_LITERALS = {'null': 'None', 'true': 'True', 'false': 'False'}
+
+# Everything `json.dumps(ensure_ascii=True)` escapes that orjson writes raw
+NON_ASCII = re.compile('[^\x00-\x7e]')
+
+# Types both backends encode the same way; anything else goes through the stdlib
+PLAIN_TYPES = (str, int, type(None))
+
+# Since 3.13 the stdlib C encoder handles `indent` too; before that indented
+# output goes through the pure-Python encoder, which orjson easily beats
+STDLIB_C_INDENT = sys.version_info >= (3, 13)
+
+
+def _as_text(data: Union[str, bytes, bytearray, memoryview]) -> str:
+    if isinstance(data, str):
+        return data
+    return str(data, 'utf-8', 'surrogateescape')
+
+
+def _escape(match: re.Match) -> str:
+    code = ord(match.group())
+    if code < 0x10000:
+        return f'\\u{code:04x}'
+    code -= 0x10000
+    return f'\\u{0xd800 | (code >> 10):04x}\\u{0xdc00 | (code & 0x3ff):04x}'
+
+
+def _orjson_compatible(obj: Any) -> bool:
+    """Whether orjson would encode `obj` exactly like the stdlib.
+
+    orjson spells floats in exponent form differently (`1e16` vs `1e+16`),
+    writes NaN/Infinity as null and natively encodes types the stdlib
+    rejects, so any of those sends the whole value to the stdlib.
+    """
+    stack = [obj]
+    pop, extend = stack.pop, stack.extend
+    while stack:
+        node = pop()
+        kind = type(node)
+        if kind is str or kind is int or kind is bool or node is None:
+            continue
+        if kind is dict:
+            extend(node.values())
+        elif kind is list or kind is tuple:
+            extend(node)
+        elif kind is float:
+            if not math.isfinite(node) or 'e' in repr(node):
+                return False
+        elif isinstance(node, dict):
+            extend(node.values())
+        elif isinstance(node, (list, tuple)):
+            extend(node)
+        elif isinstance(node, float) or not isinstance(node, PLAIN_TYPES):
+            return False
+    return True
+
+
+def _reindent(encoded: bytes, indent: int) -> bytes:
+    """Turn orjson's 2-space indentation into `indent` spaces.
+
+    JSON text never holds raw newlines or tabs inside strings, so spaces
+    after a newline are indentation. Levels become tabs deepest first,
+    which keeps shallower replacements from matching deeper lines.
+    """
+    depth = 0
+    while b'\n' + b'  ' * (depth + 1) in encoded:
+        depth += 1
+    for level in range(depth, 0, -1):
+        encoded = encoded.replace(b'\n' + b'  ' * level, b'\n' + b'\t' * level)
+    return encoded.replace(b'\t', b' ' * indent)
+
+
+class StdlibJSON:
+    """The standard library `json` module."""
+
+    name = 'stdlib'
+
+    def loads(self, data: Union[str, bytes, bytearray, memoryview]) -> Any:
+        return json.loads(_as_text(data))
+
+    def dumps(self, obj: Any, indent: Optional[int] = None) -> str:
+        return json.dumps(obj, indent=indent)
+
+
+class OrjsonJSON(StdlibJSON):
+    """orjson, producing byte-identical output to `StdlibJSON`.
+
+    Values orjson cannot handle the same way (huge ints, NaN, non-string
+    keys, exponent floats, invalid documents) fall back to the stdlib.
+    `dumps` only uses orjson for indented output on Pythons whose stdlib
+    encodes it in pure Python; the C encoder is as fast otherwise.
+    """
+
+    name = 'orjson'
+    native_dumps = not STDLIB_C_INDENT
+
+    def loads(self, data: Union[str, bytes, bytearray, memoryview]) -> Any:
+        try:
+            return orjson.loads(data)
+        except orjson.JSONDecodeError:
+            return super().loads(data)
+
+    def dumps(self, obj: Any, indent: Optional[int] = None) -> str:
+        if indent is None or not self.native_dumps or not _orjson_compatible(obj):
+            return super().dumps(obj, indent=indent)
+        try:
+            encoded = orjson.dumps(obj, option=orjson.OPT_INDENT_2)
+        except orjson.JSONEncodeError:
+            return super().dumps(obj, indent=indent)
+        if indent != 2:
+            encoded = _reindent(encoded, indent)
+        text = encoded.decode()
+        if not text.isascii() or '\x7f' in text:
+            text = NON_ASCII.sub(_escape, text)
+        return text
+
+
+def get_backend(name: Optional[str] = None):
+    """Create the JSON backend for a name, defaulting to orjson when installed."""
+    name = name or os.environ.get(ENV_VAR) or ('orjson' if orjson else 'stdlib')
+    if name == 'stdlib':
+        return StdlibJSON()
+    if name == 'orjson':
+        if orjson is None:
+            raise ValueError("The orjson JSON backend needs `pip install orjson`")
+        return OrjsonJSON()
+    raise ValueError(f"Unknown JSON backend: {name}")
+
+
+_backend = None
+
+
+def set_backend(name: Optional[str] = None):
+    """Switch the backend used by `loads` and `dumps`."""
+    global _backend
+    _backend = get_backend(name)
+    return _backend
+
+
+def loads(data: Union[str, bytes, bytearray, memoryview]) -> Any:
+    return (_backend or set_backend()).loads(data)
+
+
+def dumps(obj: Any, indent: Optional[int] = None) -> str:
+    return (_backend or set_backend()).dumps(obj, indent=indent)
+
+
+def dumps_python(obj: Any, indent: Optional[int] = None) -> str:
+    """Like `dumps`, but with None/True/False so the text is a Python literal."""
+    text = dumps(obj, indent=indent)
+    if 'null' not in text and 'true' not in text and 'false' not in text:
+        return text
+    return JSON_TOKENS.sub(lambda match: PYTHON_LITERALS.get(match.group(1), match.group()), text)
@@ -0,0 +1,156 @@
+import asyncio
+from typing import Callable, Dict, Any, List, Optional
+
+from catppuccin.extras.pygments import MochaStyle
+from prompt_toolkit.application import Application, get_app
+from prompt_toolkit.formatted_text import PygmentsTokens, to_formatted_text
+from prompt_toolkit.key_binding import KeyBindings
+from prompt_toolkit.layout import HSplit, Layout, VSplit, Window
+from prompt_toolkit.layout.controls import FormattedTextControl
+from prompt_toolkit.layout.margins import ScrollbarMargin
+from prompt_toolkit.lexers import PygmentsLexer
+from prompt_toolkit.styles import Style, merge_styles, style_from_pygments_cls
+from prompt_toolkit.widgets import TextArea
+from pygments.lexers.python import PythonLexer
+from pygments.lexers.shell import BashLexer
+
+from .incremental import IncrementalConverter
+
+# Seconds of typing pause before the command is converted again
+DEBOUNCE_SECONDS = 0.15
+
+UI_STYLE = Style.from_dict({
+    'title': 'bg:#313244 #cdd6f4 bold',
+    'status': 'bg:#181825 #a6adc8',
+    'status.error': 'bg:#181825 #f38ba8',
+    'separator': '#89dceb',  # Catppuccin Sky
+})
+
+
+class Debouncer:
+    """Run `callback` once calls have paused for `delay` seconds."""
+
+    def __init__(self, delay: float, callback: Callable[[], None]):
+        self.delay = delay
+        self.callback = callback
+        self._handle: Optional[asyncio.TimerHandle] = None
+
+    def __call__(self) -> None:
+        self.cancel()
+        self._handle = asyncio.get_running_loop().call_later(self.delay, self._fire)
+
+    def cancel(self) -> None:
+        if self._handle is not None:
+            self._handle.cancel()
+            self._handle = None
+
+    def _fire(self) -> None:
+        self._handle = None
+        self.callback()
+
+
+class SectionHighlighter:
+    """Syntax-highlights code per section, lexing only sections it has not seen."""
+
+    def __init__(self):
+        self.lexer = PythonLexer(stripnl=False, ensurenl=False)
+        self._cache: Dict[str, List] = {}
+        # Sections lexed by the last call, for the status line
+        self.lexed = 0
+
+    def fragments(self, sections: List[str]) -> List:
+        cache, self._cache = self._cache, {}
+        self.lexed = 0
+        fragments: List = []
+        for index, section in enumerate(sections):
+            if section not in cache:
+                cache[section] = to_formatted_text(PygmentsTokens(list(self.lexer.get_tokens(section))))
+                self.lexed += 1
+            self._cache[section] = cache[section]
+            if index:
+                fragments.append(('', '\n\n'))
+            fragments.extend(cache[section])
+        return fragments
+
+
+def create_application(
+    text: str,
+    generators: Dict[str, Callable[[Dict[str, Any]], str]],
+    framework: str,
+    delay: float = DEBOUNCE_SECONDS,
+    **app_options
+) -> Application:
+    """Editable curl command on the left, live generated code on the right.
+
+    `generators` maps framework names to functions generating code from a
+    parsed command; F2 cycles through them. The application returns the
+    generated code on Ctrl-S and None on Ctrl-Q/Ctrl-C.
+    """
+    names = list(generators)
+    state = {'framework': framework}
+    converter = IncrementalConverter(generators[framework])
+    highlighter = SectionHighlighter()
+    converter.update(text)
+    code_fragments = highlighter.fragments(converter.sections)
+
+    editor = TextArea(text=text, lexer=PygmentsLexer(BashLexer), scrollbar=True, wrap_lines=True, focus_on_click=True)
+    editor.buffer.cursor_position = len(text)
+
+    def refresh() -> None:
+        nonlocal code_fragments
+        converter.update(editor.text)
+        if converter.changed:
+            code_fragments = highlighter.fragments(converter.sections)
+        get_app().invalidate()
+
+    debouncer = Debouncer(delay, refresh)
+    editor.buffer.on_text_changed += lambda _: debouncer()
+
+    def status():
+        fragments = [(
+            'class:status',
+            f" {state['framework']} │ {len(converter.tokens)} args, {converter.retokenized} re-tokenized, "
+            f"{highlighter.lexed} section(s) redrawn │ F2 framework · Ctrl-S copy & exit · Ctrl-Q quit "
+        )]
+        if converter.error:
+            fragments.append(('class:status.error', f'│ {converter.error} '))
+        return fragments
+
+    bindings = KeyBindings()
+
+    @bindings.add('f2')
+    def _next_framework(event):
+        nonlocal code_fragments
+        state['framework'] = names[(names.index(state['framework']) + 1) % len(names)]
+        converter.set_generate(generators[state['framework']])
+        code_fragments = highlighter.fragments(converter.sections)
+
+    @bindings.add('c-s')
+    def _accept(event):
+        # Convert whatever a pending debounce has not picked up yet
+        debouncer.cancel()
+        converter.update(editor.text)
+        event.app.exit(result=converter.code)
+
+    @bindings.add('c-q')
+    @bindings.add('c-c')
+    def _quit(event):
+        debouncer.cancel()
+        event.app.exit(result=None)
+
+    body = VSplit([
+        HSplit([Window(FormattedTextControl([('class:title', ' cURL command')]), height=1), editor]),
+        Window(width=1, char='│', style='class:separator'),
+        HSplit([
+            Window(FormattedTextControl(lambda: [('class:title', f" {state['framework']} code")]), height=1),
+            Window(FormattedTextControl(lambda: code_fragments), right_margins=[ScrollbarMargin()]),
+        ]),
+    ])
+    return Application(
+        layout=Layout(HSplit([body, Window(FormattedTextControl(status), height=1)]), focused_element=editor),
+        key_bindings=bindings,
+        style=merge_styles([style_from_pygments_cls(MochaStyle), UI_STYLE]),
+        full_screen=True,
+        mouse_support=True,
+        **app_options
+    )
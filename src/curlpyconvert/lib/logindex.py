@@ -0,0 +1,228 @@
+import json
+import mmap
+import os
+import re
+import sys
+from array import array
+from pathlib import Path
+from typing import Iterator, List, Optional, Tuple, Union
+
+# A command starts at a line beginning with `curl`, unless the line continues
+# the previous one (`\` line end) or a quoted string
+COMMAND_START = re.compile(rb'^[ \t]*curl[ \t]', re.MULTILINE)
+QUOTE_OR_ESCAPE = re.compile(rb'[\\\'"]')
+QUOTED_END = {
+    b"'": re.compile(rb"[^']*'"),
+    b'"': re.compile(rb'(?:[^"\\]|\\.)*"', re.DOTALL),
+}
+# After a closing quote: the quote is concatenated with more text
+WORD_AFTER_QUOTE = re.compile(rb'[^\s;&|)]')
+# The host group skips userinfo and stops at the port, path, query or fragment
+URL_PATTERN = re.compile(rb'https?://(?:[^\s\'"/@]*@)?([^\s\'"/?#:]*)[^\s\'"]*')
+
+INDEX_SUFFIX = '.idx'
+INDEX_MAGIC = b'CPYIDX2\n'
+
+
+def index_path_for(path: Union[str, Path]) -> Path:
+    """Index file stored next to a log file."""
+    path = Path(path)
+    return path.with_name(path.name + INDEX_SUFFIX)
+
+
+def _quote_spanning(view, pos: int, limit: int) -> Tuple[int, Optional[int]]:
+    """Skip quoted strings from `pos` to `limit`.
+
+    Returns where the scan stopped and, when a quoted string is still open
+    at `limit`, the offset after its closing quote. An unterminated quote
+    counts as a stray character, so one broken command cannot swallow the
+    rest of the log.
+    """
+    while match := QUOTE_OR_ESCAPE.search(view, pos, limit):
+        if match.group() == b'\\':
+            pos = match.end() + 1
+            continue
+        end = QUOTED_END[match.group()].match(view, match.end())
+        if end is None:
+            pos = match.end()
+        elif end.end() > limit:
+            return match.start(), end.end()
+        else:
+            pos = end.end()
+    return limit, None
+
+
+def command_starts(view) -> array:
+    """Offsets of the commands in a log: lines starting with `curl`.
+
+    A `curl` line is part of the previous command when that line ends
+    with a backslash or when it sits inside a multi-line quoted string
+    (a body). A quote that closes on the `curl` line and runs straight
+    into more text is taken as that line's own opening quote instead: the
+    earlier quote was unbalanced, and the scan resyncs at the new command.
+    """
+    starts = array('Q')
+    pos = 0  # outside quotes, from the current command on
+    for match in COMMAND_START.finditer(view):
+        start = match.start()
+        if start < pos:
+            continue
+        if view[max(0, start - 3):start].rstrip(b'\r\n').endswith(b'\\'):
+            continue
+        pos, closing = _quote_spanning(view, pos, start)
+        if closing is not None:
+            line_end = view.find(b'\n', start)
+            on_this_line = line_end < 0 or closing <= line_end
+            if not (on_this_line and WORD_AFTER_QUOTE.match(view, closing)):
+                pos = closing
+                continue
+        starts.append(start)
+        pos = start
+    return starts
+
+
+class LogIndex:
+    """Offset index of the curl commands in a log file.
+
+    Command boundaries and host ids are kept in flat `array`s, and the
+    URLs in one blob the arrays point into, so `grep_url` never touches
+    the log. Commands are sliced out of the log through `mmap` on
+    demand; nothing is read linearly after the index is built.
+    """
+
+    def __init__(self, path: Union[str, Path], size: int, mtime_ns: int):
+        self.path = Path(path)
+        self.size = size
+        self.mtime_ns = mtime_ns
+        self.offsets = array('Q')      # command start offsets
+        self.url_offsets = array('Q')  # URL start offsets into `url_blob` (length 0 when absent)
+        self.url_lengths = array('I')
+        self.url_blob = b''
+        self.host_ids = array('I')     # positions into `hosts`
+        self.hosts: List[str] = []
+        self._file = None
+        self._map: Optional[mmap.mmap] = None
+
+    @classmethod
+    def build(cls, path: Union[str, Path]) -> 'LogIndex':
+        """Scan a log file through mmap and index its commands."""
+        stat = os.stat(path)
+        index = cls(path, stat.st_size, stat.st_mtime_ns)
+        if not stat.st_size:
+            return index
+
+        host_table = {}
+        urls = bytearray()
+        with open(path, 'rb') as file, mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ) as view:
+            starts = command_starts(view)
+            starts.append(stat.st_size)
+            for start, end in zip(starts, starts[1:]):
+                url = URL_PATTERN.search(view, start, end)
+                host = url.group(1).lower() if url else b''
+                if host not in host_table:
+                    host_table[host] = len(index.hosts)
+                    index.hosts.append(host.decode('latin-1'))
+                index.offsets.append(start)
+                index.url_offsets.append(len(urls))
+                index.url_lengths.append(url.end() - url.start() if url else 0)
+                index.host_ids.append(host_table[host])
+                if url:
+                    urls += url.group()
+        index.url_blob = bytes(urls)
+        return index
+
+    def save(self, index_path: Optional[Union[str, Path]] = None) -> Path:
+        """Persist the index: a JSON header line, the raw arrays and the URL blob."""
+        index_path = Path(index_path) if index_path else index_path_for(self.path)
+        header = {
+            'count': len(self.offsets),
+            'size': self.size,
+            'mtime_ns': self.mtime_ns,
+            'byteorder': sys.byteorder,
+            'hosts': self.hosts,
+            'url_bytes': len(self.url_blob),
+        }
+        with open(index_path, 'wb') as file:
+            file.write(INDEX_MAGIC)
+            file.write(json.dumps(header).encode() + b'\n')
+            for values in (self.offsets, self.url_offsets, self.url_lengths, self.host_ids):
+                values.tofile(file)
+            file.write(self.url_blob)
+        return index_path
+
+    @classmethod
+    def load(cls, path: Union[str, Path], index_path: Optional[Union[str, Path]] = None) -> 'LogIndex':
+        """Load a persisted index, refusing one that no longer matches the log.
+
+        A truncated index raises EOFError.
+        """
+        index_path = Path(index_path) if index_path else index_path_for(path)
+        with open(index_path, 'rb') as file:
+            if file.readline() != INDEX_MAGIC:
+                raise ValueError(f"{index_path} is not a curl log index")
+            header = json.loads(file.readline())
+            stat = os.stat(path)
+            if (header['size'], header['mtime_ns']) != (stat.st_size, stat.st_mtime_ns):
+                raise ValueError(f"{index_path} is out of date, run `curlpyconvert index {path}` again")
+            index = cls(path, header['size'], header['mtime_ns'])
+            index.hosts = header['hosts']
+            for values in (index.offsets, index.url_offsets, index.url_lengths, index.host_ids):
+                values.fromfile(file, header['count'])
+                if header['byteorder'] != sys.byteorder:
+                    values.byteswap()
+            index.url_blob = file.read(header['url_bytes'])
+            if len(index.url_blob) != header['url_bytes']:
+                raise EOFError(f"{index_path} is truncated")
+        return index
+
+    @classmethod
+    def open(cls, path: Union[str, Path]) -> 'LogIndex':
+        """Load the index next to a log file, building and saving it when missing, stale or damaged."""
+        try:
+            return cls.load(path)
+        except (FileNotFoundError, ValueError, EOFError):
+            index = cls.build(path)
+            index.save()
+            return index
+
+    def __len__(self) -> int:
+        return len(self.offsets)
+
+    def _view(self) -> mmap.mmap:
+        if self._map is None:
+            self._file = open(self.path, 'rb')
+            self._map = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+        return self._map
+
+    def close(self) -> None:
+        if self._map is not None:
+            self._map.close()
+            self._file.close()
+            self._map = self._file = None
+
+    def __enter__(self) -> 'LogIndex':
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    def command(self, position: int) -> str:
+        """Text of the command at a 0-based position."""
+        if not 0 <= position < len(self.offsets):
+            raise IndexError(f"Command {position} is out of range, the log has {len(self.offsets)}")
+        end = self.offsets[position + 1] if position + 1 < len(self.offsets) else self.size
+        return self._view()[self.offsets[position]:end].decode('utf-8', 'replace').strip()
+
+    def url(self, position: int) -> str:
+        start = self.url_offsets[position]
+        return self.url_blob[start:start + self.url_lengths[position]].decode('utf-8', 'replace')
+
+    def host(self, position: int) -> str:
+        return self.hosts[self.host_ids[position]]
+
+    def grep_url(self, pattern: str) -> Iterator[int]:
+        """Positions of commands whose URL matches a regular expression, read from the index alone."""
+        regex = re.compile(pattern)
+        for position in range(len(self.offsets)):
+            if regex.search(self.url(position)):
+                yield position
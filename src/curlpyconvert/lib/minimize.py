@@ -0,0 +1,165 @@
+import copy
+import json
+from fnmatch import fnmatchcase
+from pathlib import Path
+from typing import Dict, Any, List, Optional, Tuple, Union
+from urllib.parse import urlsplit
+
+from .headers import HeaderMap
+
+# Browser-only headers and analytics/tracking cookies servers don't need
+DEFAULT_RULES = {
+    'drop_headers': [
+        'sec-ch-*',
+        'sec-fetch-*',
+        'sec-gpc',
+        'priority',
+        'referer',
+        'dnt',
+        'upgrade-insecure-requests',
+        'pragma',
+        'cache-control',
+    ],
+    'drop_cookies': [
+        '_ga',
+        '_ga_*',
+        '_gid',
+        '_gat*',
+        '_gcl_*',
+        '__utm*',
+        '_fbp',
+        '_fbc',
+        '_cs_*',
+        '_uet*',
+        '_clck',
+        '_clsk',
+        '_scid*',
+        '_ScCbts',
+        '_ttp',
+        '_tt_*',
+        '_pin_unauth',
+        '__spdt',
+        'FPID',
+        'FPAU',
+        'FPLC',
+        'FPGSID',
+        'QuantumMetric*',
+        'OptanonConsent',
+        'OptanonAlertBoxClosed',
+    ],
+    'keep_headers': [],
+    'keep_cookies': [],
+}
+
+# Header values each framework sends on its own
+FRAMEWORK_DEFAULTS = {
+    'grab': {
+        'accept': '*/*',
+    },
+    'context': {
+        'accept': '*/*',
+        'accept-encoding': 'gzip, deflate',
+        'connection': 'keep-alive',
+    },
+    'dogman': {
+        'accept': '*/*',
+        'accept-encoding': 'gzip, deflate',
+        'connection': 'keep-alive',
+    },
+}
+
+RULE_KEYS = ('drop_headers', 'drop_cookies', 'keep_headers', 'keep_cookies')
+
+
+def load_rules(path: Optional[Union[str, Path]] = None) -> Dict[str, Any]:
+    """Load minimization rules, merging a JSON rules file over the defaults.
+
+    The file may hold a `default` section extending the built-in rules and
+    a `hosts` section mapping host patterns (fnmatch) to extra rules.
+    """
+    rules = {'default': {key: list(DEFAULT_RULES[key]) for key in RULE_KEYS}, 'hosts': {}}
+    if path is None:
+        return rules
+
+    config = json.loads(Path(path).read_text())
+    for key in RULE_KEYS:
+        rules['default'][key].extend(config.get('default', {}).get(key, []))
+    rules['hosts'] = config.get('hosts', {})
+    return rules
+
+
+def rules_for_host(rules: Dict[str, Any], host: str) -> Dict[str, List[str]]:
+    """Default rules extended by every host section matching the host."""
+    merged = {key: list(rules['default'][key]) for key in RULE_KEYS}
+    for pattern, host_rules in rules['hosts'].items():
+        if fnmatchcase(host, pattern.lower()):
+            for key in RULE_KEYS:
+                merged[key].extend(host_rules.get(key, []))
+    return merged
+
+
+def _matches(name: str, patterns: List[str]) -> bool:
+    return any(fnmatchcase(name, pattern) for pattern in patterns)
+
+
+def minimize(
+    parsed: Dict[str, Any],
+    framework: str,
+    rules: Optional[Dict[str, Any]] = None
+) -> Tuple[Dict[str, Any], Dict[str, Any]]:
+    """Drop headers and cookies the request does not need.
+
+    Returns the minimized parse result (the input is left untouched) and a
+    report with what was dropped and how many bytes that saves per request.
+    """
+    rules = rules or load_rules()
+    host = (urlsplit(parsed['url']).hostname or '').lower()
+    host_rules = rules_for_host(rules, host)
+    drop_headers = [pattern.lower() for pattern in host_rules['drop_headers']]
+    keep_headers = [pattern.lower() for pattern in host_rules['keep_headers']]
+    defaults = FRAMEWORK_DEFAULTS.get(framework, {})
+
+    headers = HeaderMap()
+    dropped_headers = []
+    bytes_before = 0
+    bytes_saved = 0
+    for name, value in HeaderMap(parsed.get('headers')).items():
+        lower = name.lower()
+        size = len(f'{name}: {value}\r\n')
+        bytes_before += size
+        is_default = lower in defaults and defaults[lower].lower() == value.lower()
+        if not _matches(lower, keep_headers) and (_matches(lower, drop_headers) or is_default):
+            dropped_headers.append(name)
+            bytes_saved += size
+        else:
+            headers.add(name, value)
+
+    cookies = type(parsed.get('cookies') or {})()
+    dropped_cookies = []
+    for name, value in (parsed.get('cookies') or {}).items():
+        size = len(f'{name}={value}; ')
+        bytes_before += size
+        if not _matches(name, host_rules['keep_cookies']) and _matches(name, host_rules['drop_cookies']):
+            dropped_cookies.append(name)
+            bytes_saved += size
+        else:
+            cookies[name] = value
+
+    minimized = copy.copy(parsed)
+    minimized['headers'] = headers
+    minimized['cookies'] = cookies
+    report = {
+        'headers': dropped_headers,
+        'cookies': dropped_cookies,
+        'bytes_before': bytes_before,
+        'bytes_saved': bytes_saved,
+    }
+    return minimized, report
+
+
+def format_report(report: Dict[str, Any]) -> str:
+    """One-line summary of a minimization report."""
+    return (
+        f"dropped {len(report['headers'])} header(s) and {len(report['cookies'])} cookie(s), "
+        f"saving {report['bytes_saved']} of {report['bytes_before']} header bytes per request"
+    )
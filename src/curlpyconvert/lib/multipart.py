@@ -0,0 +1,109 @@
+import mimetypes
+from pathlib import PurePath
+from typing import Dict, Any, List
+
+from . import jsonbackend
+
+# Request arguments sending the encoder; the boundary header goes with this
+# request only, the session headers are left alone
+REQUESTS_FORM_ARGUMENTS = 'data=form, headers={"Content-Type": form.content_type}'
+
+
+def parse_form_field(spec: str, literal: bool = False) -> Dict[str, Any]:
+    """Parse a curl -F/--form field into a multipart part.
+
+    Supports `name=value`, `name=@path[;type=mime][;filename=name]` for file
+    uploads and `name=<path` for text fields read from a file. With
+    `literal` (--form-string) the value is never interpreted.
+    """
+    if '=' not in spec:
+        raise ValueError(f"Invalid form field: {spec}")
+    name, value = spec.split('=', 1)
+    part = {
+        'name': name,
+        'value': None,
+        'path': None,
+        'filename': None,
+        'content_type': None,
+        'from_file': False,
+    }
+
+    if literal or not value.startswith(('@', '<')):
+        part['value'] = value
+        return part
+
+    path, *options = value[1:].split(';')
+    part['path'] = path.strip('"')
+    for option in options:
+        key, _, option_value = option.partition('=')
+        key = key.strip().lower()
+        if key == 'type':
+            part['content_type'] = option_value.strip()
+        elif key == 'filename':
+            part['filename'] = option_value.strip().strip('"')
+
+    if value.startswith('<'):
+        part['from_file'] = True
+        return part
+
+    if not part['filename']:
+        part['filename'] = PurePath(part['path']).name
+    if not part['content_type']:
+        guessed, _ = mimetypes.guess_type(part['filename'])
+        part['content_type'] = guessed or 'application/octet-stream'
+    return part
+
+
+def is_file_part(part: Dict[str, Any]) -> bool:
+    """Whether a part is a file upload that should be streamed from disk."""
+    return part['path'] is not None and not part['from_file']
+
+
+def requests_multipart_imports(parts: List[Dict[str, Any]]) -> str:
+    """Imports needed by `requests_multipart_code`, for the top of the snippet."""
+    imports = ['from requests_toolbelt import MultipartEncoder']
+    if any(part['from_file'] for part in parts):
+        imports.append('from pathlib import Path')
+    return '\n'.join(imports)
+
+
+def requests_multipart_rewind(parts: List[Dict[str, Any]]) -> str:
+    """Rewind the open files and encode `fields` again, to send the form a second time."""
+    handles = [f'file_{index}' for index in range(sum(map(is_file_part, parts)))]
+    return '\n'.join([*(f'{handle}.seek(0)' for handle in handles), 'form = MultipartEncoder(fields=fields)'])
+
+
+def requests_multipart_code(parts: List[Dict[str, Any]], request_line: str, check: str = '') -> str:
+    """Generate requests-style code streaming a multipart body.
+
+    File parts are passed as open file objects to a `MultipartEncoder`, which
+    reads them in chunks while sending, so uploads run with constant memory.
+    `request_line` must send `form` with `REQUESTS_FORM_ARGUMENTS`; `check`
+    runs after it while the files are still open.
+    """
+    opens = []
+    fields = []
+    for part in parts:
+        name = jsonbackend.dumps(part['name'])
+        if is_file_part(part):
+            handle = f"file_{len(opens)}"
+            opens.append(f'open({jsonbackend.dumps(part["path"])}, "rb") as {handle}')
+            fields.append(
+                f'({name}, ({jsonbackend.dumps(part["filename"])}, {handle}, {jsonbackend.dumps(part["content_type"])}))'
+            )
+        elif part['from_file']:
+            fields.append(f'({name}, Path({jsonbackend.dumps(part["path"])}).read_text())')
+        else:
+            fields.append(f'({name}, {jsonbackend.dumps(part["value"])})')
+
+    body = ['fields = [']
+    body.extend(f'    {field},' for field in fields)
+    body.append(']')
+    body.append('form = MultipartEncoder(fields=fields)')
+    body.append(request_line)
+    if check:
+        body.extend(check.split('\n'))
+
+    if opens:
+        return f"with {', '.join(opens)}:\n" + '\n'.join(f'    {line}' for line in body)
+    return '\n'.join(body)
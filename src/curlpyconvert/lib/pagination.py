@@ -0,0 +1,258 @@
+import re
+from typing import Dict, Any, List, Optional, Sequence
+
+from . import jsonbackend
+from .sidecar import Sidecars
+
+# Request fields that select a page, grouped by how the next page is reached
+CURSOR_FIELDS = frozenset({
+    'cursor', 'pagetoken', 'page_token', 'after', 'next_token', 'nexttoken',
+    'continuation', 'continuationtoken', 'starting_after'
+})
+PAGE_FIELDS = frozenset({
+    'page', 'pagenumber', 'page_number', 'pageno', 'pagenum', 'pageindex', 'page_index'
+})
+OFFSET_FIELDS = frozenset({'offset', 'skip', 'start'})
+SIZE_FIELDS = frozenset({
+    'limit', 'size', 'pagesize', 'page_size', 'per_page', 'perpage', 'first', 'rows',
+    'take', 'count', 'max_results', 'maxresults'
+})
+
+# Fields selecting the page; the page size stays constant between requests
+PAGINATION_FIELDS = CURSOR_FIELDS | PAGE_FIELDS | OFFSET_FIELDS | {'before'}
+
+DATE_PATTERN = re.compile(r'^\d{4}-\d{2}-\d{2}')
+
+# How deep into nested JSON objects paging fields are looked for
+MAX_DETECT_DEPTH = 3
+
+# Response keys the generated code checks for the items and the next cursor
+ITEM_KEYS = ('items', 'data', 'results', 'records', 'edges', 'nodes', 'hits')
+NEXT_CURSOR_KEYS = (
+    'next_cursor', 'nextCursor', 'next_page_token', 'nextPageToken', 'endCursor',
+    'cursor', 'next'
+)
+
+
+def _is_number(value: Any) -> bool:
+    if isinstance(value, bool):
+        return False
+    return isinstance(value, int) or (isinstance(value, str) and value.isdigit())
+
+
+def _style(name: str, value: Any) -> Optional[str]:
+    lower = name.lower()
+    if lower in CURSOR_FIELDS and (value is None or isinstance(value, str)):
+        return None if isinstance(value, str) and DATE_PATTERN.match(value) else 'cursor'
+    if lower in PAGE_FIELDS and _is_number(value):
+        return 'page'
+    if lower in OFFSET_FIELDS and _is_number(value):
+        return 'offset'
+    return None
+
+
+def detect_pagination(data: Any) -> Optional[Dict[str, Any]]:
+    """Find the paging field of captured params or a JSON body.
+
+    Returns the paging `style` (cursor, page or offset), the field `path`
+    (keys into nested objects) and its captured `value`, plus the page
+    size field when there is one. Cursors win over page numbers over
+    offsets; shallower fields win over nested ones.
+    """
+    candidates = []
+    size = None
+    level = [([], data)]
+    for depth in range(MAX_DETECT_DEPTH):
+        nested = []
+        for prefix, node in level:
+            if not isinstance(node, dict):
+                continue
+            for key, value in node.items():
+                path = prefix + [key]
+                style = _style(str(key), value)
+                if style:
+                    candidates.append((('cursor', 'page', 'offset').index(style), depth, style, path, value))
+                elif str(key).lower() in SIZE_FIELDS and _is_number(value) and size is None:
+                    size = (path, value)
+                elif isinstance(value, dict):
+                    nested.append((path, value))
+        level = nested
+    if not candidates:
+        return None
+
+    _, _, style, path, value = min(candidates, key=lambda candidate: candidate[:2])
+    return {
+        'style': style,
+        'path': path,
+        'value': value,
+        'size_path': size[0] if size else None,
+        'size': size[1] if size else None,
+    }
+
+
+def _subscript(var: str, path: List[str]) -> str:
+    return var + ''.join(f'[{jsonbackend.dumps(key)}]' for key in path)
+
+
+def _advance_code(pagination: Dict[str, Any], var: str) -> List[str]:
+    """Lines moving the request on to the next page, after `items` were yielded."""
+    field = _subscript(var, pagination['path'])
+    style = pagination['style']
+    if style == 'cursor':
+        return [
+            'cursor = next_cursor(payload)',
+            f'if not cursor or cursor == {field}:',
+            '    return',
+            f'{field} = cursor',
+        ]
+
+    step = '1' if style == 'page' else 'len(items)'
+    lines = []
+    if pagination['size'] is not None:
+        size = _subscript(var, pagination['size_path'])
+        if isinstance(pagination['size'], str):
+            size = f'int({size})'
+        # A short page is the last one
+        lines += [f'if len(items) < {size}:', '    return']
+    if isinstance(pagination['value'], str):
+        lines.append(f'{field} = str(int({field}) + {step})')
+    else:
+        lines.append(f'{field} += {step}')
+    return lines
+
+
+def pagination_code(
+    pagination: Dict[str, Any],
+    data: Dict[str, Any],
+    var: str,
+    fetch: str,
+    prefetch: int = 0,
+    imports: Sequence[str] = (),
+    sidecars: Optional[Sidecars] = None
+) -> str:
+    """Generate a lazy page generator for a paginated request.
+
+    `var` names the request params/body dict and `fetch` is the expression
+    sending it and returning the decoded JSON response. Pages are requested
+    only when the consumer reaches them; with `prefetch` a background
+    thread keeps at most that many pages ready. A body moved to a
+    `sidecars` file is copied per listing, since the pages mutate it.
+    """
+    indent = '        '
+    imports = list(imports)
+    literal = jsonbackend.dumps_python(data, indent=4)
+    body = (sidecars or Sidecars()).payload(var, data, literal)
+    if body != literal:
+        imports.append('import copy')
+        body = f'copy.deepcopy({body})'
+    body = body.replace('\n', '\n    ')
+    if prefetch:
+        imports += ['import threading', 'from queue import Full, Queue']
+    lines = [*imports, ''] if imports else []
+    lines += [
+        'def page_items(payload):',
+        '    """Items of one page: the payload itself or its item list (adjust to the API)."""',
+        '    if isinstance(payload, list):',
+        '        return payload',
+        f'    for key in {ITEM_KEYS!r}:',
+        '        if isinstance(payload.get(key), list):',
+        '            return payload[key]',
+        '    return next((value for value in payload.values() if isinstance(value, list)), [])',
+        '',
+    ]
+    if pagination['style'] == 'cursor':
+        lines += [
+            'def next_cursor(payload):',
+            '    """Cursor of the next page, None on the last page (adjust to the API)."""',
+            '    if not isinstance(payload, dict):',
+            '        return None',
+            '    for node in [payload, *(value for value in payload.values() if isinstance(value, dict))]:',
+            f'        for key in {NEXT_CURSOR_KEYS!r}:',
+            '            if node.get(key):',
+            '                return node[key]',
+            '    return None',
+            '',
+        ]
+    lines += [
+        'def fetch_pages():',
+        '    """Yield one page of items per request, fetched when the consumer asks for it."""',
+        f'    {var} = {body}',
+        '    while True:',
+        f'        payload = {fetch}',
+        '        items = page_items(payload)',
+        '        if not items:',
+        '            return',
+        '        yield items',
+        *(indent + line for line in _advance_code(pagination, var)),
+        '',
+    ]
+    if prefetch:
+        lines += [
+            'def prefetched(pages, depth):',
+            '    """Run a page generator in a background thread, at most `depth` pages ahead."""',
+            '    queue = Queue(maxsize=depth)',
+            '    stop = threading.Event()',
+            '',
+            '    def offer(item):',
+            '        """Queue an item; False once the consumer has stopped iterating."""',
+            '        while not stop.is_set():',
+            '            try:',
+            '                queue.put(item, timeout=0.1)',
+            '                return True',
+            '            except Full:',
+            '                pass',
+            '        return False',
+            '',
+            '    def worker():',
+            '        try:',
+            '            for page in pages:',
+            '                if not offer(page):',
+            '                    return',
+            '            offer(None)',
+            '        except Exception as error:',
+            '            offer(error)',
+            '',
+            '    threading.Thread(target=worker, daemon=True).start()',
+            '    try:',
+            '        while (page := queue.get()) is not None:',
+            '            if isinstance(page, Exception):',
+            '                raise page',
+            '            yield page',
+            '    finally:',
+            '        # The worker sees `stop` within one put timeout and exits',
+            '        stop.set()',
+            '',
+        ]
+    lines += [
+        f'def iter_items(prefetch={prefetch}):' if prefetch else 'def iter_items():',
+        '    """Yield every item of the listing; memory stays at a few pages."""',
+        '    pages = fetch_pages()',
+    ]
+    if prefetch:
+        lines += [
+            '    if prefetch:',
+            '        pages = prefetched(pages, prefetch)',
+        ]
+    lines += [
+        '    for items in pages:',
+        '        yield from items',
+        '',
+        'for item in iter_items():',
+        '    pass  # handle one item',
+    ]
+    return '\n'.join(lines)
+
+
+def requests_pagination_code(
+    parsed: Dict[str, Any],
+    prefetch: int = 0,
+    sidecars: Optional[Sidecars] = None
+) -> str:
+    """Page generator for requests-style `self.context` frameworks."""
+    method = parsed['method'].upper()
+    if parsed['method'] == 'get':
+        var, keyword = 'params', 'params'
+    else:
+        var, keyword = 'body', 'json' if parsed['data_as_json'] else 'data'
+    fetch = f'self.context.{method}("{parsed["url"]}", {keyword}={var}).json()'
+    return pagination_code(parsed['pagination'], parsed['data'], var, fetch, prefetch, sidecars=sidecars)
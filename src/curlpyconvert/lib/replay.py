@@ -0,0 +1,428 @@
+import io
+import json
+import math
+import os
+import tempfile
+import threading
+import time
+from contextlib import contextmanager
+from http.client import HTTPConnection
+from http.cookiejar import Cookie, CookieJar
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from types import SimpleNamespace
+from typing import Dict, Any, List, Optional, Tuple
+from urllib.parse import parse_qsl, urlencode, urlsplit
+
+from .graphql import persisted_body
+from .headers import COMMON_HEADER_MARKER, HeaderMap
+
+# Body the stub server answers every request with
+STUB_RESPONSE = b'{"ok": true}'
+
+
+class StubServer:
+    """Local HTTP/1.1 server recording every request it receives.
+
+    One handler instance serves one TCP connection, so the number of
+    handler setups is the number of connections the client opened, and a
+    request is on a reused connection when its handler served one before.
+    """
+
+    def __init__(self):
+        self.requests: List[Dict[str, Any]] = []
+        self.connections = 0
+        self._lock = threading.Lock()
+        stub = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = 'HTTP/1.1'
+
+            def setup(self):
+                super().setup()
+                with stub._lock:
+                    stub.connections += 1
+                    self.connection_id = stub.connections
+                self.served = 0
+
+            def _record(self):
+                length = int(self.headers.get('Content-Length') or 0)
+                body = self.rfile.read(length) if length else b''
+                head = f'{self.requestline}\r\n{self.headers}'
+                with stub._lock:
+                    stub.requests.append({
+                        'method': self.command,
+                        'path': self.path,
+                        'headers': HeaderMap(list(self.headers.items())),
+                        'body': body,
+                        'connection': self.connection_id,
+                        'reused': self.served > 0,
+                        'bytes': len(head.encode('latin-1')) + len(body),
+                    })
+                self.served += 1
+                self.send_response(200)
+                self.send_header('Content-Type', 'application/json')
+                self.send_header('Content-Length', str(len(STUB_RESPONSE)))
+                if self.close_connection:
+                    # Tell the client, so it opens a new connection for the next request
+                    self.send_header('Connection', 'close')
+                self.end_headers()
+                self.wfile.write(STUB_RESPONSE)
+
+            do_GET = do_POST = do_PUT = do_PATCH = do_DELETE = do_HEAD = _record
+
+            def log_message(self, format, *args):
+                pass
+
+        self._server = ThreadingHTTPServer(('127.0.0.1', 0), Handler)
+        self._server.daemon_threads = True
+        self._thread = threading.Thread(target=self._server.serve_forever, daemon=True)
+
+    @property
+    def address(self) -> Tuple[str, int]:
+        return self._server.server_address[:2]
+
+    def __enter__(self) -> 'StubServer':
+        self._thread.start()
+        return self
+
+    def __exit__(self, *exc_info):
+        self._server.shutdown()
+        self._server.server_close()
+
+
+class ReplayResponse:
+    """Minimal requests-style response, readable in one piece or as a stream."""
+
+    def __init__(self, status_code: int, content: bytes):
+        self.status_code = status_code
+        self.content = content
+        self.text = content.decode('utf-8', 'replace')
+        # urllib3-style file object for code parsing the raw stream (ijson)
+        self.raw = io.BytesIO(content)
+        self.raw.decode_content = False
+
+    def json(self):
+        return json.loads(self.text)
+
+    def iter_content(self, chunk_size: int = 1, decode_unicode: bool = False):
+        chunk_size = chunk_size or len(self.content) or 1
+        for start in range(0, len(self.content), chunk_size):
+            yield self.content[start:start + chunk_size]
+
+    def iter_lines(self, chunk_size: int = 512, decode_unicode: bool = False, delimiter: Optional[bytes] = None):
+        yield from self.content.split(delimiter) if delimiter else self.content.splitlines()
+
+
+class ReplayDocument(ReplayResponse):
+    """Minimal Grab-style response, whose `json` is a property."""
+
+    @property
+    def json(self):
+        return json.loads(self.text)
+
+
+class ReplayTransport:
+    """Keep-alive HTTP client sending every request to the stub server.
+
+    The scheme and host of each URL are rewritten to the stub, the path and
+    query are kept. The connection is kept open between requests like a
+    framework session does; `http.client` opens a new one when the server
+    closes it (e.g. after `Connection: close`), which the server counts.
+    """
+
+    def __init__(self, address: Tuple[str, int]):
+        self.address = address
+        self.latencies: List[float] = []
+        self._connection: Optional[HTTPConnection] = None
+
+    def send(
+        self,
+        method: str,
+        url: str,
+        headers: Dict[str, str],
+        body: Optional[bytes] = None,
+        response_class: type = ReplayResponse
+    ) -> ReplayResponse:
+        parts = urlsplit(url)
+        target = parts.path or '/'
+        if parts.query:
+            target = f'{target}?{parts.query}'
+        if self._connection is None:
+            self._connection = HTTPConnection(*self.address)
+        started = time.perf_counter()
+        self._connection.request(method, target, body=body, headers=headers)
+        response = self._connection.getresponse()
+        content = response.read()
+        self.latencies.append(time.perf_counter() - started)
+        return response_class(response.status, content)
+
+    def close(self):
+        if self._connection is not None:
+            self._connection.close()
+
+
+def _encode_body(data=None, json_data=None, params=None) -> Tuple[Optional[bytes], Optional[str]]:
+    """Encode a request body the way requests/grab would."""
+    if json_data is not None:
+        return json.dumps(json_data).encode(), 'application/json'
+    if data is None:
+        return None, None
+    if isinstance(data, (bytes, bytearray)):
+        return bytes(data), None
+    if isinstance(data, str):
+        return data.encode(), None
+    return urlencode(data).encode(), 'application/x-www-form-urlencoded'
+
+
+def _with_params(url: str, params) -> str:
+    if not params:
+        return url
+    separator = '&' if '?' in url else '?'
+    return f'{url}{separator}{urlencode(params)}'
+
+
+class ReplayCookies(CookieJar):
+    """requests-style cookie jar: updated from dicts or jars, iterated as `Cookie`s."""
+
+    def update(self, other=(), **kwargs):
+        if hasattr(other, 'keys'):
+            other = {**other, **kwargs}
+            for name, value in other.items():
+                self.set_cookie(Cookie(
+                    0, name, value, None, False, '', False, False, '/', True,
+                    False, None, True, None, None, {}
+                ))
+            return
+        for cookie in other:
+            self.set_cookie(cookie)
+        self.update(kwargs)
+
+    def items(self) -> List[Tuple[str, str]]:
+        return [(cookie.name, cookie.value) for cookie in self]
+
+    def header(self) -> str:
+        return '; '.join(f'{name}={value}' for name, value in self.items())
+
+
+class ReplayContext:
+    """Stand-in for the Context/Dogman framework API used by generated code."""
+
+    def __init__(self, transport: ReplayTransport, warmup_cookies: Optional[Dict[str, str]] = None):
+        self.transport = transport
+        self.headers: Dict[str, str] = {}
+        self.cookies = ReplayCookies()
+        # Dogman's warm-up answers with the cookies the browser had
+        self.dogman = SimpleNamespace(
+            get_cookies=lambda url, spoofing=None: self.cookies.update(warmup_cookies or {})
+        )
+
+    def setup(self, **kwargs):
+        pass
+
+    def _request(self, method: str, url: str, data=None, json=None, params=None, **kwargs) -> ReplayResponse:
+        body, content_type = _encode_body(data, json)
+        headers = dict(self.headers)
+        if content_type and 'content-type' not in HeaderMap(headers):
+            headers['Content-Type'] = content_type
+        if self.cookies:
+            headers['Cookie'] = self.cookies.header()
+        return self.transport.send(method, _with_params(url, params), headers, body)
+
+    def GET(self, url, **kwargs):
+        return self._request('GET', url, **kwargs)
+
+    def POST(self, url, **kwargs):
+        return self._request('POST', url, **kwargs)
+
+    def PUT(self, url, **kwargs):
+        return self._request('PUT', url, **kwargs)
+
+    def PATCH(self, url, **kwargs):
+        return self._request('PATCH', url, **kwargs)
+
+    def DELETE(self, url, **kwargs):
+        return self._request('DELETE', url, **kwargs)
+
+
+class ReplayGrab:
+    """Stand-in for the Grab API used by generated code."""
+
+    def __init__(self, transport: ReplayTransport):
+        self.transport = transport
+        self.config: Dict[str, Any] = {'headers': {}, 'cookies': {}, 'common_headers': {}}
+
+    def setup(self, **kwargs):
+        self.config.update(kwargs)
+
+    def go(self, url, post=None, json=None, params=None, **kwargs) -> ReplayResponse:
+        post = post if post is not None else self.config.get('post')
+        body, content_type = _encode_body(post, json)
+        headers = {**self.config.get('common_headers', {}), **self.config.get('headers', {})}
+        if content_type and 'content-type' not in HeaderMap(headers):
+            headers['Content-Type'] = content_type
+        if self.config.get('cookies'):
+            headers['Cookie'] = '; '.join(f'{k}={v}' for k, v in self.config['cookies'].items())
+        method = 'POST' if body is not None else 'GET'
+        response = self.transport.send(method, _with_params(url, params), headers, body, ReplayDocument)
+        if self.config.get('body_inmemory') is False:
+            # Grab writes the body to the storage file instead of memory
+            storage = Path(self.config.get('body_storage_dir') or '.')
+            (storage / self.config['body_storage_filename']).write_bytes(response.content)
+        return response
+
+
+def percentile(values: List[float], fraction: float) -> float:
+    """Nearest-rank percentile of a list of values."""
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    rank = max(0, min(len(ordered) - 1, math.ceil(fraction * len(ordered)) - 1))
+    return ordered[rank]
+
+
+def _expected_body(parsed: Dict[str, Any], persisted_queries: bool = False) -> Any:
+    """Decoded body the generated code should send: JSON, form pairs or APQ bodies."""
+    graphql = parsed.get('graphql')
+    if persisted_queries and graphql:
+        # Only the hash and variables, the document is sent when the server asks
+        bodies = [persisted_body(operation) for operation in graphql['operations']]
+        return bodies if graphql['batched'] else bodies[0]
+    if parsed.get('data_as_json'):
+        return parsed['data']
+    return [tuple(pair) for pair in parsed['ordered_data']]
+
+
+def _decode_body(body: bytes, as_json: bool) -> Any:
+    try:
+        if as_json:
+            return json.loads(body or b'null')
+        return parse_qsl(body.decode('utf-8'), keep_blank_values=True)
+    except ValueError:
+        return None
+
+
+def check_fidelity(parsed: Dict[str, Any], recorded: Dict[str, Any], persisted_queries: bool = False) -> List[str]:
+    """Compare a replayed request with the parsed curl command.
+
+    Bodies re-encoded by the framework (JSON, form fields) match when they
+    decode to the captured data; with `persisted_queries` a GraphQL body
+    is expected as APQ. The marker Grab and Dogman code leaves in common
+    header values is not counted as a difference.
+    """
+    problems = []
+    if recorded['method'].lower() != parsed['method']:
+        problems.append(f"method: expected {parsed['method'].upper()}, sent {recorded['method']}")
+
+    sent_headers = recorded['headers']
+    for name, value in HeaderMap(parsed.get('headers')).to_dict().items():
+        if name.lower() in ('content-length', 'host'):
+            continue
+        if name not in sent_headers:
+            problems.append(f'header {name}: missing')
+        elif sent_headers[name].removesuffix(COMMON_HEADER_MARKER) != value:
+            problems.append(f'header {name}: expected {value!r}, sent {sent_headers[name]!r}')
+
+    # Split leniently, SimpleCookie gives up on real-world cookie values
+    sent_cookies = {}
+    for cookie_header in sent_headers.get_all('cookie'):
+        for pair in cookie_header.split(';'):
+            name, _, value = pair.strip().partition('=')
+            sent_cookies[name] = value
+    for name, value in (parsed.get('cookies') or {}).items():
+        if sent_cookies.get(name) != value:
+            problems.append(f'cookie {name}: expected {value!r}, sent {sent_cookies.get(name)!r}')
+
+    body = parsed.get('body')
+    if body is not None and recorded['body'] != bytes(body.view):
+        expected = _expected_body(parsed, persisted_queries)
+        as_json = parsed.get('data_as_json') or (persisted_queries and parsed.get('graphql'))
+        if _decode_body(recorded['body'], as_json) != expected:
+            problems.append(f"body: expected {len(body)} bytes, sent {len(recorded['body'])}")
+    return problems
+
+
+@contextmanager
+def _scratch_directory():
+    """Run in a temporary working directory, where generated code saves its downloads."""
+    previous = os.getcwd()
+    with tempfile.TemporaryDirectory(prefix='curlpyconvert-replay-') as directory:
+        os.chdir(directory)
+        try:
+            yield directory
+        finally:
+            os.chdir(previous)
+
+
+def replay(code: str, parsed: Dict[str, Any], runs: int = 1, persisted_queries: bool = False) -> Dict[str, Any]:
+    """Execute generated code against a stub server and report on it.
+
+    Each run gets a fresh framework stand-in, like a new scraper job, and
+    the whole snippet is executed; time not spent waiting on requests is
+    reported as setup time. Files the code writes (streamed downloads,
+    cookie jars) go to a temporary directory shared by the runs.
+    `persisted_queries` tells the fidelity check to expect APQ bodies.
+    """
+    if parsed.get('form'):
+        raise ValueError("Multipart forms cannot be replayed: the generated code uploads files from disk")
+    compiled = compile(code, '<generated>', 'exec')
+    latencies: List[float] = []
+    setup_time = 0.0
+
+    with StubServer() as server, _scratch_directory():
+        for _ in range(runs):
+            transport = ReplayTransport(server.address)
+            scraper = SimpleNamespace(
+                context=ReplayContext(transport, parsed.get('cookies')),
+                g=ReplayGrab(transport),
+            )
+            started = time.perf_counter()
+            try:
+                exec(compiled, {'self': scraper, '__name__': '__replay__'})
+            finally:
+                transport.close()
+            elapsed = time.perf_counter() - started
+            latencies.extend(transport.latencies)
+            setup_time += elapsed - sum(transport.latencies)
+
+        # Let the server finish recording the last request
+        deadline = time.perf_counter() + 1
+        while len(server.requests) < len(latencies) and time.perf_counter() < deadline:
+            time.sleep(0.01)
+        recorded = list(server.requests)
+        connections = server.connections
+
+    return {
+        'runs': runs,
+        'requests': len(recorded),
+        'connections': connections,
+        'reused': sum(request['reused'] for request in recorded),
+        'bytes_sent': sum(request['bytes'] for request in recorded),
+        'setup_ms': setup_time / runs * 1000 if runs else 0.0,
+        'latency_ms': {
+            'p50': percentile(latencies, 0.50) * 1000,
+            'p90': percentile(latencies, 0.90) * 1000,
+            'p99': percentile(latencies, 0.99) * 1000,
+        },
+        'fidelity': check_fidelity(parsed, recorded[0], persisted_queries) if recorded else ['no request was sent'],
+    }
+
+
+def format_report(report: Dict[str, Any]) -> str:
+    """Render a replay report as text."""
+    latency = report['latency_ms']
+    lines = [
+        f"runs:        {report['runs']}",
+        f"requests:    {report['requests']}",
+        f"connections: {report['connections']} ({report['reused']} request(s) on reused connections)",
+        '             (the replay stand-in transport, not the framework session)',
+        f"bytes sent:  {report['bytes_sent']}",
+        f"setup:       {report['setup_ms']:.2f} ms per run",
+        f"latency:     p50 {latency['p50']:.2f} ms, p90 {latency['p90']:.2f} ms, p99 {latency['p99']:.2f} ms",
+    ]
+    if report['fidelity']:
+        lines.append(f"fidelity:    {len(report['fidelity'])} mismatch(es)")
+        lines.extend(f'  - {problem}' for problem in report['fidelity'])
+    else:
+        lines.append('fidelity:    replayed request matches the curl command')
+    return '\n'.join(lines)
@@ -0,0 +1,58 @@
+from pathlib import Path
+from typing import Dict, Any, List, Optional, Union
+
+from . import jsonbackend
+
+# Literals longer than this many characters go to sidecar files with --output
+SIDECAR_THRESHOLD = 64 * 1024
+
+SIDECAR_HELPERS = '''import json
+from functools import lru_cache
+from pathlib import Path
+
+@lru_cache(maxsize=None)
+def load_payload(name):
+    """Read a payload file next to this module once, on first use."""
+    path = Path(__file__).with_name(f"{Path(__file__).stem}.{name}")
+    if path.suffix == ".json":
+        return json.loads(path.read_bytes())
+    return path.read_bytes()'''
+
+
+class Sidecars:
+    """Large payloads moved out of generated code into files next to the module.
+
+    Huge dict literals make a module slow to compile and bloat its
+    bytecode cache; a `load_payload()` call reads the file only when the
+    code first needs it. Without a threshold every literal stays inline.
+    """
+
+    def __init__(self, threshold: Optional[int] = None, prefix: str = ''):
+        self.threshold = threshold
+        # Keeps the names of several converted commands apart in one module
+        self.prefix = prefix
+        self.files: Dict[str, bytes] = {}
+
+    def payload(self, name: str, value: Union[Any, bytes, memoryview], literal: str) -> str:
+        """`literal` when it is small, else an expression loading `value` from a sidecar file.
+
+        Bytes are stored verbatim, anything else as JSON. A `memoryview`
+        is copied to bytes only when it actually moves to a file.
+        """
+        if self.threshold is None or len(literal) <= self.threshold:
+            return literal
+        if isinstance(value, (bytes, memoryview)):
+            name, data = f'{self.prefix}{name}.bin', bytes(value)
+        else:
+            name, data = f'{self.prefix}{name}.json', jsonbackend.dumps(value).encode()
+        self.files[name] = data
+        return f'load_payload({jsonbackend.dumps(name)})'
+
+    def write(self, module_path: Path) -> List[Path]:
+        """Write the payload files for a module saved at `module_path`."""
+        paths = []
+        for name, data in self.files.items():
+            path = module_path.with_name(f'{module_path.stem}.{name}')
+            path.write_bytes(data)
+            paths.append(path)
+        return paths
@@ -0,0 +1,60 @@
+import re
+from typing import List
+
+# Characters that can start a quote, an escape, a comment or a command boundary
+SPECIAL = re.compile(r"[\\'\"\n;&|#]")
+# Rest of a double-quoted or $'...' string, backslash escapes included
+DOUBLE_QUOTED_END = re.compile(r'(?:[^"\\]|\\.)*"', re.DOTALL)
+ANSI_C_QUOTED_END = re.compile(r"(?:[^'\\]|\\.)*'", re.DOTALL)
+# What may precede a `#` that starts a comment: it has to begin a word
+WORD_BOUNDARY = ' \t\n;&|('
+# Runs of separators between two commands: `;`, `&&`, `||`, `&`, newlines
+SEPARATORS = re.compile(r'[;&|\n]+')
+
+
+def _is_curl(command: str) -> bool:
+    return command == 'curl' or command.startswith(('curl ', 'curl\t', 'curl\\\n'))
+
+
+def split_commands(text: str) -> List[str]:
+    """Split a "Copy all as cURL (bash)" blob into single curl commands.
+
+    Boundaries are unquoted `;`, `&&`, `||`, `&` and newlines that are not
+    line continuations, so separators inside '...', "..." and $'...'
+    bodies stay put; `#` comments are dropped up to the end of their
+    line. The scan jumps between special characters with one regex
+    search each, which keeps multi-MB blobs linear. Pieces that are not
+    curl commands (`cd`, comments, ...) are dropped.
+    """
+    commands = []
+    start = pos = 0
+    search = SPECIAL.search
+    while match := search(text, pos):
+        char, index = match.group(), match.start()
+        if char == '\\':
+            # Escaped character, `\<newline>` continuations included
+            pos = index + 2
+        elif char == "'":
+            if index and text[index - 1] == '$':
+                end = ANSI_C_QUOTED_END.match(text, index + 1)
+                pos = end.end() if end else len(text)
+            else:
+                end = text.find("'", index + 1)
+                pos = end + 1 if end >= 0 else len(text)
+        elif char == '"':
+            end = DOUBLE_QUOTED_END.match(text, index + 1)
+            pos = end.end() if end else len(text)
+        elif char == '#':
+            if index and text[index - 1] not in WORD_BOUNDARY:
+                # Inside a word, e.g. a URL fragment
+                pos = index + 1
+            else:
+                # Quotes in a comment do not count, it is dropped up to the newline
+                commands.append(text[start:index])
+                end = text.find('\n', index)
+                start = pos = end if end >= 0 else len(text)
+        else:
+            commands.append(text[start:index])
+            start = pos = SEPARATORS.match(text, index).end()
+    commands.append(text[start:])
+    return [command.strip() for command in commands if _is_curl(command.strip())]
@@ -0,0 +1,137 @@
+from pathlib import PurePosixPath
+from typing import Dict, Any, List, Optional
+from urllib.parse import urlsplit
+
+from . import jsonbackend
+from .headers import HeaderMap
+
+# Accept media types answered with line-delimited JSON or with a file
+NDJSON_TYPES = frozenset({
+    'application/x-ndjson', 'application/ndjson', 'application/jsonl',
+    'application/json-seq', 'application/stream+json'
+})
+DOWNLOAD_TYPES = frozenset({
+    'application/octet-stream', 'application/zip', 'application/gzip', 'application/x-gzip',
+    'application/x-tar', 'application/pdf', 'application/vnd.ms-excel',
+    'application/vnd.openxmlformats-officedocument.spreadsheetml.sheet',
+    'application/vnd.apache.parquet', 'text/csv', 'text/tab-separated-values'
+})
+DOWNLOAD_PREFIXES = ('image/', 'video/', 'audio/')
+
+NDJSON_EXTENSIONS = frozenset({'.jsonl', '.ndjson'})
+DOWNLOAD_EXTENSIONS = frozenset({
+    '.zip', '.gz', '.tgz', '.tar', '.bz2', '.xz', '.7z', '.csv', '.tsv', '.xls', '.xlsx',
+    '.pdf', '.parquet', '.avro', '.bin', '.iso', '.mp3', '.mp4', '.png', '.jpg', '.jpeg',
+    '.gif', '.webp'
+})
+
+# Bytes read per iteration when writing a download to disk
+CHUNK_SIZE = 1024 * 1024
+
+
+def _accept_type(parsed: Dict[str, Any]) -> str:
+    accept = HeaderMap(parsed.get('headers')).get('accept') or ''
+    return accept.split(',')[0].split(';')[0].strip().lower()
+
+
+def detect_stream(parsed: Dict[str, Any], force: bool = False) -> Optional[str]:
+    """How the response should be consumed: `download`, `ndjson`, `json` or None.
+
+    Line-delimited JSON and file media types in the `accept` header or
+    the URL extension stream automatically. A `.json` URL streams JSON
+    items; a plain `accept: application/json` only does with `force`,
+    since every API call sends it.
+    """
+    media_type = _accept_type(parsed)
+    suffix = PurePosixPath(urlsplit(parsed['url']).path).suffix.lower()
+    if media_type in NDJSON_TYPES or suffix in NDJSON_EXTENSIONS:
+        return 'ndjson'
+    if media_type in DOWNLOAD_TYPES or media_type.startswith(DOWNLOAD_PREFIXES) or suffix in DOWNLOAD_EXTENSIONS:
+        return 'download'
+    if suffix == '.json':
+        return 'json'
+    if force:
+        return 'json' if 'json' in media_type else 'download'
+    return None
+
+
+def download_path(url: str) -> str:
+    """File name a streamed response is saved under."""
+    split = urlsplit(url)
+    return PurePosixPath(split.path).name or f"{split.hostname or 'response'}.bin"
+
+
+def _consume_lines(mode: str) -> List[str]:
+    if mode == 'download':
+        return [
+            'with DOWNLOAD_PATH.open("wb") as file:',
+            f'    for chunk in response.iter_content(chunk_size={CHUNK_SIZE}):',
+            '        file.write(chunk)',
+        ]
+    if mode == 'ndjson':
+        return [
+            'for line in response.iter_lines():',
+            '    if line:',
+            '        item = json.loads(line)  # handle one item',
+        ]
+    return [
+        '# Let urllib3 undo gzip/br while ijson reads the raw stream',
+        'response.raw.decode_content = True',
+        'for item in ijson.items(response.raw, ITEMS_PREFIX):',
+        '    pass  # handle one item',
+    ]
+
+
+def requests_stream_code(mode: str, request_line: str, url: str, check: str = '') -> str:
+    """Streaming consumption of a requests-style response.
+
+    `request_line` assigns `response` from a request sending `stream=True`,
+    so the body is read from the socket as it is consumed. `check` runs on
+    the response before its body is read (e.g. a retry on 403).
+    """
+    if mode == 'download':
+        lines = ['from pathlib import Path', '', f'DOWNLOAD_PATH = Path({jsonbackend.dumps(download_path(url))})']
+    elif mode == 'ndjson':
+        lines = ['import json']
+    else:
+        lines = [
+            'import ijson',
+            '',
+            '# ijson path of the items, e.g. "data.item" for {"data": [...]}',
+            'ITEMS_PREFIX = "item"',
+        ]
+    lines += ['', request_line, *([check] if check else []), *_consume_lines(mode)]
+    return '\n'.join(lines)
+
+
+def grab_stream_code(mode: str, request_line: str, url: str) -> str:
+    """Streaming consumption for Grab, which writes the body to disk as it arrives."""
+    lines = [
+        'from pathlib import Path',
+        *(['import ijson'] if mode == 'json' else ['import json'] if mode == 'ndjson' else []),
+        '',
+        f'DOWNLOAD_PATH = Path({jsonbackend.dumps(download_path(url))})',
+    ]
+    if mode == 'json':
+        lines += ['# ijson path of the items, e.g. "data.item" for {"data": [...]}', 'ITEMS_PREFIX = "item"']
+    lines += [
+        '',
+        '# Keep the body out of memory',
+        'self.g.setup(body_inmemory=False, body_storage_dir=str(DOWNLOAD_PATH.parent.resolve()), '
+        'body_storage_filename=DOWNLOAD_PATH.name)',
+        request_line,
+    ]
+    if mode == 'ndjson':
+        lines += [
+            'with DOWNLOAD_PATH.open("rb") as file:',
+            '    for line in file:',
+            '        if line.strip():',
+            '            item = json.loads(line)  # handle one item',
+        ]
+    elif mode == 'json':
+        lines += [
+            'with DOWNLOAD_PATH.open("rb") as file:',
+            '    for item in ijson.items(file, ITEMS_PREFIX):',
+            '        pass  # handle one item',
+        ]
+    return '\n'.join(lines)
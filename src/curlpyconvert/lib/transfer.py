@@ -0,0 +1,35 @@
+from typing import Dict, Any, List, Optional
+
+# Encodings the generated code negotiates when --compressed was captured
+ACCEPT_ENCODING = 'gzip, deflate, br'
+
+
+def range_header(transfer: Optional[Dict[str, Any]]) -> Optional[str]:
+    """Return the Range header value for a curl -r/--range option."""
+    if not transfer or not transfer.get('range'):
+        return None
+    byte_range = transfer['range']
+    return byte_range if byte_range.startswith('bytes=') else f'bytes={byte_range}'
+
+
+def requests_transfer_code(transfer: Optional[Dict[str, Any]]) -> str:
+    """Generate transfer setup for requests-based frameworks (Context, Dogman)."""
+    if not transfer:
+        return ''
+
+    lines: List[str] = []
+    if transfer.get('compressed'):
+        lines.append(
+            f'self.context.headers.update({{"Accept-Encoding": "{ACCEPT_ENCODING}"}})'
+            '  # br is decoded only with the brotli package installed'
+        )
+    if transfer.get('http2'):
+        lines.append('# --http2: requests speaks HTTP/1.1 only, switch to httpx(http2=True) if HTTP/2 matters')
+    if transfer.get('keepalive_time') is not None:
+        lines.append(
+            f"# --keepalive-time {transfer['keepalive_time']}: connections are pooled per session, "
+            'TCP keepalive probes are not configurable here'
+        )
+    if transfer.get('limit_rate'):
+        lines.append(f"# --limit-rate {transfer['limit_rate']}: no rate limiting in requests, throttle in the caller")
+    return '\n'.join(lines)
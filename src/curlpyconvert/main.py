@@ -1,20 +1,24 @@
 import typer
-import pyperclip
 from rich import print
 from rich.panel import Panel
 from rich.syntax import Syntax
 from rich.traceback import install
 from rich.progress import Progress, SpinnerColumn, TextColumn
 from rich.prompt import Prompt
-from typing import Optional
+from rich.markup import escape
+from typing import List, Optional
 from enum import Enum
 from prompt_toolkit import prompt
 from prompt_toolkit.completion import WordCompleter
 from prompt_toolkit.styles import Style
 from catppuccin.extras.pygments import MochaStyle
 import importlib.metadata
+import os
 import time
 import re
+import sys
+from concurrent.futures import ProcessPoolExecutor
+from functools import partial
 from pathlib import Path
 from urllib.parse import urlparse
 
@@ -25,6 +29,17 @@ from .lib.curl_parser import CurlParser
 from .lib.grab import GrabCodeWriter
 from .lib.context import ContextCodeWriter
 from .lib.dogman import DogmanCodeWriter
+from .lib.diff import diff_requests, format_diff
+from .lib.cookiejar import write_netscape
+from .lib.replay import replay as replay_code, format_report
+from .lib import minimize as minimizer
+from .lib.clipboard import get_clipboard
+from .lib.builder import RequestBuilder
+from .lib.logindex import LogIndex
+from .lib.graphql import payload_sizes
+from .lib.splitter import split_commands
+from .lib.sidecar import SIDECAR_HELPERS, SIDECAR_THRESHOLD, Sidecars
+from .lib.live import create_application
 
 app = typer.Typer(
     help="""Convert cURL commands to Python code for Grab/Context frameworks
@@ -82,7 +97,11 @@ def get_framework(test_mode=False) -> Framework:
     
     return Framework(framework.lower())
 
-def display_code(code: str, language: str = "python"):
+def status_printer(clipboard):
+    """rich `print` for status messages, on stderr when stdout carries the code."""
+    return partial(print, file=sys.stderr) if clipboard.uses_stdout else print
+
+def display_code(code: str, language: str = "python", file=None):
     """Display code with syntax highlighting using Catppuccin theme."""
     syntax = Syntax(
         code,
@@ -98,36 +117,192 @@ def display_code(code: str, language: str = "python"):
         title=f"Generated {language.capitalize()} Code",
         title_align="left",
     )
-    print(panel)
+    print(panel, file=file)
 
-def get_curl_command(test_mode=False) -> str:
-    """Get curl command from clipboard and confirm."""
-    curl_command = pyperclip.paste().strip()
+def clean_curl_command(curl_command: str) -> str:
+    """Join line continuations and drop shell escapes."""
+    return curl_command.replace('\\\n', ' ').replace('\\', '')
+
+def get_log_commands(log_file: Path, nth: Optional[int] = None, grep_url: Optional[str] = None) -> List[str]:
+    """Pick curl commands from an indexed log file by position or URL pattern."""
+    with LogIndex.open(log_file) as index:
+        if nth is not None:
+            positions = [nth]
+        elif grep_url:
+            positions = list(index.grep_url(grep_url))
+        else:
+            raise ValueError("--from needs --nth or --grep-url")
+        if not positions:
+            raise ValueError(f"No command in {log_file} has a URL matching {grep_url}")
+        return [clean_curl_command(index.command(position)) for position in positions]
+
+def paste_curl_command(test_mode=False, clipboard=None) -> str:
+    """Get the clipboard text, pasted again once the user confirms."""
+    clipboard = clipboard or get_clipboard()
+    curl_command = clipboard.paste().strip()
     
     if not curl_command:
         raise ValueError("No curl command in clipboard")
-        
-    # Clean up the curl command
-    curl_command = curl_command.replace('\\\n', ' ').replace('\\', '')
     
-    if test_mode:
+    # Only the desktop clipboard can change while we wait
+    if test_mode or not clipboard.interactive:
         return curl_command
         
     print("Copy curl command to clipboard and press Enter...")
     input()  # Wait for user confirmation
-    return pyperclip.paste().strip()
+    return clipboard.paste().strip()
+
+def get_curl_command(test_mode=False, clipboard=None) -> str:
+    """Get curl command from clipboard and confirm."""
+    return clean_curl_command(paste_curl_command(test_mode, clipboard))
 
-def form_code(parsed_curl: dict, framework: Framework) -> str:
+def get_curl_commands(test_mode=False, clipboard=None) -> List[str]:
+    """Get the clipboard's curl commands, splitting "Copy all as cURL" blobs."""
+    text = paste_curl_command(test_mode, clipboard)
+    # Split before cleaning: the scanner needs the quotes and escapes
+    commands = split_commands(text)
+    if len(commands) <= 1:
+        return [clean_curl_command(text)]
+    return [clean_curl_command(command) for command in commands]
+
+def form_code(
+    parsed_curl: dict,
+    framework: Framework,
+    passthrough: bool = False,
+    cookie_cache: bool = False,
+    cookie_jar: Optional[str] = None,
+    cookie_ttl: int = 3600,
+    builder: bool = False,
+    params: Optional[List[str]] = None,
+    paginate: bool = False,
+    prefetch: int = 0,
+    persisted_queries: bool = False,
+    stream: bool = False,
+    sidecars: Optional[Sidecars] = None
+) -> str:
     """Generate framework-specific code from parsed curl command."""
+    if builder:
+        return RequestBuilder(parsed_curl, framework.value, params, sidecars=sidecars).generate_code()
     if framework == Framework.GRAB:
-        writer = GrabCodeWriter(parsed_curl)
+        writer = GrabCodeWriter(
+            parsed_curl,
+            passthrough=passthrough,
+            paginate=paginate,
+            prefetch=prefetch,
+            persisted_queries=persisted_queries,
+            stream=stream,
+            sidecars=sidecars
+        )
     elif framework == Framework.DOGMAN:
-        writer = DogmanCodeWriter(parsed_curl)
+        writer = DogmanCodeWriter(
+            parsed_curl,
+            passthrough=passthrough,
+            cookie_cache=cookie_cache,
+            cookie_jar=cookie_jar,
+            cookie_ttl=cookie_ttl,
+            paginate=paginate,
+            prefetch=prefetch,
+            persisted_queries=persisted_queries,
+            stream=stream,
+            sidecars=sidecars
+        )
     else:
-        writer = ContextCodeWriter(parsed_curl)
+        writer = ContextCodeWriter(
+            parsed_curl,
+            passthrough=passthrough,
+            paginate=paginate,
+            prefetch=prefetch,
+            persisted_queries=persisted_queries,
+            stream=stream,
+            sidecars=sidecars
+        )
     
     return writer.generate_code()
 
+# Below this many commands, starting worker processes costs more than it saves
+PARALLEL_MIN_COMMANDS = 16
+
+def convert_command(
+    curl_command: str,
+    sidecar_prefix: str = '',
+    framework: Framework = Framework.CONTEXT,
+    minimize: bool = False,
+    rules: Optional[Path] = None,
+    sidecar_threshold: Optional[int] = None,
+    **options
+) -> dict:
+    """Parse, optionally minimize, and convert one curl command.
+
+    Returns the code, the request's method, URL and cookies, the
+    payloads moved to sidecar files and the messages to print. The
+    result is plain data, so it can come back from a worker process.
+    """
+    parsed_curl = CurlParser.parse_curl(curl_command)
+    sidecars = Sidecars(sidecar_threshold, sidecar_prefix)
+    notes = []
+    
+    # Strip headers and cookies the request does not need
+    if minimize:
+        parsed_curl, report = minimizer.minimize(parsed_curl, framework.value, minimizer.load_rules(rules))
+        notes.append(f"[green]✓[/green] Minimized: {minimizer.format_report(report)}")
+    
+    code = form_code(parsed_curl, framework=framework, sidecars=sidecars, **options)
+    if options.get('paginate') and not parsed_curl.get('pagination'):
+        notes.append(f"[yellow]![/yellow] No page, offset or cursor field found in {escape(parsed_curl['url'])}")
+    if options.get('persisted_queries'):
+        if parsed_curl.get('graphql'):
+            sizes = payload_sizes(parsed_curl['graphql'], parsed_curl['data'])
+            notes.append(
+                f"[green]✓[/green] Persisted queries: request body {sizes['captured']} → "
+                f"{sizes['persisted']} bytes"
+            )
+        else:
+            notes.append(f"[yellow]![/yellow] No GraphQL body found in {escape(parsed_curl['url'])}")
+    return {
+        'method': parsed_curl['method'].upper(),
+        'url': parsed_curl['url'],
+        'cookies': parsed_curl.get('cookies') or {},
+        'code': code,
+        'payloads': sidecars.files,
+        'notes': notes,
+    }
+
+def convert_commands(curl_commands: List[str], workers: Optional[int] = None, **options) -> List[dict]:
+    """Convert commands in order, across worker processes for large batches."""
+    convert_one = partial(convert_command, **options)
+    # Sidecar files of several commands are numbered like the table of contents
+    prefixes = [f'{number}.' if len(curl_commands) > 1 else '' for number in range(1, len(curl_commands) + 1)]
+    workers = workers or os.cpu_count() or 1
+    if len(curl_commands) < PARALLEL_MIN_COMMANDS or workers == 1:
+        return list(map(convert_one, curl_commands, prefixes))
+    
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        # A few chunks per worker keeps the load even with little IPC overhead
+        chunksize = max(1, len(curl_commands) // (workers * 4))
+        return list(executor.map(convert_one, curl_commands, prefixes, chunksize=chunksize))
+
+def table_of_contents(results: List[dict]) -> str:
+    """Numbered list of the requests in a combined module."""
+    width = len(str(len(results)))
+    lines = ['# Requests:']
+    lines += [
+        f"#   {number:>{width}}. {result['method']} {result['url']}"
+        for number, result in enumerate(results, 1)
+    ]
+    return '\n'.join(lines)
+
+def module_code(results: List[dict]) -> str:
+    """Join converted commands into one module, with the payload loader when it is needed."""
+    if len(results) == 1:
+        code_blocks = [results[0]['code']]
+    else:
+        code_blocks = [table_of_contents(results)]
+        code_blocks += [f"# {result['method']} {result['url']}\n{result['code']}" for result in results]
+    if any(result['payloads'] for result in results):
+        # Loaded on first use, so importing the module stays fast
+        code_blocks.insert(1 if len(results) > 1 else 0, SIDECAR_HELPERS)
+    return '\n\n\n'.join(code_blocks)
+
 def version_callback(value: bool):
     """Callback for --version flag."""
     if value:
@@ -189,32 +364,186 @@ def convert(
         "-o",
         help="Save the generated code to a .py file in current directory"
     ),
+    passthrough: bool = typer.Option(
+        False,
+        "--passthrough",
+        "-p",
+        help="Send the captured request body verbatim instead of decoding it"
+    ),
+    cookie_cache: bool = typer.Option(
+        False,
+        "--cookie-cache",
+        help="Dogman: cache warm-up cookies in a per-host jar file instead of fetching them every run"
+    ),
+    cookie_ttl: int = typer.Option(
+        3600,
+        "--cookie-ttl",
+        help="Dogman: seconds before cached cookies are fetched again"
+    ),
+    cookie_jar: Optional[Path] = typer.Option(
+        None,
+        "--cookie-jar",
+        help="Dogman: export captured cookies to this Netscape cookie-jar file (seeds the --cookie-cache jar)"
+    ),
+    minimize: bool = typer.Option(
+        False,
+        "--minimize",
+        "-m",
+        help="Drop browser-only headers, analytics cookies and framework defaults"
+    ),
+    rules: Optional[Path] = typer.Option(
+        None,
+        "--rules",
+        exists=True,
+        dir_okay=False,
+        help="JSON file with extra --minimize rules, optionally per host"
+    ),
+    builder: bool = typer.Option(
+        False,
+        "--builder",
+        "-B",
+        help="Emit a request builder function with static parts hoisted to module-level constants"
+    ),
+    param: Optional[List[str]] = typer.Option(
+        None,
+        "--param",
+        help="Variable field for --builder (dotted path for nested JSON); inferred when omitted"
+    ),
+    paginate: bool = typer.Option(
+        False,
+        "--paginate",
+        "-P",
+        help="Emit a generator yielding items page by page when the request is paginated"
+    ),
+    prefetch: int = typer.Option(
+        0,
+        "--prefetch",
+        min=0,
+        help="With --paginate: pages fetched ahead of the consumer in a background thread"
+    ),
+    persisted_queries: bool = typer.Option(
+        False,
+        "--apq",
+        help="GraphQL: send Automatic Persisted Queries (hash + variables), the full query only when the server asks"
+    ),
+    stream: bool = typer.Option(
+        False,
+        "--stream",
+        help="Stream the response: chunks to disk, or JSON items parsed as they arrive (automatic for downloads and NDJSON)"
+    ),
+    from_log: Optional[Path] = typer.Option(
+        None,
+        "--from",
+        exists=True,
+        dir_okay=False,
+        help="Read commands from a curl log file (indexed on first use) instead of the clipboard"
+    ),
+    nth: Optional[int] = typer.Option(
+        None,
+        "--nth",
+        min=0,
+        help="With --from: convert the command at this 0-based position"
+    ),
+    grep_url: Optional[str] = typer.Option(
+        None,
+        "--grep-url",
+        help="With --from: convert every command whose URL matches this regular expression"
+    ),
+    sidecar_threshold: int = typer.Option(
+        SIDECAR_THRESHOLD,
+        "--sidecar-threshold",
+        min=1,
+        help="With --output: literals (bodies, cookies, headers) longer than this go to .json files next to the module"
+    ),
+    workers: Optional[int] = typer.Option(
+        None,
+        "--workers",
+        "-j",
+        min=1,
+        help="Worker processes for converting many commands (default: CPU count)"
+    ),
+    clipboard: Optional[str] = typer.Option(
+        None,
+        "--clipboard",
+        help="Clipboard backend: system, memory, stdio or file:<path> (default: $CURLPYCONVERT_CLIPBOARD or system)"
+    ),
     test_mode: bool = typer.Option(
         False,
         hidden=True
     )
 ):
     """Convert a cURL command from clipboard to Python code."""
+    echo = print
     try:
+        clipboard_backend = get_clipboard(clipboard)
+        echo = status_printer(clipboard_backend)
         if not framework:
             framework = get_framework(test_mode)
-            print()  # Add spacing
+            echo()  # Add spacing
         
-        curl_command = get_curl_command(test_mode)
-        parsed_curl = CurlParser.parse_curl(curl_command)
-        python_code = form_code(parsed_curl, framework=framework)
+        if from_log:
+            curl_commands = get_log_commands(from_log, nth, grep_url)
+        else:
+            curl_commands = get_curl_commands(test_mode, clipboard_backend)
         
-        # Copy plain text to clipboard
-        pyperclip.copy(python_code)
-        print(f"[green]✓[/green] Converted code has been copied to clipboard!")
+        options = dict(
+            framework=framework,
+            minimize=minimize,
+            rules=rules,
+            passthrough=passthrough,
+            cookie_cache=cookie_cache,
+            cookie_jar=str(cookie_jar) if cookie_jar else None,
+            cookie_ttl=cookie_ttl,
+            builder=builder,
+            params=param,
+            paginate=paginate,
+            prefetch=prefetch,
+            persisted_queries=persisted_queries,
+            stream=stream
+        )
+        results = convert_commands(
+            curl_commands,
+            workers=workers,
+            sidecar_threshold=sidecar_threshold if output else None,
+            **options
+        )
+        for result in results:
+            for note in result['notes']:
+                echo(note)
+        if len(results) > 1:
+            echo(f"[green]✓[/green] Converted {len(results)} commands")
+        sidecars = Sidecars()
+        for result in results:
+            sidecars.files.update(result['payloads'])
+        python_code = module_code(results)
+        # Cookie export and the output filename follow the first command
+        first = results[0]
+        
+        # Seed the dogman cookie jar with the captured cookies
+        if cookie_jar and framework == Framework.DOGMAN:
+            write_netscape(first['cookies'], first['url'], cookie_jar)
+            echo(f"[green]✓[/green] Cookies exported to {cookie_jar}")
+        elif cookie_jar:
+            echo(f"[yellow]![/yellow] --cookie-jar only applies to the dogman framework, no cookies exported")
+        
+        # Copy plain text to clipboard; no payload files sit next to it, so
+        # the commands that moved literals out are converted again inline
+        clipboard_code = python_code
+        if sidecars.files:
+            clipboard_code = module_code([
+                convert_command(command, **options) if result['payloads'] else result
+                for command, result in zip(curl_commands, results)
+            ])
+        clipboard_backend.copy(clipboard_code)
+        echo(f"[green]✓[/green] Converted code has been copied to clipboard!")
         
         # If verbose, display with syntax highlighting
         if verbose:
-            display_code(python_code)
+            display_code(python_code, file=sys.stderr if clipboard_backend.uses_stdout else None)
             
         # If output flag is set, save to file
         if output:
-            filename = sanitize_filename(parsed_curl['url'])
+            filename = sanitize_filename(first['url'])
             file_path = Path.cwd() / filename
             
             # Check if file exists and handle accordingly
@@ -227,8 +556,158 @@ def convert(
             
             # Write the code to file
             file_path.write_text(python_code)
-            print(f"[green]✓[/green] Code saved to {file_path}")
+            echo(f"[green]✓[/green] Code saved to {file_path}")
+            for path in sidecars.write(file_path):
+                echo(f"[green]✓[/green] Payload saved to {path} ({path.stat().st_size} bytes)")
             
+    except Exception as e:
+        echo(f"[red]Error:[/red] {str(e)}")
+        raise typer.Exit(1)
+
+@app.command()
+def index(
+    log_file: Path = typer.Argument(..., exists=True, dir_okay=False, help="Log file with one curl command per entry"),
+):
+    """Index the curl commands of a large log file for `convert --from`."""
+    try:
+        started = time.perf_counter()
+        log_index = LogIndex.build(log_file)
+        index_path = log_index.save()
+        elapsed = time.perf_counter() - started
+        print(
+            f"[green]✓[/green] Indexed {len(log_index)} command(s) on {len(log_index.hosts)} host(s) "
+            f"in {elapsed:.2f}s → {index_path}"
+        )
+    except Exception as e:
+        print(f"[red]Error:[/red] {str(e)}")
+        raise typer.Exit(1)
+
+@app.command()
+def diff(
+    first: Path = typer.Argument(..., exists=True, dir_okay=False, help="Working curl capture"),
+    second: Path = typer.Argument(..., exists=True, dir_okay=False, help="Failing curl capture"),
+):
+    """Compare two captured cURL commands (URL, params, headers, cookies, body)."""
+    try:
+        parsed_first = CurlParser.parse_curl(first.read_text())
+        parsed_second = CurlParser.parse_curl(second.read_text())
+        report = format_diff(diff_requests(parsed_first, parsed_second), str(first), str(second))
+        print(escape(report))
+    except Exception as e:
+        print(f"[red]Error:[/red] {str(e)}")
+        raise typer.Exit(1)
+
+@app.command()
+def replay(
+    source: Optional[Path] = typer.Argument(
+        None,
+        exists=True,
+        dir_okay=False,
+        help="File with the curl command (defaults to the clipboard)"
+    ),
+    framework: Framework = typer.Option(
+        Framework.CONTEXT,
+        "--framework",
+        "-f",
+        help="Framework whose generated code is replayed"
+    ),
+    runs: int = typer.Option(
+        10,
+        "--runs",
+        "-n",
+        min=1,
+        help="How many times to execute the generated code"
+    ),
+    passthrough: bool = typer.Option(
+        True,
+        "--passthrough/--no-passthrough",
+        "-p",
+        help="Send the captured request body verbatim; without it the generated code leaves the body to you"
+    ),
+    cookie_cache: bool = typer.Option(
+        False,
+        "--cookie-cache",
+        help="Dogman: replay the cookie jar cache, warming up only on the first run"
+    ),
+    paginate: bool = typer.Option(
+        False,
+        "--paginate",
+        help="Replay the page generator of a paginated request"
+    ),
+    persisted_queries: bool = typer.Option(
+        False,
+        "--apq",
+        help="GraphQL: replay Automatic Persisted Queries"
+    ),
+    stream: bool = typer.Option(
+        False,
+        "--stream",
+        help="Replay streaming response consumption"
+    ),
+    clipboard: Optional[str] = typer.Option(
+        None,
+        "--clipboard",
+        help="Clipboard backend: system, memory, stdio or file:<path> (default: $CURLPYCONVERT_CLIPBOARD or system)"
+    ),
+    test_mode: bool = typer.Option(
+        False,
+        hidden=True
+    )
+):
+    """Replay generated code against a local stub server and report on it."""
+    try:
+        curl_command = source.read_text() if source else get_curl_command(test_mode, get_clipboard(clipboard))
+        if cookie_cache and framework != Framework.DOGMAN:
+            raise ValueError("--cookie-cache only applies to the dogman framework")
+        parsed_curl = CurlParser.parse_curl(curl_command)
+        python_code = form_code(
+            parsed_curl,
+            framework=framework,
+            passthrough=passthrough,
+            cookie_cache=cookie_cache,
+            paginate=paginate,
+            persisted_queries=persisted_queries,
+            stream=stream
+        )
+        report = replay_code(python_code, parsed_curl, runs=runs, persisted_queries=persisted_queries)
+        print(escape(format_report(report)))
+    except Exception as e:
+        print(f"[red]Error:[/red] {str(e)}")
+        raise typer.Exit(1)
+
+@app.command()
+def live(
+    framework: Framework = typer.Option(
+        Framework.CONTEXT,
+        "--framework",
+        "-f",
+        help="Framework shown first (F2 switches)"
+    ),
+    passthrough: bool = typer.Option(
+        False,
+        "--passthrough",
+        "-p",
+        help="Send the captured request body verbatim instead of decoding it"
+    ),
+    clipboard: Optional[str] = typer.Option(
+        None,
+        "--clipboard",
+        help="Clipboard backend: system, memory, stdio or file:<path> (default: $CURLPYCONVERT_CLIPBOARD or system)"
+    ),
+):
+    """Edit a cURL command with a live preview of the generated code."""
+    try:
+        clipboard_backend = get_clipboard(clipboard)
+        curl_command = clipboard_backend.paste().strip()
+        if not curl_command.startswith('curl'):
+            curl_command = "curl ''"
+        generators = {f.value: partial(form_code, framework=f, passthrough=passthrough) for f in Framework}
+        python_code = create_application(curl_command, generators, framework.value).run()
+        if python_code is None:
+            print("[yellow]![/yellow] Nothing copied")
+            return
+        clipboard_backend.copy(python_code)
+        print(f"[green]✓[/green] Converted code has been copied to clipboard!")
     except Exception as e:
         print(f"[red]Error:[/red] {str(e)}")
         raise typer.Exit(1)
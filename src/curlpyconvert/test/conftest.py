@@ -0,0 +1,44 @@
+import copy
+import io
+import json
+import pytest
+from types import SimpleNamespace
+from ..lib.clipboard import ENV_VAR, MEMORY_CLIPBOARD
+
+@pytest.fixture(autouse=True)
+def memory_clipboard(monkeypatch):
+    """Run every test against the in-memory clipboard instead of the system one."""
+    monkeypatch.setenv(ENV_VAR, 'memory')
+    MEMORY_CLIPBOARD.clear()
+    return MEMORY_CLIPBOARD
+
+def fake_response(body=b'{"items": []}', status_code=200):
+    """A requests-style response, readable whole, as JSON or as a stream."""
+    return SimpleNamespace(
+        status_code=status_code,
+        content=body,
+        json=lambda: json.loads(body),
+        raw=io.BytesIO(body),
+        iter_content=lambda chunk_size: (body[i:i + chunk_size] for i in range(0, len(body), chunk_size)),
+        iter_lines=lambda: iter(body.splitlines()),
+    )
+
+class FakeContext:
+    """Stands in for `self.context` when running generated requests-style code.
+
+    Every request's keywords are recorded as a deep copy, since paginated
+    code mutates its params between requests; `respond(url, **kwargs)`
+    builds the response, an empty listing by default.
+    """
+
+    def __init__(self, respond=None):
+        self.headers = {}
+        self.cookies = {}
+        self.requests = []
+        self.respond = respond or (lambda url, **kwargs: fake_response())
+
+    def GET(self, url, **kwargs):
+        self.requests.append(copy.deepcopy(kwargs))
+        return self.respond(url, **kwargs)
+
+    POST = GET
@@ -0,0 +1,75 @@
+import pytest
+from ..lib.curl_parser import CurlParser
+from ..lib.builder import RequestBuilder, infer_params
+
+def test_infer_params():
+    data = {
+        'customerId': 'abc',
+        'page': 2,
+        'query': 'shoes',
+        'filters': {'from': '2025-03-01', 'tags': ['a']},
+        'items': [{'id': '1', 'name': 'x'}]
+    }
+    
+    assert infer_params(data) == ['customerId', 'filters.from', 'items.0.id', 'page']
+
+def test_infer_params_first_list_element():
+    data = {'items': [{'id': str(index)} for index in range(3000)], 'offset': 0}
+    
+    assert infer_params(data) == ['items.0.id', 'offset']
+    assert infer_params({'a': [[{'id': 1}]]}) == ['a.0.0.id']
+    # The page size stays a constant
+    assert infer_params({'page': 1, 'limit': 50, 'per_page': 20}) == ['page']
+    # Numeric segments sort as numbers
+    assert infer_params({'10': {'id': 1}, '9': {'id': 2}}) == ['9.id', '10.id']
+
+def test_builder_python_literals():
+    parsed = CurlParser.parse_curl("""curl 'https://api.example.com/search' --data-raw '{"active": true, "cursor": null}'""")
+    code = RequestBuilder(parsed, 'context').generate_code()
+    
+    namespace = {}
+    exec(code[:code.index('# Once per session')], namespace)
+    assert namespace['build_body']() == {'active': True, 'cursor': None}
+
+def test_builder_copies_only_changed_paths():
+    parsed = CurlParser.parse_curl("""curl 'https://api.example.com/search' --data-raw '{"query": "shoes", "paging": {"page": 1, "size": 20}}'""")
+    code = RequestBuilder(parsed, 'context', ['paging.page']).generate_code()
+    
+    namespace = {}
+    exec(code[:code.index('# Once per session')], namespace)
+    body = namespace['build_body'](page=3)
+    
+    assert body == {'query': 'shoes', 'paging': {'page': 3, 'size': 20}}
+    assert namespace['BODY']['paging']['page'] == 1
+    assert 'response = self.context.POST(URL, json=build_body(page=page))' in code
+
+def test_builder_get_params_grab():
+    parsed = CurlParser.parse_curl("""curl 'https://api.example.com/list?page=2&q=shoes' -H 'accept: application/json'""")
+    code = RequestBuilder(parsed, 'grab').generate_code()
+    
+    assert 'from urllib.parse import urlencode' in code
+    assert 'def build_params(page="2"):' in code
+    assert 'self.g.go(f"{URL}?{urlencode(build_params(page=page))}")' in code
+
+def test_builder_array_body():
+    parsed = CurlParser.parse_curl("""curl 'https://api.example.com/graphql' --data-raw '[{"query":"q","variables":{"id":1}}]'""")
+    code = RequestBuilder(parsed, 'context').generate_code()
+    
+    assert 'BODY = tuple([' in code
+    assert 'def build_body(field_id=1):' in code
+    namespace = {}
+    exec(code[:code.index('# Once per session')], namespace)
+    assert namespace['build_body'](field_id=2) == [{'query': 'q', 'variables': {'id': 2}}]
+    assert namespace['BODY'][0]['variables']['id'] == 1
+
+def test_builder_rejects_multipart():
+    parsed = CurlParser.parse_curl("""curl 'https://api.example.com/upload' -F 'file=@big.bin' -F 'user_id=7'""")
+    
+    with pytest.raises(ValueError, match="multipart"):
+        RequestBuilder(parsed, 'context')
+
+def test_builder_unknown_param():
+    parsed = CurlParser.parse_curl("""curl 'https://api.example.com/list?page=2'""")
+    
+    with pytest.raises(ValueError, match="Field missing is not in the captured request"):
+        RequestBuilder(parsed, 'context', ['missing'])
@@ -0,0 +1,33 @@
+import io
+import pytest
+from ..lib.clipboard import (
+    ENV_VAR, MEMORY_CLIPBOARD, FileClipboard, StdioClipboard, SystemClipboard, get_clipboard
+)
+
+def test_memory_from_environment():
+    assert get_clipboard() is MEMORY_CLIPBOARD
+
+def test_system_by_name():
+    assert isinstance(get_clipboard('system'), SystemClipboard)
+
+def test_file_clipboard(tmp_path):
+    path = tmp_path / 'clipboard.txt'
+    clipboard = get_clipboard(f'file:{path}')
+    
+    assert isinstance(clipboard, FileClipboard)
+    assert clipboard.paste() == ''
+    clipboard.copy("curl 'https://api.example.com/data'")
+    assert path.read_text() == "curl 'https://api.example.com/data'"
+
+def test_stdio_clipboard(monkeypatch, capsys):
+    monkeypatch.setattr('sys.stdin', io.StringIO("curl 'https://api.example.com/data'"))
+    clipboard = StdioClipboard()
+    
+    assert clipboard.paste() == "curl 'https://api.example.com/data'"
+    assert clipboard.paste() == "curl 'https://api.example.com/data'"
+    clipboard.copy('code')
+    assert capsys.readouterr().out == 'code\n'
+
+def test_unknown_backend():
+    with pytest.raises(ValueError, match="Unknown clipboard backend"):
+        get_clipboard('x11')
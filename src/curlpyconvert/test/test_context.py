@@ -59,3 +59,65 @@ def test_post_request():
     code = writer.generate_code()
     
     assert 'response = self.context.POST("https://api.example.com/data")' in code
+
+def test_multipart_upload():
+    parsed = {
+        'method': 'post',
+        'url': 'https://api.example.com/upload',
+        'data': {'note': 'hello'},
+        'headers': {},
+        'cookies': {},
+        'form': [
+            {
+                'name': 'file',
+                'value': None,
+                'path': 'big.bin',
+                'filename': 'big.bin',
+                'content_type': 'application/octet-stream',
+                'from_file': False
+            },
+            {
+                'name': 'note',
+                'value': 'hello',
+                'path': None,
+                'filename': None,
+                'content_type': None,
+                'from_file': False
+            }
+        ]
+    }
+    
+    writer = ContextCodeWriter(parsed)
+    code = writer.generate_code()
+    
+    assert 'with open("big.bin", "rb") as file_0:' in code
+    assert '("file", ("big.bin", file_0, "application/octet-stream")),' in code
+    assert code.startswith('from requests_toolbelt import MultipartEncoder\n\n')
+    assert 'response = self.context.POST("https://api.example.com/upload", data=form, headers={"Content-Type": form.content_type})' in code
+    assert 'self.context.headers.update' not in code
+
+def test_compressed_transfer():
+    parsed = {
+        'method': 'get',
+        'url': 'https://api.example.com/data',
+        'data': {},
+        'headers': {},
+        'cookies': {},
+        'transfer': {'compressed': True, 'keepalive_time': 30}
+    }
+    
+    writer = ContextCodeWriter(parsed)
+    code = writer.generate_code()
+    
+    assert 'self.context.headers.update({"Accept-Encoding": "gzip, deflate, br"})' in code
+    assert '# --keepalive-time 30:' in code
+
+def test_passthrough_body():
+    from ..lib.curl_parser import CurlParser
+    parsed = CurlParser.parse_curl("""curl 'https://api.example.com/data' --data-raw '{"key": "value"}'""")
+    
+    writer = ContextCodeWriter(parsed, passthrough=True)
+    code = writer.generate_code()
+    
+    assert """response = self.context.POST("https://api.example.com/data", data='{"key": "value"}')""" in code
+    assert 'data' not in dict(parsed)
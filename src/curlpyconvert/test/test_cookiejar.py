@@ -0,0 +1,19 @@
+import pytest
+from http.cookiejar import MozillaCookieJar
+from ..lib.cookiejar import default_jar_path, to_netscape, write_netscape
+
+def test_default_jar_path():
+    assert default_jar_path('https://www.example.com/api') == '.cookies/www.example.com.txt'
+
+def test_to_netscape():
+    jar = to_netscape({'session': 'abc123'}, 'https://api.example.com/data')
+    
+    assert jar.startswith('# Netscape HTTP Cookie File')
+    assert 'api.example.com\tFALSE\t/\tTRUE\t\tsession\tabc123' in jar
+
+def test_round_trip(tmp_path):
+    path = write_netscape({'session': 'abc123', '_ga': 'GA1.1'}, 'https://api.example.com/data', tmp_path / 'jar.txt')
+    
+    jar = MozillaCookieJar(str(path))
+    jar.load(ignore_discard=True, ignore_expires=True)
+    assert {cookie.name: cookie.value for cookie in jar} == {'session': 'abc123', '_ga': 'GA1.1'}
@@ -1,5 +1,5 @@
 import pytest
-from ..lib.curl_parser import CurlParser
+from ..lib.curl_parser import CurlParser, ParsedCurl
 
 def test_parse_simple_get():
     curl = """curl 'https://api.example.com/data'"""
@@ -20,6 +20,13 @@ def test_parse_with_headers():
         'user-agent': 'Mozilla/5.0'
     }
 
+def test_parse_repeated_headers():
+    curl = """curl 'https://api.example.com/data' -H 'Accept: text/html' -H 'X-Trace: a' -H 'x-trace: b'"""
+    result = CurlParser.parse_curl(curl)
+    
+    assert result['headers'].get('accept') == 'text/html'
+    assert result['headers'].get_all('X-TRACE') == ['a', 'b']
+
 def test_parse_with_cookies():
     curl = """curl 'https://api.example.com/data' -H 'cookie: session=abc123; user=john'"""
     result = CurlParser.parse_curl(curl)
@@ -82,3 +89,80 @@ def test_complex_data_raw():
         'nested': {'key': 'value'}
     }
     assert result['data_as_json'] == True
+
+def test_multipart_form():
+    curl = """curl 'https://api.example.com/upload' -F 'file=@big.bin;type=application/zip' -F 'note=hello'"""
+    result = CurlParser.parse_curl(curl)
+    
+    assert result['method'] == 'post'
+    assert result['data'] == {'note': 'hello'}
+    file_part, note_part = result['form']
+    assert file_part['path'] == 'big.bin'
+    assert file_part['filename'] == 'big.bin'
+    assert file_part['content_type'] == 'application/zip'
+    assert note_part['value'] == 'hello'
+
+def test_form_string_keeps_order():
+    curl = """curl 'https://api.example.com/upload' --form-string 'a=@literal' -F 'b=1' --form-string 'c=<x'"""
+    result = CurlParser.parse_curl(curl)
+    
+    assert [(part['name'], part['value']) for part in result['form']] == [('a', '@literal'), ('b', '1'), ('c', '<x')]
+
+def test_cookie_flag():
+    curl = """curl 'https://api.example.com/data' -b 'session=abc123' -b cookies.txt"""
+    result = CurlParser.parse_curl(curl)
+    
+    assert result['cookies'] == {'session': 'abc123'}
+
+def test_transfer_options():
+    curl = """curl 'https://api.example.com/data' --compressed --http2 --keepalive-time 30 --limit-rate 100K -r 0-499"""
+    result = CurlParser.parse_curl(curl)
+    
+    assert result['transfer'] == {
+        'compressed': True,
+        'http2': True,
+        'keepalive_time': 30,
+        'limit_rate': '100K',
+        'range': '0-499'
+    }
+
+def test_post_body_decoded_lazily():
+    curl = """curl 'https://api.example.com/data' --data-raw '$ {"key":"value"}'"""
+    result = CurlParser.parse_curl(curl)
+    
+    assert 'data' not in dict(result)
+    assert bytes(result['body'].view) == b'{"key":"value"}'
+    assert result['data_as_json']
+    assert result.get('data') == {'key': 'value'}
+    assert result['ordered_data'] is None
+
+def test_brace_body_that_is_not_json():
+    result = CurlParser.parse_curl("""curl 'https://api.example.com/data' --data-raw '{broken=1&b=2'""")
+    
+    assert result['data'] == {'{broken': '1', 'b': '2'}
+    assert result['ordered_data'] == [('{broken', '1'), ('b', '2')]
+    assert result['data_as_json'] is False
+
+def test_lazy_keys_survive_copy_and_materialize():
+    result = CurlParser.parse_curl("""curl 'https://api.example.com/data' --data-raw '{"page": 2}'""")
+    
+    assert result.copy()['data'] == {'page': 2}
+    materialized = result.materialize()
+    assert type(materialized) is dict
+    assert materialized['data'] == {'page': 2}
+    assert materialized['data_as_json'] is True
+    assert materialized['pagination']['style'] == 'page'
+    assert isinstance(CurlParser.parse_curl("curl 'https://api.example.com/data'"), ParsedCurl)
+
+def test_get_query_params():
+    curl = """curl 'https://api.example.com/data?page=2&q=test'"""
+    result = CurlParser.parse_curl(curl)
+    
+    assert result['url'] == 'https://api.example.com/data'
+    assert result['ordered_data'] == [('page', '2'), ('q', 'test')]
+
+def test_unknown_option_raises_value_error():
+    with pytest.raises(ValueError, match="Invalid curl command format: unrecognized arguments"):
+        CurlParser.parse_curl("curl 'https://api.example.com/data' --no-such-option")
+    with pytest.raises(ValueError, match="expected one argument"):
+        CurlParser.parse_args(['curl', 'https://api.example.com/data', '-H'])
@@ -0,0 +1,57 @@
+import pytest
+from ..lib.curl_parser import CurlParser
+from ..lib.diff import diff_json, diff_mappings, diff_requests, format_diff
+
+def test_diff_mappings():
+    changes = diff_mappings({'a': '1', 'b': '2', 'c': '3'}, {'a': '1', 'b': 'x', 'd': '4'})
+    
+    assert changes == {
+        'added': {'d': '4'},
+        'removed': {'c': '3'},
+        'changed': {'b': ('2', 'x')}
+    }
+
+def test_diff_json_nested():
+    changes = diff_json(
+        {'items': [1, 2], 'meta': {'page': 1, 'old': True}},
+        {'items': [1, 3, 4], 'meta': {'page': 1, 'new': 'x'}}
+    )
+    
+    assert changes == [
+        ('~', '$.items[1]', 2, 3),
+        ('+', '$.items[2]', None, 4),
+        ('+', '$.meta.new', None, 'x'),
+        ('-', '$.meta.old', True, None)
+    ]
+
+def test_diff_json_sorts_indexes_numerically():
+    changes = diff_json({'items': [0] * 11}, {'items': [0, 0, 1] + [0] * 7 + [1]})
+    
+    assert [path for _, path, _, _ in changes] == ['$.items[2]', '$.items[10]']
+
+def test_diff_json_deeply_nested():
+    a = b = 'leaf'
+    for _ in range(5000):
+        a = {'n': a}
+        b = {'n': b}
+    
+    assert diff_json(a, b) == []
+
+def test_diff_requests():
+    a = CurlParser.parse_curl("""curl 'https://api.example.com/data?page=1' -H 'Accept: text/html' -H 'cookie: a=1; b=2'""")
+    b = CurlParser.parse_curl("""curl 'https://api.example.com/data?page=2' -H 'accept: text/html' -H 'cookie: a=1'""")
+    diff = diff_requests(a, b)
+    
+    assert diff['params']['changed'] == {'page': ('1', '2')}
+    assert not any(diff['headers'].values())
+    assert diff['cookies']['removed'] == {'b': '2'}
+    
+    report = format_diff(diff)
+    assert '  ~ page: 1 -> 2' in report
+    assert '  - b: 2' in report
+
+def test_identical_requests():
+    a = CurlParser.parse_curl("""curl 'https://api.example.com/data' -d '{"key": "value"}'""")
+    b = CurlParser.parse_curl("""curl 'https://api.example.com/data' -d '{"key": "value"}'""")
+    
+    assert 'requests are identical' in format_diff(diff_requests(a, b))
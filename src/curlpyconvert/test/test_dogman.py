@@ -23,7 +23,7 @@ def test_with_headers():
         'method': 'get',
         'url': 'https://api.example.com/data',
         'data': {},
-        'headers': {'accept': 'application/json'},
+        'headers': {'accept': 'application/json', 'connection': 'keep-alive'},
         'cookies': {}
     }
     
@@ -32,6 +32,7 @@ def test_with_headers():
     
     assert 'self.context.headers.update(' in code
     assert '"accept": "application/json # should not be necessary"' in code
+    assert '"connection": "keep-alive"\n' in code
 
 def test_post_request():
     parsed = {
@@ -46,3 +47,49 @@ def test_post_request():
     code = writer.generate_code()
     
     assert 'response = self.context.POST("https://api.example.com/data")' in code
+
+def test_cookie_cache():
+    parsed = {
+        'method': 'get',
+        'url': 'https://api.example.com/data',
+        'data': {},
+        'headers': {},
+        'cookies': {}
+    }
+    
+    writer = DogmanCodeWriter(parsed, cookie_cache=True, cookie_ttl=600)
+    code = writer.generate_code()
+    
+    assert 'COOKIE_JAR = Path(".cookies/api.example.com.txt")' in code
+    assert 'COOKIE_TTL = 600' in code
+    assert 'jar = load_cookie_jar()' in code
+    assert 'if response.status_code == 403:' in code
+    assert code.count('self.context.dogman.get_cookies(') == 2
+
+def test_cookie_cache_form_retry():
+    parsed = {
+        'method': 'post',
+        'url': 'https://api.example.com/upload',
+        'data': {},
+        'headers': {},
+        'cookies': {},
+        'form': [{
+            'name': 'file',
+            'value': None,
+            'path': 'big.bin',
+            'filename': 'big.bin',
+            'content_type': 'application/octet-stream',
+            'from_file': False
+        }]
+    }
+    
+    writer = DogmanCodeWriter(parsed, cookie_cache=True)
+    code = writer.generate_code()
+    
+    assert code.startswith('from requests_toolbelt import MultipartEncoder\n\n')
+    assert '''    if response.status_code == 403:
+        self.context.dogman.get_cookies("https://api.example.com/upload", spoofing="akamai")
+        save_cookie_jar(self.context.cookies)
+        file_0.seek(0)
+        form = MultipartEncoder(fields=fields)
+        response = self.context.POST("https://api.example.com/upload", data=form, headers={"Content-Type": form.content_type})''' in code
@@ -30,6 +30,23 @@ def test_with_headers():
     assert 'self.g.setup(headers=' in code
     assert '"accept": "application/json # should not be necessary"' in code
 
+def test_with_capitalized_headers():
+    parsed = {
+        'method': 'get',
+        'url': 'https://api.example.com/data',
+        'data': {},
+        'headers': {'Accept': 'application/json', 'User-Agent': 'Mozilla/5.0', 'Accept-Encoding': 'gzip', 'Connection': 'keep-alive'},
+        'cookies': {}
+    }
+    
+    writer = GrabCodeWriter(parsed)
+    code = writer.generate_code()
+    
+    assert '"Accept": "application/json # should not be necessary"' in code
+    assert '"User-Agent": "Mozilla/5.0 # should not be necessary"' in code
+    assert '"Accept-Encoding": "gzip",' in code
+    assert '"Connection": "keep-alive"\n' in code
+
 def test_with_cookies():
     parsed = {
         'method': 'get',
@@ -58,3 +75,44 @@ def test_post_request():
     code = writer.generate_code()
     
     assert "self.g.go('https://api.example.com/data')" in code
+
+def test_multipart_upload():
+    parsed = {
+        'method': 'post',
+        'url': 'https://api.example.com/upload',
+        'data': {},
+        'headers': {'Content-Type': 'multipart/form-data; boundary=abc'},
+        'cookies': {},
+        'form': [{
+            'name': 'file',
+            'value': None,
+            'path': 'big.bin',
+            'filename': 'big.bin',
+            'content_type': 'application/octet-stream',
+            'from_file': False
+        }]
+    }
+    
+    writer = GrabCodeWriter(parsed)
+    code = writer.generate_code()
+    
+    assert 'from grab import UploadFile' in code
+    assert '("file", UploadFile("big.bin", filename="big.bin", content_type="application/octet-stream"))' in code
+    assert 'boundary=abc' not in code
+
+def test_compressed_transfer():
+    parsed = {
+        'method': 'get',
+        'url': 'https://api.example.com/data',
+        'data': {},
+        'headers': {},
+        'cookies': {},
+        'transfer': {'compressed': True, 'http2': True, 'range': '0-99'}
+    }
+    
+    writer = GrabCodeWriter(parsed)
+    code = writer.generate_code()
+    
+    assert "self.g.setup(encoding='gzip,deflate,br')" in code
+    assert '# --http2:' in code
+    assert '"Range": "bytes=0-99"' in code
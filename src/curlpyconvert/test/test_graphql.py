@@ -0,0 +1,96 @@
+import hashlib
+import json
+from types import SimpleNamespace
+from ..lib.curl_parser import CurlParser
+from ..lib.context import ContextCodeWriter
+from ..lib.grab import GrabCodeWriter
+from ..lib.graphql import detect_graphql, payload_sizes
+
+QUERY = 'query SearchProducts($q: String!) { search(q: $q) { id name price { amount currency } } }'
+
+class FakeServer:
+    """Answers PersistedQueryNotFound until a document for the hash was sent."""
+
+    def __init__(self):
+        self.known = set()
+        self.bodies = []
+
+    def POST(self, url, json):
+        if isinstance(json, list):
+            results = [self.POST(url, body).json() for body in json]
+            return SimpleNamespace(json=lambda: results)
+        self.bodies.append(dict(json))
+        sha256 = json['extensions']['persistedQuery']['sha256Hash']
+        if 'query' in json and hashlib.sha256(json['query'].encode()).hexdigest() == sha256:
+            self.known.add(sha256)
+        if sha256 in self.known:
+            payload = {'data': {'search': []}}
+        else:
+            payload = {'errors': [{'message': 'PersistedQueryNotFound'}]}
+        return SimpleNamespace(json=lambda: payload)
+
+def parse(body):
+    return CurlParser.parse_curl(f"curl 'https://shop.example.com/graphql' --data-raw '{json.dumps(body)}'")
+
+def test_detect_graphql():
+    single = detect_graphql({'query': QUERY, 'variables': {'q': 'shoes'}})
+    assert single['batched'] is False
+    assert single['operations'][0]['operation_name'] == 'SearchProducts'
+    assert single['operations'][0]['sha256'] == hashlib.sha256(QUERY.encode()).hexdigest()
+    
+    persisted = {'operationName': 'Cart', 'extensions': {'persistedQuery': {'version': 1, 'sha256Hash': 'ab' * 32}}}
+    batch = detect_graphql([{'query': QUERY}, persisted])
+    assert batch['batched'] is True
+    assert batch['operations'][1]['query'] is None
+    assert batch['operations'][1]['sha256'] == 'ab' * 32
+    
+    assert detect_graphql({'query': {'term': 'shoes'}}) is None
+    assert detect_graphql([]) is None
+
+def test_parser_detects_graphql():
+    assert parse({'query': QUERY})['graphql']['operations'][0]['query'] == QUERY
+    assert parse({'term': 'shoes'})['graphql'] is None
+
+def test_apq_registers_then_sends_hash_only():
+    parsed = parse({'operationName': 'SearchProducts', 'query': QUERY, 'variables': {'q': 'shoes'}})
+    code = ContextCodeWriter(parsed, persisted_queries=True).generate_code()
+    code = code[code.index('GRAPHQL_URL'):]
+    server = FakeServer()
+    
+    exec(code, {'self': SimpleNamespace(context=server)})
+    exec(code, {'self': SimpleNamespace(context=server)})
+    
+    assert [('query' in body) for body in server.bodies] == [False, True, False]
+    assert f'SEARCH_PRODUCTS_QUERY_SHA256 = "{hashlib.sha256(QUERY.encode()).hexdigest()}"' in code
+    assert server.bodies[2] == {
+        'variables': {'q': 'shoes'},
+        'operationName': 'SearchProducts',
+        'extensions': {'persistedQuery': {'version': 1, 'sha256Hash': hashlib.sha256(QUERY.encode()).hexdigest()}},
+    }
+
+def test_apq_batch_grab():
+    parsed = parse([{'query': QUERY, 'variables': {'q': 'a', 'exact': False}}, {'query': QUERY}])
+    code = GrabCodeWriter(parsed, persisted_queries=True).generate_code()
+    
+    assert 'response = self.g.go(GRAPHQL_URL, json=bodies)' in code
+    assert '(SEARCH_PRODUCTS_QUERY, SEARCH_PRODUCTS_QUERY_SHA256, {"q": "a", "exact": False}, "SearchProducts"),' in code
+    assert '(SEARCH_PRODUCTS_QUERY_2, SEARCH_PRODUCTS_QUERY_2_SHA256, {}, "SearchProducts"),' in code
+
+def test_apq_batch_retries_operations_with_documents():
+    persisted = {'extensions': {'persistedQuery': {'version': 1, 'sha256Hash': 'ab' * 32}}}
+    parsed = parse([{'query': QUERY, 'variables': {'q': 'a'}}, persisted])
+    code = ContextCodeWriter(parsed, persisted_queries=True).generate_code()
+    namespace = {'self': SimpleNamespace(context=FakeServer())}
+    
+    exec(code[code.index('GRAPHQL_URL'):], namespace)
+    
+    assert [('query' in body) for body in namespace['self'].context.bodies] == [False, False, True, False]
+    first, second = namespace['response'].json()
+    assert first == {'data': {'search': []}}
+    assert second == {'errors': [{'message': 'PersistedQueryNotFound'}]}
+
+def test_payload_sizes():
+    body = {'query': QUERY * 20, 'variables': {'q': 'shoes'}}
+    sizes = payload_sizes(detect_graphql(body), body)
+    
+    assert sizes['persisted'] < sizes['captured'] / 5
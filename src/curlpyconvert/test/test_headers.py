@@ -0,0 +1,35 @@
+import pytest
+from ..lib.headers import COMMON_HEADERS, HeaderMap
+
+def test_case_insensitive_lookup():
+    headers = HeaderMap([('Accept', 'application/json'), ('User-Agent', 'Mozilla/5.0')])
+    
+    assert headers.get('accept') == 'application/json'
+    assert headers['USER-AGENT'] == 'Mozilla/5.0'
+    assert 'user-agent' in headers
+    assert 'referer' not in headers
+
+def test_duplicates_preserved():
+    headers = HeaderMap()
+    headers.add('X-Trace', 'a')
+    headers.add('x-trace', 'b')
+    
+    assert headers.get_all('X-TRACE') == ['a', 'b']
+    assert headers.items() == [('X-Trace', 'a'), ('x-trace', 'b')]
+    assert headers.to_dict() == {'X-Trace': 'a, b'}
+
+def test_remove():
+    headers = HeaderMap({'Accept': 'a', 'Referer': 'r', 'accept': 'b'})
+    headers.remove('ACCEPT')
+    
+    assert headers.items() == [('Referer', 'r')]
+    assert headers.get('referer') == 'r'
+
+def test_equals_plain_dict():
+    assert HeaderMap({'accept': 'application/json'}) == {'accept': 'application/json'}
+
+def test_common_headers():
+    assert isinstance(COMMON_HEADERS, frozenset)
+    assert HeaderMap.is_common('User-Agent')
+    assert not HeaderMap.is_common('apikey')
+    assert not HeaderMap.is_common('Accept-Encoding')
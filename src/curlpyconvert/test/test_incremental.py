@@ -0,0 +1,89 @@
+import random
+import shlex
+from pathlib import Path
+from ..lib.context import ContextCodeWriter
+from ..lib.curl_parser import CurlParser
+from ..lib.grab import GrabCodeWriter
+from ..lib.incremental import IncrementalConverter, clean_command, split_sections
+
+CURL_EXAMPLE = (Path(__file__).parents[3] / 'curl_example').read_text()
+
+def context_code(parsed):
+    return ContextCodeWriter(parsed).generate_code()
+
+def test_matches_full_conversion():
+    converter = IncrementalConverter(context_code)
+    
+    assert converter.code == ''
+    converter.update(CURL_EXAMPLE)
+    assert converter.code == context_code(CurlParser.parse_curl(CURL_EXAMPLE))
+    assert [token.value for token in converter.tokens] == shlex.split(clean_command(CURL_EXAMPLE))
+
+def test_edit_retokenizes_one_argument():
+    converter = IncrementalConverter(context_code)
+    converter.update(CURL_EXAMPLE)
+    edited = CURL_EXAMPLE.replace("-H 'accept-language: en-US", "-H 'accept-language: de-DE")
+    
+    converter.update(edited)
+    assert converter.retokenized == 1
+    assert len(converter.changed) == 1 and 'de-DE' in converter.changed[0]
+    assert converter.code == context_code(CurlParser.parse_curl(edited))
+
+def test_whitespace_edit_skips_conversion():
+    converter = IncrementalConverter(context_code)
+    converter.update("curl 'https://api.example.com/a' -H 'x: 1'")
+    
+    assert converter.update("curl   'https://api.example.com/a'  -H 'x: 1'") == converter.sections
+    assert converter.changed == []
+
+def test_half_typed_command_keeps_last_code():
+    converter = IncrementalConverter(context_code)
+    converter.update("curl 'https://api.example.com/a'")
+    code = converter.code
+    
+    converter.update("curl 'https://api.example.com/a' -H 'x: 1")
+    assert converter.error == "No closing quotation"
+    assert converter.code == code
+    converter.update("curl 'https://api.example.com/a' -H 'x: 1'")
+    assert converter.error is None
+    assert '"x": "1"' in converter.code
+
+def test_help_option_is_an_error(capsys):
+    converter = IncrementalConverter(context_code)
+    converter.update("curl 'https://x'")
+    code = converter.code
+    
+    for text in ("curl 'https://x' -h", "curl 'https://x' --hel"):
+        converter.update(text)
+        assert converter.error.startswith("Invalid curl command format")
+        assert converter.code == code
+    assert capsys.readouterr().out == ''
+
+def test_random_edits_match_shlex():
+    random.seed(7)
+    converter = IncrementalConverter(context_code)
+    text = "curl 'https://api.example.com/a?q=1' -H 'accept: */*' -H \"x-id: 7\" --data-raw '{\"a\": [1, 2]}'"
+    for _ in range(500):
+        position = random.randrange(len(text) + 1)
+        if random.random() < 0.5:
+            text = text[:position] + random.choice(["'", '"', ' ', 'x', "-H 'k: v' "]) + text[position:]
+        else:
+            text = text[:position] + text[position + 2:]
+        converter.update(text)
+        try:
+            expected = shlex.split(clean_command(text))
+        except ValueError:
+            continue
+        assert [token.value for token in converter.tokens] == expected
+
+def test_switch_writer_reuses_parse():
+    converter = IncrementalConverter(context_code)
+    converter.update("curl 'https://api.example.com/a'")
+    
+    converter.set_generate(lambda parsed: GrabCodeWriter(parsed).generate_code())
+    assert "self.g.go('https://api.example.com/a')" in converter.code
+
+def test_split_sections_keeps_docstrings():
+    code = 'a = 1\n\nQUERY = """\nquery {\n\n  id\n}"""\n\nb = 2'
+    
+    assert split_sections(code) == ['a = 1', 'QUERY = """\nquery {\n\n  id\n}"""', 'b = 2']
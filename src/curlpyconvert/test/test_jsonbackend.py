@@ -0,0 +1,56 @@
+import json
+import pytest
+from ..lib import jsonbackend
+from ..lib.jsonbackend import StdlibJSON, get_backend
+
+orjson = pytest.importorskip("orjson")
+
+VALUES = [
+    {},
+    [],
+    {"a": {}, "b": [], "c": [1, {"d": None}], "e": True, "f": False},
+    {"text": "café \U0001f600   \x7f \x00 \x1f \"quoted\" back\\slash\n\t"},
+    {"floats": [0.1, 1.0, -0.0, 123456789012345.0, 1e16, 1e-05, 1.7976931348623157e308]},
+    {"nan": float("nan"), "inf": float("inf")},
+    {"big": 2 ** 70, "small": -2 ** 70},
+    {1: "int key", None: "null key"},
+    ("tuple", 1, 2.5),
+    "plain string",
+]
+
+@pytest.fixture
+def native():
+    """orjson backend encoding through orjson whatever the Python version."""
+    backend = get_backend('orjson')
+    backend.native_dumps = True
+    return backend
+
+@pytest.mark.parametrize("value", VALUES)
+@pytest.mark.parametrize("indent", [None, 0, 2, 4])
+def test_dumps_matches_stdlib(native, value, indent):
+    assert native.dumps(value, indent=indent) == json.dumps(value, indent=indent)
+
+def test_dumps_deep_nesting(native):
+    value = {"a": [{"b": {"c": [[1, "x  y"], {"d": "\n  e"}]}}], "f": "  "}
+    assert native.dumps(value, indent=4) == json.dumps(value, indent=4)
+
+@pytest.mark.parametrize("document", [
+    '{"a": 1, "a": 2, "b": [1.5, -0, 1E400]}',
+    '[NaN, Infinity, 123456789012345678901234567890]',
+    '"\\ud800"',
+    b'{"caf\xc3\xa9": "\\u00e9"}',
+])
+def test_loads_matches_stdlib(document):
+    expected = StdlibJSON().loads(document)
+    assert repr(get_backend('orjson').loads(document)) == repr(expected)
+
+def test_loads_error_is_stdlib():
+    with pytest.raises(jsonbackend.JSONDecodeError, match="Expecting property name"):
+        get_backend('orjson').loads('{a: 1}')
+
+def test_env_selects_backend(monkeypatch):
+    monkeypatch.setenv(jsonbackend.ENV_VAR, 'stdlib')
+    assert get_backend().name == 'stdlib'
+    
+    with pytest.raises(ValueError, match="Unknown JSON backend"):
+        get_backend('simdjson')
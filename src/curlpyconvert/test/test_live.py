@@ -0,0 +1,54 @@
+import asyncio
+from prompt_toolkit.input import create_pipe_input
+from prompt_toolkit.output import DummyOutput
+from ..lib.context import ContextCodeWriter
+from ..lib.grab import GrabCodeWriter
+from ..lib.live import Debouncer, SectionHighlighter, create_application
+
+GENERATORS = {
+    'context': lambda parsed: ContextCodeWriter(parsed).generate_code(),
+    'grab': lambda parsed: GrabCodeWriter(parsed).generate_code(),
+}
+
+def test_debouncer_fires_once():
+    calls = []
+    
+    async def main():
+        debouncer = Debouncer(0.02, lambda: calls.append(1))
+        for _ in range(5):
+            debouncer()
+            await asyncio.sleep(0.005)
+        await asyncio.sleep(0.05)
+    
+    asyncio.run(main())
+    assert calls == [1]
+
+def test_highlighter_lexes_new_sections_only():
+    highlighter = SectionHighlighter()
+    
+    highlighter.fragments(['a = 1', 'b = 2'])
+    assert highlighter.lexed == 2
+    fragments = highlighter.fragments(['a = 1', 'c = 3'])
+    assert highlighter.lexed == 1
+    assert ''.join(text for _, text, *_ in fragments) == 'a = 1\n\nc = 3'
+
+def run_app(text, keys):
+    async def main():
+        with create_pipe_input() as pipe:
+            app = create_application(text, GENERATORS, 'context', delay=0.01, input=pipe, output=DummyOutput())
+            task = asyncio.ensure_future(app.run_async())
+            for key in keys:
+                pipe.send_text(key)
+                await asyncio.sleep(0.05)
+            return await task
+    return asyncio.run(main())
+
+def test_edit_and_accept():
+    # Type a header at the end, switch to grab with F2, accept with Ctrl-S
+    code = run_app("curl 'https://api.example.com/a'", [" -H 'x-id: 7'", '\x1bOQ', '\x13'])
+    
+    assert "self.g.go('https://api.example.com/a')" in code
+    assert '"x-id": "7"' in code
+
+def test_quit_returns_none():
+    assert run_app("curl 'https://api.example.com/a'", ['\x11']) is None
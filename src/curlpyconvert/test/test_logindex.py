@@ -0,0 +1,83 @@
+import os
+import pytest
+from ..lib.logindex import LogIndex, index_path_for
+
+LOG = """curl 'https://api.example.com/users?page=1' -H 'accept: application/json'
+curl 'https://shop.example.org/cart' \\
+  -H 'content-type: application/json' \\
+  --data-raw '{"item": 1}'
+curl 'https://api.example.com/orders/42'
+"""
+
+@pytest.fixture
+def log_file(tmp_path):
+    path = tmp_path / 'requests.log'
+    path.write_text(LOG)
+    return path
+
+def test_build_index(log_file):
+    with LogIndex.build(log_file) as index:
+        assert len(index) == 3
+        assert index.hosts == ['api.example.com', 'shop.example.org']
+        assert index.url(2) == 'https://api.example.com/orders/42'
+        assert index.command(1).startswith("curl 'https://shop.example.org/cart'")
+        assert index.command(1).endswith("""--data-raw '{"item": 1}'""")
+        assert list(index.grep_url(r'/orders/\d+$')) == [2]
+        
+        with pytest.raises(IndexError):
+            index.command(3)
+
+def test_index_round_trip(log_file):
+    index_path = LogIndex.build(log_file).save()
+    
+    assert index_path == index_path_for(log_file)
+    with LogIndex.load(log_file) as index:
+        assert list(index.offsets) == list(LogIndex.build(log_file).offsets)
+        assert index.host(1) == 'shop.example.org'
+
+def test_stale_index_is_rebuilt(log_file):
+    LogIndex.build(log_file).save()
+    log_file.write_text(LOG + "curl 'https://api.example.com/late'\n")
+    os.utime(log_file, ns=(0, 1))
+    
+    with pytest.raises(ValueError, match="out of date"):
+        LogIndex.load(log_file)
+    with LogIndex.open(log_file) as index:
+        assert index.url(3) == 'https://api.example.com/late'
+
+def test_truncated_index_is_rebuilt(log_file):
+    index_path = LogIndex.build(log_file).save()
+    index_path.write_bytes(index_path.read_bytes()[:-20])
+    
+    with pytest.raises(EOFError):
+        LogIndex.load(log_file)
+    with LogIndex.open(log_file) as index:
+        assert len(index) == 3
+
+def test_grep_url_reads_the_index_only(log_file):
+    LogIndex.build(log_file).save()
+    with LogIndex.load(log_file) as index:
+        log_file.write_text('')
+        
+        assert list(index.grep_url(r'shop\.')) == [1]
+        assert index._map is None
+
+def test_curl_lines_inside_a_command(tmp_path):
+    path = tmp_path / 'requests.log'
+    path.write_text(
+        "curl 'https://api.example.com/notes' --data-raw 'first line\n"
+        "curl is mentioned in the body'\n"
+        "curl 'https://api.example.com/wrap' -H 'x-a: 1' \\\n"
+        "curl after a line continuation\n"
+        "curl 'https://api.example.com/broken\n"
+        "curl 'https://api.example.com/after' -H 'accept: */*'\n"
+    )
+    
+    with LogIndex.build(path) as index:
+        assert [index.url(position) for position in range(len(index))] == [
+            'https://api.example.com/notes',
+            'https://api.example.com/wrap',
+            'https://api.example.com/broken',
+            'https://api.example.com/after',
+        ]
+        assert index.command(0).endswith("curl is mentioned in the body'")
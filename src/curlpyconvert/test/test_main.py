@@ -1,13 +1,13 @@
 import pytest
-import pyperclip
 from typer.testing import CliRunner
-from ..main import app
+from ..main import app, convert_commands, get_curl_commands, Framework, PARALLEL_MIN_COMMANDS
+from ..lib.clipboard import MEMORY_CLIPBOARD as clipboard
 
 runner = CliRunner()
 
 def test_convert_grab():
     curl_cmd = """curl 'https://api.example.com/data'"""
-    pyperclip.copy(curl_cmd)
+    clipboard.copy(curl_cmd)
     
     result = runner.invoke(app, ["convert", "-f", "grab", "--test-mode"])
     assert result.exit_code == 0
@@ -15,7 +15,7 @@ def test_convert_grab():
 
 def test_convert_context():
     curl_cmd = """curl 'https://api.example.com/data'"""
-    pyperclip.copy(curl_cmd)
+    clipboard.copy(curl_cmd)
     
     result = runner.invoke(app, ["convert", "-f", "context", "--test-mode"])
     assert result.exit_code == 0
@@ -23,14 +23,23 @@ def test_convert_context():
 
 def test_show_output():
     curl_cmd = """curl 'https://api.example.com/data'"""
-    pyperclip.copy(curl_cmd)
+    clipboard.copy(curl_cmd)
     
     result = runner.invoke(app, ["convert", "-f", "grab", "-v", "--test-mode"])
     assert result.exit_code == 0
-    assert "self.g.go('https://api.example.com/data')" in pyperclip.paste()
+    assert "self.g.go('https://api.example.com/data')" in clipboard.paste()
+
+def test_convert_stdio():
+    result = runner.invoke(
+        app, ["convert", "-f", "grab", "-v", "--clipboard", "stdio"], input="curl 'https://api.example.com/data'\n"
+    )
+    assert result.exit_code == 0
+    assert result.stdout.startswith("self.g.setup(common_headers={})")
+    assert result.stdout.rstrip().endswith("self.g.go('https://api.example.com/data')")
+    assert "has been copied to clipboard" in result.stderr
 
 def test_invalid_curl():
-    pyperclip.copy("not a curl command")
+    clipboard.copy("not a curl command")
     
     result = runner.invoke(app, ["convert", "-f", "grab", "--test-mode"])
     assert result.exit_code == 1
@@ -41,10 +50,9 @@ def test_version():
     assert result.exit_code == 0
     assert "curl-to-context version:" in result.stdout
 
-def test_convert_interactive(monkeypatch):
-    # Mock clipboard content
+def test_convert_interactive():
     curl_cmd = """curl 'https://api.example.com/data'"""
-    pyperclip.copy(curl_cmd)
+    clipboard.copy(curl_cmd)
     
     result = runner.invoke(app, ["convert", "--test-mode"])
     assert result.exit_code == 0
@@ -62,7 +70,7 @@ def test_convert_help():
 
 def test_convert_dogman():
     curl_cmd = """curl 'https://api.example.com/data'"""
-    pyperclip.copy(curl_cmd)
+    clipboard.copy(curl_cmd)
     
     result = runner.invoke(app, ["convert", "-f", "dogman", "--test-mode"])
     assert result.exit_code == 0
@@ -70,11 +78,11 @@ def test_convert_dogman():
 
 def test_convert_dogman_output():
     curl_cmd = """curl 'https://api.example.com/data'"""
-    pyperclip.copy(curl_cmd)
+    clipboard.copy(curl_cmd)
     
     result = runner.invoke(app, ["convert", "-f", "dogman", "-v", "--test-mode"])
     assert result.exit_code == 0
-    output = pyperclip.paste()
+    output = clipboard.paste()
     assert 'dogman_config = {' in output
     assert 'self.context.setup(dogman_config=dogman_config)' in output
     assert 'self.context.dogman.get_cookies("https://api.example.com/data", spoofing="akamai")' in output
@@ -88,4 +96,127 @@ def test_help_shows_aliases():
     assert "c2py" in result.stdout
     assert "curl2ctx" in result.stdout
     assert "curl2grab" in result.stdout
-    assert "curl2dog" in result.stdout 
\ No newline at end of file
+    assert "curl2dog" in result.stdout
+
+def test_diff(tmp_path):
+    first = tmp_path / "a.curl"
+    second = tmp_path / "b.curl"
+    first.write_text("""curl 'https://api.example.com/data' -H 'cookie: session=abc123'""")
+    second.write_text("""curl 'https://api.example.com/data' -H 'cookie: session=def456'""")
+    
+    result = runner.invoke(app, ["diff", str(first), str(second)])
+    assert result.exit_code == 0
+    assert "session: abc123 -> def456" in result.stdout
+
+def test_convert_file_clipboard(tmp_path):
+    path = tmp_path / "clipboard.txt"
+    path.write_text("""curl 'https://api.example.com/data'""")
+    
+    result = runner.invoke(app, ["convert", "-f", "context", "--clipboard", f"file:{path}", "--test-mode"])
+    assert result.exit_code == 0
+    assert 'response = self.context.GET("https://api.example.com/data")' in path.read_text()
+
+def test_convert_from_log(tmp_path):
+    log = tmp_path / "requests.log"
+    log.write_text("curl 'https://api.example.com/a'\ncurl 'https://api.example.com/b'\ncurl 'https://cdn.example.org/c'\n")
+    
+    result = runner.invoke(app, ["index", str(log)])
+    assert result.exit_code == 0
+    assert "Indexed 3 command(s) on 2 host(s)" in result.stdout
+    
+    result = runner.invoke(app, ["convert", "-f", "context", "--from", str(log), "--nth", "1", "--test-mode"])
+    assert result.exit_code == 0
+    assert clipboard.paste() == 'response = self.context.GET("https://api.example.com/b")'
+    
+    result = runner.invoke(app, ["convert", "-f", "context", "--from", str(log), "--grep-url", "api\\.", "--test-mode"])
+    assert result.exit_code == 0
+    assert '# GET https://api.example.com/a\n' in clipboard.paste()
+    assert 'cdn.example.org' not in clipboard.paste()
+
+def test_convert_paginate():
+    clipboard.copy("curl 'https://api.example.com/list?page=1&limit=50'")
+    
+    result = runner.invoke(app, ["convert", "-f", "context", "--paginate", "--prefetch", "2", "--test-mode"])
+    assert result.exit_code == 0
+    assert 'def iter_items(prefetch=2):' in clipboard.paste()
+    
+    clipboard.copy("curl 'https://api.example.com/data'")
+    result = runner.invoke(app, ["convert", "-f", "context", "--paginate", "--test-mode"])
+    assert result.exit_code == 0
+    assert "No page, offset or cursor field found" in result.stdout
+
+def test_convert_apq():
+    clipboard.copy("""curl 'https://shop.example.com/graphql' --data-raw '{"query": "query Cart { cart { id } }", "variables": {}}'""")
+    
+    result = runner.invoke(app, ["convert", "-f", "dogman", "--apq", "--test-mode"])
+    assert result.exit_code == 0
+    assert "Persisted queries: request body" in result.stdout
+    assert 'response = send_graphql(CART_QUERY, CART_QUERY_SHA256, {}, "Cart")' in clipboard.paste()
+
+def test_convert_stream():
+    clipboard.copy("curl 'https://api.example.com/items' -H 'accept: application/json'")
+    
+    result = runner.invoke(app, ["convert", "-f", "context", "--stream", "--test-mode"])
+    assert result.exit_code == 0
+    assert 'response = self.context.GET("https://api.example.com/items", stream=True)' in clipboard.paste()
+
+def test_convert_copy_all_blob():
+    clipboard.copy(
+        "curl 'https://api.example.com/a' -H 'accept: */*' ;\n"
+        "curl 'https://api.example.com/b' --data-raw '{\"note\":\"x;y\"}' ;\n"
+        "curl 'https://api.example.com/c'"
+    )
+    
+    result = runner.invoke(app, ["convert", "-f", "context", "--test-mode"])
+    assert result.exit_code == 0
+    assert "Converted 3 commands" in result.stdout
+    code = clipboard.paste()
+    assert code.startswith(
+        "# Requests:\n#   1. GET https://api.example.com/a\n#   2. POST https://api.example.com/b\n"
+        "#   3. GET https://api.example.com/c\n"
+    )
+    assert code.index('# POST https://api.example.com/b\n') < code.index('# GET https://api.example.com/c\n')
+
+def test_blob_copied_after_prompt_is_split(monkeypatch):
+    clipboard.copy("curl 'https://api.example.com/stale'")
+    clipboard.interactive = True
+    
+    def confirm():
+        clipboard.copy("curl 'https://api.example.com/a' ;\ncurl 'https://api.example.com/b'")
+        return ''
+    
+    monkeypatch.setattr('builtins.input', confirm)
+    try:
+        assert get_curl_commands(clipboard=clipboard) == [
+            "curl 'https://api.example.com/a'", "curl 'https://api.example.com/b'"
+        ]
+    finally:
+        del clipboard.interactive
+
+def test_convert_commands_in_workers():
+    commands = [f"curl 'https://api.example.com/items/{index}'" for index in range(PARALLEL_MIN_COMMANDS + 4)]
+    
+    parallel = convert_commands(commands, workers=2, framework=Framework.CONTEXT)
+    assert parallel == convert_commands(commands, workers=1, framework=Framework.CONTEXT)
+    assert [result['url'] for result in parallel] == [f'https://api.example.com/items/{index}' for index in range(len(commands))]
+
+def test_convert_output_sidecars(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    cookies = '; '.join(f'session{index}=value-{index}' for index in range(40))
+    clipboard.copy(f"curl 'https://shop.example.com/cart' -b '{cookies}'")
+    
+    result = runner.invoke(app, ["convert", "-f", "context", "-o", "--sidecar-threshold", "200", "--test-mode"])
+    assert result.exit_code == 0
+    module = (tmp_path / 'shopexamplecom.py').read_text()
+    assert 'def load_payload(name):' in module
+    assert 'self.context.cookies.update(load_payload("cookies.json"))' in module
+    assert 'value-39' not in module
+    assert '"session39": "value-39"' in (tmp_path / 'shopexamplecom.cookies.json').read_text()
+    # The clipboard copy has no files next to it
+    assert 'load_payload' not in clipboard.paste()
+    assert '"session39": "value-39"' in clipboard.paste()
+
+def test_live_help():
+    result = runner.invoke(app, ["live", "--help"])
+    assert result.exit_code == 0
+    assert "live preview" in result.stdout
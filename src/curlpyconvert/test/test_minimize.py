@@ -0,0 +1,45 @@
+import json
+import pytest
+from ..lib.curl_parser import CurlParser
+from ..lib.minimize import load_rules, minimize
+
+CURL = """curl 'https://www.example.com/api' --data-raw '{"key": "value"}' \
+-H 'accept: */*' \
+-H 'apikey: secret' \
+-H 'referer: https://www.example.com/' \
+-H 'sec-ch-ua-mobile: ?0' \
+-H 'sec-fetch-mode: cors' \
+-H 'cookie: session=abc123; _ga=GA1.1; _fbp=fb.1; _cs_id=1.2'"""
+
+def test_minimize_defaults():
+    parsed = CurlParser.parse_curl(CURL)
+    minimized, report = minimize(parsed, 'context')
+    
+    assert minimized['headers'] == {'apikey': 'secret'}
+    assert minimized['cookies'] == {'session': 'abc123'}
+    assert report['headers'] == ['accept', 'referer', 'sec-ch-ua-mobile', 'sec-fetch-mode']
+    assert report['cookies'] == ['_ga', '_fbp', '_cs_id']
+    assert 0 < report['bytes_saved'] < report['bytes_before']
+    # The input is left untouched and the body stays lazily decoded
+    assert len(parsed['cookies']) == 4
+    assert minimized['data'] == {'key': 'value'}
+
+def test_grab_keeps_accept_encoding():
+    parsed = CurlParser.parse_curl("""curl 'https://www.example.com/api' -H 'accept-encoding: gzip, deflate'""")
+    minimized, _ = minimize(parsed, 'grab')
+    
+    assert minimized['headers'] == {'accept-encoding': 'gzip, deflate'}
+
+def test_per_host_rules(tmp_path):
+    rules_file = tmp_path / 'rules.json'
+    rules_file.write_text(json.dumps({
+        'hosts': {
+            '*.example.com': {'keep_headers': ['referer'], 'drop_cookies': ['session']},
+            'other.com': {'keep_cookies': ['_ga']}
+        }
+    }))
+    parsed = CurlParser.parse_curl(CURL)
+    minimized, _ = minimize(parsed, 'context', load_rules(rules_file))
+    
+    assert 'referer' in minimized['headers']
+    assert minimized['cookies'] == {}
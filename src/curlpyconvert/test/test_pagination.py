@@ -0,0 +1,102 @@
+import threading
+import time
+import pytest
+from types import SimpleNamespace
+from ..lib.curl_parser import CurlParser
+from ..lib.context import ContextCodeWriter
+from ..lib.grab import GrabCodeWriter
+from ..lib.pagination import detect_pagination
+from .conftest import FakeContext
+
+def listing(total, cursor=False):
+    """Respond with `total` items in pages, selected by the request params or variables."""
+    def page(start, size):
+        items = [{'id': index} for index in range(start, min(start + size, total))]
+        payload = {'items': items}
+        if cursor:
+            payload['pageInfo'] = {'endCursor': str(start + size) if start + size < total else None}
+        return SimpleNamespace(json=lambda: payload)
+
+    def respond(url, params=None, json=None):
+        if json is not None:
+            return page(int(json['variables']['after'] or 0), json['variables']['first'])
+        if 'offset' in params:
+            return page(int(params['offset']), int(params['limit']))
+        return page((int(params['page']) - 1) * int(params['limit']), int(params['limit']))
+    return respond
+
+def run(code, context):
+    """Execute generated code, collecting items instead of the placeholder loop."""
+    start = code.find('import threading')
+    code = code[start if start >= 0 else code.index('def page_items'):]
+    code = code.replace('for item in iter_items():\n    pass  # handle one item', 'result = list(iter_items())')
+    namespace = {'self': SimpleNamespace(context=context)}
+    exec(code, namespace)
+    return namespace['result']
+
+def test_detect_pagination():
+    assert detect_pagination({'q': 'x', 'page': '3', 'per_page': '20'}) == {
+        'style': 'page', 'path': ['page'], 'value': '3', 'size_path': ['per_page'], 'size': '20'
+    }
+    assert detect_pagination({'paging': {'offset': 0, 'limit': 10}})['path'] == ['paging', 'offset']
+    assert detect_pagination({'page': 1, 'cursor': 'abc'})['style'] == 'cursor'
+    assert detect_pagination({'after': '2024-01-01', 'query': 'x'}) is None
+    assert detect_pagination({'limit': 10}) is None
+    assert detect_pagination([{'page': 1}]) is None
+
+def test_parser_detects_pagination_lazily():
+    parsed = CurlParser.parse_curl("""curl 'https://api.example.com/graphql' --data-raw '{"variables": {"first": 2, "after": null}}'""")
+    
+    assert 'pagination' in parsed
+    assert parsed['pagination']['path'] == ['variables', 'after']
+    assert CurlParser.parse_curl("curl 'https://api.example.com/list?offset=0&limit=5'")['pagination']['style'] == 'offset'
+
+@pytest.mark.parametrize("prefetch", [0, 2])
+def test_page_generator(prefetch):
+    parsed = CurlParser.parse_curl("curl 'https://api.example.com/list?q=shoes&page=1&limit=2'")
+    context = FakeContext(listing(total=5))
+    
+    items = run(ContextCodeWriter(parsed, paginate=True, prefetch=prefetch).generate_code(), context)
+    
+    assert [item['id'] for item in items] == [0, 1, 2, 3, 4]
+    assert [request['params']['page'] for request in context.requests] == ['1', '2', '3']
+
+def test_page_generator_is_lazy():
+    parsed = CurlParser.parse_curl("curl 'https://api.example.com/list?offset=0&limit=2'")
+    context = FakeContext(listing(total=100))
+    code = ContextCodeWriter(parsed, paginate=True).generate_code()
+    code = code.replace('for item in iter_items():\n    pass  # handle one item', 'items = iter_items()\nresult = [next(items) for _ in range(3)]')
+    
+    assert [item['id'] for item in run(code, context)] == [0, 1, 2]
+    assert [request['params']['offset'] for request in context.requests] == ['0', '2']
+
+def test_prefetch_worker_exits_when_consumer_stops():
+    parsed = CurlParser.parse_curl("curl 'https://api.example.com/list?offset=0&limit=2'")
+    context = FakeContext(listing(total=1000))
+    code = ContextCodeWriter(parsed, paginate=True, prefetch=1).generate_code()
+    code = code.replace('for item in iter_items():\n    pass  # handle one item', 'items = iter_items()\nresult = [next(items)]\nitems.close()')
+    
+    assert [item['id'] for item in run(code, context)] == [0]
+    deadline = time.monotonic() + 2
+    while any(thread.name.endswith('(worker)') for thread in threading.enumerate()) and time.monotonic() < deadline:
+        time.sleep(0.01)
+    assert not any(thread.name.endswith('(worker)') for thread in threading.enumerate())
+    # The worker stopped a page or two ahead instead of blocking on a full queue
+    assert len(context.requests) <= 3
+
+def test_cursor_generator():
+    parsed = CurlParser.parse_curl("""curl 'https://api.example.com/graphql' --data-raw '{"query": "q", "variables": {"first": 2, "after": null}}'""")
+    context = FakeContext(listing(total=5, cursor=True))
+    
+    items = run(ContextCodeWriter(parsed, paginate=True).generate_code(), context)
+    
+    assert [item['id'] for item in items] == [0, 1, 2, 3, 4]
+    assert [request['json']['variables']['after'] for request in context.requests] == [None, '2', '4']
+
+def test_grab_page_generator():
+    parsed = CurlParser.parse_curl("curl 'https://api.example.com/list?page=1'")
+    code = GrabCodeWriter(parsed, paginate=True, prefetch=3).generate_code()
+    
+    assert 'from urllib.parse import urlencode' in code
+    assert 'payload = self.g.go(f"https://api.example.com/list?{urlencode(params)}").json' in code
+    assert 'def iter_items(prefetch=3):' in code
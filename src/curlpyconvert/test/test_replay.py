@@ -0,0 +1,107 @@
+import pytest
+from ..lib.curl_parser import CurlParser
+from ..lib.context import ContextCodeWriter
+from ..lib.dogman import DogmanCodeWriter
+from ..lib.grab import GrabCodeWriter
+from ..lib.replay import StubServer, ReplayTransport, percentile, replay, format_report
+
+def test_stub_server_counts_connections():
+    with StubServer() as server:
+        transport = ReplayTransport(server.address)
+        transport.send('GET', 'https://api.example.com/a', {})
+        transport.send('GET', 'https://api.example.com/b?x=1', {})
+        transport.close()
+    
+    assert [request['path'] for request in server.requests] == ['/a', '/b?x=1']
+    assert [request['reused'] for request in server.requests] == [False, True]
+    assert server.connections == 1
+
+def test_stub_server_connection_close():
+    with StubServer() as server:
+        transport = ReplayTransport(server.address)
+        transport.send('GET', 'https://api.example.com/a', {'Connection': 'close'})
+        transport.send('GET', 'https://api.example.com/b', {'Connection': 'close'})
+        transport.close()
+    
+    assert [request['reused'] for request in server.requests] == [False, False]
+    assert server.connections == 2
+
+def test_replay_context():
+    parsed = CurlParser.parse_curl("""curl 'https://api.example.com/data?page=1' -H 'x-api-key: secret' -H 'cookie: session=abc123'""")
+    code = ContextCodeWriter(parsed).generate_code()
+    
+    report = replay(code, parsed, runs=3)
+    
+    assert report['requests'] == 3
+    assert report['connections'] == 3
+    assert report['bytes_sent'] > 0
+    assert report['fidelity'] == []
+    assert 'fidelity:    replayed request matches the curl command' in format_report(report)
+    assert 'the replay stand-in transport, not the framework session' in format_report(report)
+
+def test_replay_reports_body_mismatch():
+    parsed = CurlParser.parse_curl("""curl 'https://api.example.com/data' --data-raw '{"key": "value"}'""")
+    code = GrabCodeWriter(parsed).generate_code()
+    
+    report = replay(code, parsed)
+    
+    assert 'method: expected POST, sent GET' in report['fidelity']
+    
+    code = GrabCodeWriter(parsed, passthrough=True).generate_code()
+    assert replay(code, parsed)['fidelity'] == []
+
+@pytest.mark.parametrize('writer', [DogmanCodeWriter, GrabCodeWriter])
+def test_replay_ignores_common_header_marker(writer):
+    parsed = CurlParser.parse_curl("""curl 'https://api.example.com/data' -H 'accept: application/json' -H 'user-agent: Mozilla/5.0'""")
+    code = writer(parsed).generate_code()
+    
+    assert '# should not be necessary' in code
+    assert replay(code, parsed)['fidelity'] == []
+
+@pytest.mark.parametrize('writer', [ContextCodeWriter, DogmanCodeWriter, GrabCodeWriter])
+@pytest.mark.parametrize('url', ['https://example.com/export/report.csv', 'https://example.com/events.ndjson'])
+def test_replay_streamed_capture(writer, url, tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    parsed = CurlParser.parse_curl(f"curl '{url}'")
+    code = writer(parsed).generate_code()
+    
+    report = replay(code, parsed, runs=2)
+    
+    assert report['requests'] == 2
+    assert report['fidelity'] == []
+    # Downloads are written to a scratch directory
+    assert list(tmp_path.iterdir()) == []
+
+def test_replay_persisted_queries():
+    parsed = CurlParser.parse_curl("""curl 'https://api.example.com/graphql' --data-raw '{"query": "query Cart { cart { id } }", "variables": {"id": 1}}'""")
+    code = ContextCodeWriter(parsed, persisted_queries=True).generate_code()
+    
+    assert replay(code, parsed, persisted_queries=True)['fidelity'] == []
+    assert replay(code, parsed)['fidelity'] == ['body: expected 63 bytes, sent 181']
+
+def test_replay_paginated_form_body():
+    parsed = CurlParser.parse_curl("""curl 'https://api.example.com/items' --data-raw 'page=1&q=a+b'""")
+    
+    for writer in (ContextCodeWriter, GrabCodeWriter):
+        assert replay(writer(parsed, paginate=True).generate_code(), parsed)['fidelity'] == []
+
+def test_replay_dogman_cookie_cache():
+    parsed = CurlParser.parse_curl("""curl 'https://api.example.com/data' -H 'cookie: session=abc123'""")
+    code = DogmanCodeWriter(parsed, cookie_cache=True).generate_code()
+    
+    report = replay(code, parsed, runs=3)
+    assert report['requests'] == 3
+    assert report['fidelity'] == []
+
+def test_replay_rejects_forms():
+    parsed = CurlParser.parse_curl("""curl 'https://api.example.com/upload' -F 'file=@report.csv'""")
+    
+    with pytest.raises(ValueError, match="Multipart forms cannot be replayed"):
+        replay(ContextCodeWriter(parsed).generate_code(), parsed)
+
+def test_percentile():
+    values = [float(value) for value in range(1, 101)]
+    
+    assert percentile(values, 0.5) == 50.0
+    assert percentile(values, 0.99) == 99.0
+    assert percentile([], 0.5) == 0.0
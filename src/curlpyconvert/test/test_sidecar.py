@@ -0,0 +1,76 @@
+import json
+from types import SimpleNamespace
+from ..lib.curl_parser import CurlParser
+from ..lib.builder import RequestBuilder
+from ..lib.context import ContextCodeWriter
+from ..lib.grab import GrabCodeWriter
+from ..lib.sidecar import SIDECAR_HELPERS, Sidecars
+from .conftest import FakeContext
+
+COOKIES = '; '.join(f'c{index}=value-{index}' for index in range(50))
+
+def load_module(tmp_path, code, sidecars, **variables):
+    """Save generated code like `convert --output` and run it."""
+    module_path = tmp_path / 'capture.py'
+    module_path.write_text(f'{SIDECAR_HELPERS}\n\n\n{code}')
+    sidecars.write(module_path)
+    context = FakeContext()
+    namespace = {'self': SimpleNamespace(context=context), '__file__': str(module_path), **variables}
+    exec(compile(module_path.read_text(), str(module_path), 'exec'), namespace)
+    return namespace, context
+
+def test_payload_threshold():
+    sidecars = Sidecars(threshold=10, prefix='2.')
+    
+    assert sidecars.payload('cookies', {'a': 'b'}, '{"a": "b"}') == '{"a": "b"}'
+    assert sidecars.payload('headers', {'a': 'b' * 20}, json.dumps({'a': 'b' * 20})) == 'load_payload("2.headers.json")'
+    assert sidecars.payload('body', b'raw;body' * 3, repr('raw;body' * 3)) == 'load_payload("2.body.bin")'
+    assert sidecars.files == {'2.headers.json': b'{"a": "' + b'b' * 20 + b'"}', '2.body.bin': b'raw;body' * 3}
+    assert Sidecars().payload('cookies', {'a': 'b' * 10**6}, 'x' * 10**6) == 'x' * 10**6
+    # A body view is copied only when it moves to a file
+    assert Sidecars(threshold=100).payload('body', memoryview(b'short'), "b'short'") == "b'short'"
+    assert Sidecars(threshold=1).payload('body', memoryview(b'long'), "b'long'") == 'load_payload("body.bin")'
+
+def test_cookies_and_body_load_lazily(tmp_path):
+    body = json.dumps({'rows': [{'id': index, 'name': f'row {index}'} for index in range(200)]})
+    parsed = CurlParser.parse_curl(f"curl 'https://example.com/save' -b '{COOKIES}' --data-raw '{body}'")
+    sidecars = Sidecars(threshold=200)
+    code = ContextCodeWriter(parsed, passthrough=True, sidecars=sidecars).generate_code()
+    
+    assert 'self.context.cookies.update(load_payload("cookies.json"))' in code
+    assert 'data=load_payload("body.bin")' in code
+    assert 'value-49' not in code and 'row 199' not in code
+    namespace, context = load_module(tmp_path, code, sidecars)
+    assert context.cookies == parsed['cookies']
+    assert context.requests == [{'data': body.encode()}]
+    assert namespace['load_payload'].cache_info().currsize == 2
+
+def test_small_literals_stay_inline():
+    parsed = CurlParser.parse_curl(f"curl 'https://example.com/' -b '{COOKIES}'")
+    sidecars = Sidecars(threshold=10**6)
+    
+    assert 'value-49' in GrabCodeWriter(parsed, sidecars=sidecars).generate_code()
+    assert sidecars.files == {}
+
+def test_paginated_body_is_copied(tmp_path):
+    body = json.dumps({'page': 1, 'filters': {'ids': list(range(100))}})
+    parsed = CurlParser.parse_curl(f"curl 'https://example.com/list' -H 'content-type: application/json' --data-raw '{body}'")
+    sidecars = Sidecars(threshold=100)
+    code = ContextCodeWriter(parsed, paginate=True, sidecars=sidecars).generate_code()
+    
+    assert 'body = copy.deepcopy(load_payload("body.json"))' in code
+    namespace, context = load_module(tmp_path, code, sidecars)
+    assert namespace['load_payload']('body.json')['page'] == 1
+
+def test_builder_references_sidecar(tmp_path):
+    body = json.dumps({'customerId': 'c-1', 'items': [{'sku': f'SKU-{index}'} for index in range(100)]})
+    parsed = CurlParser.parse_curl(f"curl 'https://example.com/cart' -H 'content-type: application/json' --data-raw '{body}'")
+    sidecars = Sidecars(threshold=500)
+    code = RequestBuilder(parsed, 'context', sidecars=sidecars).generate_code()
+    
+    assert 'BODY = ' not in code
+    assert '    body = dict(load_payload("body.json"))' in code
+    assert 'HEADERS = MappingProxyType(' in code
+    namespace, context = load_module(tmp_path, code, sidecars, customer_id='c-2')
+    assert context.requests[0]['json']['customerId'] == 'c-2'
+    assert context.requests[0]['json']['items'][99] == {'sku': 'SKU-99'}
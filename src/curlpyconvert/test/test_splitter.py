@@ -0,0 +1,32 @@
+from ..lib.splitter import split_commands
+
+def test_split_devtools_blob():
+    blob = (
+        "curl 'https://example.com/a?x=1&y=2' \\\n"
+        "  -H 'accept: */*' \\\n"
+        "  --data-raw '{\"q\":\"a;b && c\"}' ;\n"
+        "curl 'https://example.com/b' -H \"x-note: say \\\"hi\\\"; bye\" ;\n"
+        "curl 'https://example.com/c' --data-raw $'it\\'s; fine\\n'\n"
+    )
+    
+    assert split_commands(blob) == [
+        "curl 'https://example.com/a?x=1&y=2' \\\n  -H 'accept: */*' \\\n  --data-raw '{\"q\":\"a;b && c\"}'",
+        "curl 'https://example.com/b' -H \"x-note: say \\\"hi\\\"; bye\"",
+        "curl 'https://example.com/c' --data-raw $'it\\'s; fine\\n'",
+    ]
+
+def test_split_other_separators():
+    assert split_commands("curl 'https://a' && curl 'https://b'\ncurl 'https://c'") == [
+        "curl 'https://a'", "curl 'https://b'", "curl 'https://c'"
+    ]
+    assert split_commands("cd /tmp; curl 'https://a';\n# done") == ["curl 'https://a'"]
+
+def test_comments_with_quotes():
+    assert split_commands("# don't run\ncurl 'https://a'\ncurl 'https://b'") == ["curl 'https://a'", "curl 'https://b'"]
+    assert split_commands("curl 'https://a' # it's a test\ncurl https://b#top") == [
+        "curl 'https://a'", "curl https://b#top"
+    ]
+
+def test_single_command_and_unterminated_quote():
+    assert split_commands("curl 'https://a' -H 'x: y'") == ["curl 'https://a' -H 'x: y'"]
+    assert split_commands("curl 'https://a; curl 'https://b'") == ["curl 'https://a; curl 'https://b'"]
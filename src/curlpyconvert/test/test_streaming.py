@@ -0,0 +1,80 @@
+import json
+import pytest
+import re
+from types import SimpleNamespace
+from ..lib.curl_parser import CurlParser
+from ..lib.context import ContextCodeWriter
+from ..lib.dogman import DogmanCodeWriter
+from ..lib.grab import GrabCodeWriter
+from ..lib.streaming import detect_stream, download_path
+from .conftest import FakeContext, fake_response
+
+def serving(body):
+    """Answer every request with `body`."""
+    return FakeContext(lambda url, **kwargs: fake_response(body))
+
+def run(code, context, tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    code = re.sub(r'\n( *)(.*)  # handle one item', r'\n\1\2\n\1items.append(item)', code)
+    namespace = {'self': SimpleNamespace(context=context), 'items': []}
+    exec(code, namespace)
+    return namespace['items']
+
+def test_detect_stream():
+    def parse(command):
+        return CurlParser.parse_curl(command)
+    
+    assert detect_stream(parse("curl 'https://example.com/export/report.csv?day=1'")) == 'download'
+    assert detect_stream(parse("curl 'https://example.com/file' -H 'accept: application/octet-stream'")) == 'download'
+    assert detect_stream(parse("curl 'https://example.com/events' -H 'Accept: application/x-ndjson'")) == 'ndjson'
+    assert detect_stream(parse("curl 'https://example.com/dump/items.json'")) == 'json'
+    assert detect_stream(parse("curl 'https://example.com/api' -H 'accept: application/json, text/plain, */*'")) is None
+    assert detect_stream(parse("curl 'https://example.com/api' -H 'accept: application/json'"), force=True) == 'json'
+    assert detect_stream(parse("curl 'https://example.com/api'"), force=True) == 'download'
+
+def test_download_path():
+    assert download_path('https://example.com/a/report.csv?x=1') == 'report.csv'
+    assert download_path('https://example.com/') == 'example.com.bin'
+
+def test_download_to_disk(tmp_path, monkeypatch):
+    parsed = CurlParser.parse_curl("curl 'https://example.com/export/archive.zip'")
+    body = b'x' * (3 * 1024 * 1024 + 5)
+    context = serving(body)
+    code = ContextCodeWriter(parsed).generate_code()
+    
+    assert 'response = self.context.GET("https://example.com/export/archive.zip", stream=True)' in code
+    run(code, context, tmp_path, monkeypatch)
+    assert (tmp_path / 'archive.zip').read_bytes() == body
+    assert context.requests == [{'stream': True}]
+
+def test_ndjson_items(tmp_path, monkeypatch):
+    parsed = CurlParser.parse_curl("curl 'https://example.com/events' -H 'accept: application/x-ndjson'")
+    context = serving(b'{"id": 1}\n\n{"id": 2}\n')
+    
+    assert run(ContextCodeWriter(parsed).generate_code(), context, tmp_path, monkeypatch) == [{'id': 1}, {'id': 2}]
+
+def test_json_items(tmp_path, monkeypatch):
+    parsed = CurlParser.parse_curl("curl 'https://example.com/api/items' -H 'accept: application/json'")
+    code = ContextCodeWriter(parsed, stream=True).generate_code()
+    
+    assert 'for item in ijson.items(response.raw, ITEMS_PREFIX):' in code
+    assert 'stream=True' not in ContextCodeWriter(parsed).generate_code()
+    pytest.importorskip('ijson')
+    context = serving(json.dumps([{'id': 1}, {'id': 2}]).encode())
+    assert run(code, context, tmp_path, monkeypatch) == [{'id': 1}, {'id': 2}]
+
+def test_dogman_retries_before_reading():
+    parsed = CurlParser.parse_curl("curl 'https://example.com/report.pdf'")
+    code = DogmanCodeWriter(parsed, cookie_cache=True).generate_code()
+    
+    request = 'response = self.context.GET("https://example.com/report.pdf", stream=True)'
+    assert code.index(request) < code.index('if response.status_code == 403:') < code.index('response.iter_content')
+    assert f'    {request}' in code
+
+def test_grab_body_storage():
+    parsed = CurlParser.parse_curl("curl 'https://example.com/feed.jsonl'")
+    code = GrabCodeWriter(parsed).generate_code()
+    
+    assert 'DOWNLOAD_PATH = Path("feed.jsonl")' in code
+    assert code.index('self.g.setup(body_inmemory=False') < code.index("self.g.go('https://example.com/feed.jsonl')")
+    assert 'item = json.loads(line)' in code